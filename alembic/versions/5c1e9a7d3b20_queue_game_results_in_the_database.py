@@ -0,0 +1,38 @@
+"""Queue game results in the database
+
+Revision ID: 5c1e9a7d3b20
+Revises: f4750bc6d94d
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d3b20'
+down_revision: Union[str, Sequence[str], None] = 'f4750bc6d94d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('queued_game_results',
+    sa.Column('queuedGameResultID', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('mode', postgresql.ENUM('original', 'daily', name='modes', create_type=False), nullable=False),
+    sa.Column('won', sa.Boolean(), nullable=False),
+    sa.Column('guesses', sa.Integer(), nullable=False),
+    sa.Column('enqueuedAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('userID', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['userID'], ['users.userID'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('queuedGameResultID')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('queued_game_results')
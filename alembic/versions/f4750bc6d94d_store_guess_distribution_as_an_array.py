@@ -0,0 +1,77 @@
+"""Store guess distribution as an array and drop unused statistics indexes
+
+Revision ID: f4750bc6d94d
+Revises: 247e2910ede8
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4750bc6d94d'
+down_revision: Union[str, Sequence[str], None] = '247e2910ede8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GUESS_COLUMNS = ['guesses1', 'guesses2', 'guesses3', 'guesses4', 'guesses5', 'guesses6']
+
+# Indexes on counters that no query filters or sorts by; every update had to write them
+COUNTER_INDEXES = {
+    'ix_statistics_gamesPlayed': 'gamesPlayed',
+    'ix_statistics_winCount': 'winCount',
+    'ix_statistics_currentStreak': 'currentStreak',
+    'ix_statistics_maximumStreak': 'maximumStreak',
+    **{f'ix_statistics_{column}': column for column in GUESS_COLUMNS},
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('statistics', sa.Column('guessDistribution', postgresql.ARRAY(sa.Integer()), server_default=sa.text("'{0,0,0,0,0,0}'"), nullable=False))
+
+    # Carry the per-column counters over into the array
+    op.execute(
+        'UPDATE statistics SET "guessDistribution" = ARRAY['
+        + ', '.join(f'"{column}"' for column in GUESS_COLUMNS)
+        + ']'
+    )
+
+    op.create_check_constraint('ck_statistics_guessDistribution_length', 'statistics', 'array_length("guessDistribution", 1) = 6')
+
+    for index in COUNTER_INDEXES:
+        op.drop_index(op.f(index), table_name='statistics')
+
+    for column in GUESS_COLUMNS:
+        op.drop_column('statistics', column)
+
+    # Statistics are read by user, which is not the leading primary key column
+    op.create_index(op.f('ix_statistics_userID'), 'statistics', ['userID'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_statistics_userID'), table_name='statistics')
+
+    for column in GUESS_COLUMNS:
+        op.add_column('statistics', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        'UPDATE statistics SET '
+        + ', '.join(f'"{column}" = "guessDistribution"[{position}]' for position, column in enumerate(GUESS_COLUMNS, start=1))
+    )
+
+    # The counters had no server defaults before
+    for column in GUESS_COLUMNS:
+        op.alter_column('statistics', column, server_default=None)
+
+    for index, column in COUNTER_INDEXES.items():
+        op.create_index(op.f(index), 'statistics', [column], unique=False)
+
+    op.drop_constraint('ck_statistics_guessDistribution_length', 'statistics', type_='check')
+
+    op.drop_column('statistics', 'guessDistribution')
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.websockets import game
 from app.api.v1.endpoints import (
+    audio,
     health,
     statistics,
     user,
@@ -26,6 +27,8 @@ api_router.include_router(submit.router, prefix="/game")
 
 api_router.include_router(archive.router, prefix="/archive")
 
+api_router.include_router(audio.router, prefix="/audio")
+
 api_router.include_router(statistics.router, prefix="/statistics")
 
 api_router.include_router(user.router, prefix="/user")
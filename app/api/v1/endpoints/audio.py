@@ -0,0 +1,56 @@
+# FastAPI
+from fastapi import APIRouter, HTTPException
+
+from fastapi.responses import FileResponse
+
+# services
+from app.services.audio.clips import audio_clip_cache
+
+from app.services.audio.storage import LocalAudioStorage, audio_storage
+
+router = APIRouter()
+
+
+@router.get("/clips/{clip_name}")
+def get_audio_clip(clip_name: str, expires: int, signature: str):
+    """
+    Serve a cached audio clip through a signed URL.
+    """
+
+    if audio_clip_cache is None:
+        raise HTTPException(404, "Audio clip not found.")
+
+    clips = audio_clip_cache.clips
+
+    # Reject tampered or expired links
+    if not clips.verify(clip_name, expires, signature):
+        raise HTTPException(403, "Invalid or expired audio link.")
+
+    path = clips.resolve_path(clip_name)
+
+    if path is None:
+        raise HTTPException(404, "Audio clip not found.")
+
+    return FileResponse(path)
+
+
+@router.get("/{audio_link:path}")
+def get_audio(audio_link: str, expires: int, signature: str):
+    """
+    Serve an audio file from the local audio storage through a signed URL.
+    """
+
+    # Only the local backend serves files itself
+    if not isinstance(audio_storage, LocalAudioStorage):
+        raise HTTPException(404, "Audio not found.")
+
+    # Reject tampered or expired links
+    if not audio_storage.verify(audio_link, expires, signature):
+        raise HTTPException(403, "Invalid or expired audio link.")
+
+    path = audio_storage.resolve_path(audio_link)
+
+    if path is None:
+        raise HTTPException(404, "Audio not found.")
+
+    return FileResponse(path)
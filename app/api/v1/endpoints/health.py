@@ -1,8 +1,45 @@
 from fastapi import APIRouter
 
+# app core
+from app.core.event_loop_monitor import event_loop_monitor
+
+from app.db.executor import database_executor
+
+# services
+from app.services.audio.clips import audio_clip_cache
+
+from app.services.catalog.song_metadata_cache import song_metadata_cache
+
+from app.services.game.game import lyrics_puzzle_pool
+
+from app.services.game.game_result_queue import game_result_queue
+
+from app.services.song import signed_url_cache
+
+# websocket
+from app.ws.session_store import sessions
+
 router = APIRouter()
 
 
 @router.get("/")
 def health():
     return {"status": "ok"}
+
+
+@router.get("/metrics/")
+def metrics():
+    """
+    Report counters of the in-process caches and background workers.
+    """
+
+    return {
+        "eventLoop": event_loop_monitor.get_metrics(),
+        "databaseExecutor": database_executor.get_metrics(),
+        "sessions": sessions.get_metrics(),
+        "gameResultQueue": game_result_queue.get_metrics(),
+        "lyricsPuzzlePool": lyrics_puzzle_pool.get_metrics(),
+        "songMetadataCache": song_metadata_cache.get_metrics(),
+        "signedUrlCache": signed_url_cache.get_metrics(),
+        "audioClipCache": audio_clip_cache.get_metrics() if audio_clip_cache else None,
+    }
@@ -1,5 +1,8 @@
+# standard library
+from typing import Annotated
+
 # FastAPI
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 # SQLAlchemy
 from sqlalchemy.orm import Session
@@ -8,17 +11,60 @@ from sqlalchemy.orm import Session
 from app.db.get_db import get_db
 
 # schemas
-from app.schemas.song import GetAllSongResponse
+from app.schemas.song import GetAllSongResponse, SongSearchResult
+
+# services
+from app.services.catalog.title_search import title_search_index
+
+from app.services.catalog.title_snapshot import song_titles_snapshot
 
 # utils
-from app.services.song import get_all_song_titles
+from app.utils.helpers import accepts_gzip, etag_matches
 
 router = APIRouter()
 
 
 @router.get("/songs/", response_model=list[GetAllSongResponse])
-def get_all_songs(db: Session = Depends(get_db)):
-    # Get an ordered list of titles
-    titles = get_all_song_titles(db)
+def get_all_songs(request: Request, db: Session = Depends(get_db)):
+    """
+    Retrieve an alphabetically ordered list of all song titles.
+
+    The list is served from a pre-serialized snapshot with an ETag, so repeat
+    visitors get a 304 until the catalog changes.
+    """
+
+    snapshot = song_titles_snapshot.get(db)
+
+    headers = {
+        "ETag": snapshot.etag,
+        "Vary": "Accept-Encoding",
+        # Allow caching, but revalidate with the ETag on every use
+        "Cache-Control": "no-cache",
+    }
+
+    # The client already has the current list
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+
+    # Serve the pre-compressed body when the client supports it
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        return Response(
+            snapshot.gzip_body,
+            media_type="application/json",
+            headers={**headers, "Content-Encoding": "gzip"},
+        )
+
+    return Response(snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.get("/songs/search/", response_model=list[SongSearchResult])
+def search_songs(
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    db: Session = Depends(get_db),
+):
+    """
+    Find the songs whose title or artists best match a prefix or misspelled query.
+    """
 
-    return [{"title": t} for t in titles]
+    return title_search_index.search(db, q, limit)
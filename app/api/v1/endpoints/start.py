@@ -30,16 +30,19 @@ from app.schemas.enums import GameMode
 # websocket
 from app.ws.session_manager import create_ws_game_session
 
+from app.ws.session_tokens import resume_token_signer
+
 # services
 from app.services.game.game import start_game_service
 
-from app.services.song import get_signed_audio_link
+from app.services.song import get_signed_audio_clip_link, get_signed_audio_link
 
 from app.services.user.user_dependencies import get_optional_user
 
 # exceptions
 from app.services.exceptions import (
     AnswerPositionsLengthMismatch,
+    AudioClipExtractionFailed,
     ArchiveDateNotProvided,
     DateIsTodayOrInTheFuture,
     DateProvided,
@@ -103,6 +106,7 @@ def start_game(
 
     # Create a new WebSocket game session and return its ID
     ws_game_session_id = create_ws_game_session(
+        db,
         answer,
         result.song.songID,
         user_id,
@@ -122,6 +126,9 @@ def start_game(
 
     expires_in_minutes = result.expires_in_minutes
 
+    # Lets the client reconnect to the same game after its connection drops
+    resume_token = resume_token_signer.sign(ws_game_session_id)
+
     if mode == GameMode.LYRICS:
         # Lyrics mode requires pre-generated lyrics content
         if result.lyrics_given is None:
@@ -133,6 +140,7 @@ def start_game(
         return LyricsStartGameResponse(
             wsGameSessionID=ws_game_session_id,
             wsURL=ws_url,
+            resumeToken=resume_token,
             expiresInMinutes=expires_in_minutes,
             mode=mode,
             lyrics=result.lyrics_given,
@@ -146,8 +154,20 @@ def start_game(
                 500, f"{mode} game mode has no audio or start time available."
             )
 
-        # Generate a signed URL for more secure audio playback
-        audio = HttpUrl(get_signed_audio_link(mode, result.song.audioLink))
+        audio_start_at = result.audio_start_at
+
+        try:
+            # Point the client at a pre-cut clip so it only downloads the part it plays
+            audio = HttpUrl(
+                get_signed_audio_clip_link(mode, result.song.audioLink, audio_start_at)
+            )
+
+            # The clip already begins at the start position
+            audio_start_at = 0
+
+        except AudioClipExtractionFailed:
+            # Generate a signed URL of the whole song for more secure audio playback
+            audio = HttpUrl(get_signed_audio_link(mode, result.song.audioLink))
 
         date = result.date
 
@@ -155,9 +175,10 @@ def start_game(
         return AudioStartGameResponse(
             wsGameSessionID=ws_game_session_id,
             wsURL=ws_url,
+            resumeToken=resume_token,
             expiresInMinutes=expires_in_minutes,
             mode=mode,
             audio=audio,
-            audioStartAt=result.audio_start_at,
+            audioStartAt=audio_start_at,
             date=date,
         )
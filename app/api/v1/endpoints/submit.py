@@ -18,13 +18,7 @@ from app.services.game.game import submit_game_service
 from app.services.user.user_dependencies import get_current_user
 
 # exceptions
-from app.services.exceptions import (
-    DatabasePersistenceFailed,
-    InvalidNumberOfAttempts,
-    DuplicateSession,
-    SongNotFound,
-    UserAlreadyPlayedTheDailyGame,
-)
+from app.services.exceptions import GameResultNotRecorded, InvalidSession
 
 router = APIRouter()
 
@@ -38,22 +32,13 @@ def submit_game(
     user_id = user.userID
 
     try:
-        # Process the submitted game and persist results
+        # Acknowledge the game, whose result the server records itself
         submit_game_service(payload, db, user_id)
 
-    except InvalidNumberOfAttempts:
-        raise HTTPException(400, "Invalid number of attempts for the game mode.")
+    except InvalidSession:
+        raise HTTPException(400, "Invalid session.")
 
-    except DuplicateSession:
-        raise HTTPException(409, "Result already submitted for this session.")
-
-    except UserAlreadyPlayedTheDailyGame:
-        raise HTTPException(403, "User has already played today's Heardle.")
-
-    except SongNotFound:
-        raise HTTPException(404, "Song not found in the database.")
-
-    except DatabasePersistenceFailed:
-        raise HTTPException(500, "The database failed to persist the data.")
+    except GameResultNotRecorded:
+        raise HTTPException(409, "Game results are recorded by the server when the game ends.")
 
     return None
@@ -1,34 +1,65 @@
 # standard library
-from datetime import datetime, timezone
+import asyncio
+
+import time
+
+from typing import Optional
 
 # FastAPI
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 # app core
-from app.db.get_db import db_session
+from app.core.config import settings
 
-# schemas
-from pydantic import ValidationError
+from app.db.executor import database_executor
 
-from app.schemas.game import ClientGuess
+# schemas
+from app.schemas.game import ClientPong
 
 # services
-from app.services.song import get_song_metadata_by_songID
+from app.services.catalog.song_metadata_cache import song_metadata_cache
+
+# exceptions
+from app.services.exceptions import (
+    DatabasePersistenceFailed,
+    DuplicateSession,
+    UserAlreadyPlayedTheDailyGame,
+)
 
 # websocket
 from app.ws.connection_manager import manager
 
-from app.ws.session import sessions
+from app.ws.session_store import call_session_store, sessions
+
+from app.ws.protocol import negotiate_protocol
+
+from app.ws.session_manager import check_guess, save_game_result
 
-from app.ws.session_manager import check_guess
+from app.ws.session_tokens import resume_token_signer
 
 router = APIRouter()
 
 
 @router.websocket("/{game_session_id}")
-async def game_ws(websocket: WebSocket, game_session_id: str):
-    # Get the session
-    session = sessions.get(game_session_id)
+async def game_ws(
+    websocket: WebSocket, game_session_id: str, resume: Optional[str] = None
+):
+    if resume is not None:
+        # Reattach a game parked after its connection dropped
+        session = (
+            await call_session_store(sessions.resume, game_session_id)
+            if resume_token_signer.verify(game_session_id, resume)
+            else None
+        )
+
+    else:
+        # Get the session
+        session = await call_session_store(sessions.get, game_session_id)
+
+        # Parked games can only be resumed with their resume token; token sessions are
+        # checked without a store lookup, and their guesses are refused while parked instead
+        if session and session.parked_until:
+            session = None
 
     # Check if session exists
     if not session:
@@ -43,44 +74,149 @@ async def game_ws(websocket: WebSocket, game_session_id: str):
 
         return
 
-    await manager.connect(game_session_id, websocket)
+    # JSON unless the client negotiated the binary subprotocol
+    protocol = negotiate_protocol(websocket)
+
+    await manager.connect(game_session_id, websocket, protocol.subprotocol)
+
+    # Unfinished games are parked when the handler exits, and recorded as lost if they expire unresumed
+    finished = False
+
+    # Finished games whose result failed to persist are left for the reaper to retry
+    retry = False
+
+    if resume is not None:
+        # Tell the client where the game stands
+        await manager.send(
+            game_session_id, {"type": "resumed", "attempts": session.attempts}
+        )
 
     try:
+        # Last time the client was heard from; it is pinged once idle for the ping interval
+        last_activity = time.monotonic()
+
+        pinged = False
+
         while True:
+            now = time.time()
+
             # Validate expiration of the game session
-            if session.expires_at < datetime.now(timezone.utc):
+            if session.is_expired(now):
                 # Notify the client about expiration
                 await manager.send(game_session_id, {"type": "expired"})
 
                 # Break the game loop
                 break
 
-            # Wait for a guess
-            data = await websocket.receive_json()
+            idle_seconds = time.monotonic() - last_activity
 
-            # Validate message format
+            # Close connections that stopped answering pings
+            if idle_seconds >= settings.websocket_idle_timeout_seconds:
+                await manager.send(game_session_id, {"type": "timeout"})
+
+                break
+
+            if not pinged and idle_seconds >= settings.websocket_ping_interval_seconds:
+                await protocol.send_ping(websocket)
+
+                pinged = True
+
+            # Wake up at the session deadline, the next ping or the idle timeout, whichever is first
+            timeout = min(
+                session.expires_at_epoch - now,
+                settings.websocket_idle_timeout_seconds - idle_seconds,
+            )
+
+            if not pinged:
+                timeout = min(
+                    timeout, settings.websocket_ping_interval_seconds - idle_seconds
+                )
+
+            # Wait for a message
             try:
-                message = ClientGuess.model_validate(data)
+                message = await asyncio.wait_for(protocol.receive(websocket), timeout)
+
+            except asyncio.TimeoutError:
+                continue
 
-            except ValidationError:
+            last_activity = time.monotonic()
+
+            pinged = False
+
+            # Validate message format
+            if message is None:
                 await manager.send(
                     game_session_id, {"error": "Invalid client message format."}
                 )
 
                 continue
 
+            # Pongs only keep the connection alive
+            if isinstance(message, ClientPong):
+                continue
+
+            guess = message
+
             # Process the guess
-            response = check_guess(game_session_id, message.guess)
+            outcome = await call_session_store(check_guess, game_session_id, guess)
+
+            # The session expired and was evicted while waiting for the guess
+            if outcome is None:
+                await manager.send(game_session_id, {"type": "expired"})
+
+                break
 
-            # Send back the response
-            await manager.send(game_session_id, response.model_dump())
+            # Send back the result
+            await protocol.send_result(websocket, guess, outcome)
 
             # Break the game loop if the game is finished
-            if response.done is True:
-                # Fetch song metadata
-                with db_session() as db:
-                    song_metadata = get_song_metadata_by_songID(
-                        db, session.answer_song_id
+            if outcome.done is True:
+                finished = True
+
+                # Record the result before the end game pop up, so it is in place for clients
+                # that still submit it once the game ends
+                try:
+                    saved = await database_executor.run(
+                        save_game_result,
+                        game_session_id,
+                        session,
+                        outcome.is_correct,
+                        outcome.attempts,
+                    )
+
+                except DuplicateSession:
+                    saved = False
+
+                    await manager.send(
+                        game_session_id,
+                        {"error": "Result already submitted for this session."},
+                    )
+
+                except UserAlreadyPlayedTheDailyGame:
+                    saved = False
+
+                    await manager.send(
+                        game_session_id,
+                        {"error": "User has already played today's Heardle."},
+                    )
+
+                except DatabasePersistenceFailed:
+                    saved = False
+
+                    retry = True
+
+                    await manager.send(
+                        game_session_id,
+                        {"error": "The database failed to persist the data."},
+                    )
+
+                # Fetch song metadata, warmed when the session was created
+                song_metadata = song_metadata_cache.get(session.answer_song_id)
+
+                if song_metadata is None:
+                    # Evicted since then; load it on the database executor, off the event loop
+                    song_metadata = await database_executor.run(
+                        song_metadata_cache.warm, session.answer_song_id
                     )
 
                 # Send metadata for the end game pop up
@@ -88,6 +224,9 @@ async def game_ws(websocket: WebSocket, game_session_id: str):
                     game_session_id, song_metadata.model_dump(mode="json")
                 )
 
+                if saved:
+                    await manager.send(game_session_id, {"type": "submitted"})
+
                 break
 
     except WebSocketDisconnect:
@@ -97,5 +236,22 @@ async def game_ws(websocket: WebSocket, game_session_id: str):
         # Clean up on disconnect
         await manager.disconnect(game_session_id)
 
-        # Remove the session from active sessions
-        sessions.pop(game_session_id, None)
+        if retry:
+            # Hand the finished game to the reaper, which records it on its next sweep
+            await call_session_store(
+                sessions.park, game_session_id, int(time.time())
+            )
+
+        elif finished or settings.websocket_resume_grace_seconds <= 0:
+            # Remove the session from active sessions; without a grace period a dropped
+            # game is discarded on disconnect
+            await call_session_store(sessions.remove, game_session_id)
+
+        else:
+            # Keep the game for a reconnect within the grace period; the reaper evicts it
+            # once the grace period runs out, and records a loss only if the session expired
+            await call_session_store(
+                sessions.park,
+                game_session_id,
+                int(time.time()) + settings.websocket_resume_grace_seconds,
+            )
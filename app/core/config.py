@@ -21,6 +21,94 @@ class Settings(BaseSettings):
 
     frontend_url: Optional[str] = None
 
+    # Seconds before in-memory catalog caches are rebuilt from the database
+    catalog_refresh_interval_seconds: int = 300
+
+    # Number of recently served songs a user will not be given again in free-play modes
+    recent_songs_history_size: int = 50
+
+    # Maximum number of users whose recently served songs are remembered
+    recent_songs_maximum_users: int = 100_000
+
+    # Maximum number of songs whose tokenized lyrics are kept in memory
+    lyrics_cache_size: int = 2048
+
+    # Song metadata sent at the end of a game; daily sessions last until the end of the day
+    song_metadata_cache_size: int = 4096
+
+    song_metadata_cache_ttl_seconds: int = 24 * 60 * 60
+
+    # Pre-generated lyrics puzzles; the pool is refilled to the high watermark once it drops to the low one
+    lyrics_puzzle_pool_enabled: bool = True
+
+    lyrics_puzzle_pool_low_watermark: int = 8
+
+    lyrics_puzzle_pool_high_watermark: int = 32
+
+    # Signed audio URLs are shared by every request within a bucket of this many seconds
+    signed_url_bucket_seconds: int = 600
+
+    signed_url_cache_size: int = 4096
+
+    # Where audio files are served from: "supabase" or "local"
+    audio_storage_backend: str = "supabase"
+
+    local_audio_directory: Optional[str] = None
+
+    # Key for signing local audio URLs; defaults to the Supabase key
+    audio_signing_key: Optional[str] = None
+
+    # Serve pre-cut audio clips instead of whole songs
+    audio_clips_enabled: bool = False
+
+    audio_clip_directory: str = "clips"
+
+    audio_clip_cache_max_bytes: int = 512 * 1024 * 1024
+
+    ffmpeg_path: str = "ffmpeg"
+
+    # Idle WebSocket clients are pinged after this many seconds and closed after the idle timeout
+    websocket_ping_interval_seconds: float = 20.0
+
+    websocket_idle_timeout_seconds: float = 60.0
+
+    # Threads, each with its own database connection, for database work started from async code
+    database_executor_workers: int = 4
+
+    # Event loop lag is sampled at this interval; percentiles cover the latest window of samples
+    event_loop_lag_interval_seconds: float = 0.5
+
+    event_loop_lag_window_size: int = 600
+
+    # Seconds between sweeps that evict expired WebSocket game sessions
+    session_reap_interval_seconds: float = 5.0
+
+    # Queue statistics and leaderboard updates with each game session and apply them in batches in the background
+    game_result_queue_enabled: bool = False
+
+    game_result_queue_batch_size: int = 1000
+
+    game_result_queue_flush_interval_seconds: float = 1.0
+
+    # Where WebSocket game sessions live: "memory" (single worker) or "redis" (shared by workers)
+    session_store_backend: str = "memory"
+
+    redis_url: Optional[str] = None
+
+    redis_socket_timeout_seconds: float = 1.0
+
+    # Local file the in-memory sessions are saved to on shutdown and reloaded from on startup; unset disables it
+    session_snapshot_path: Optional[str] = None
+
+    # Use signed tokens as session IDs, so only attempt counters are kept in the session store
+    session_tokens_enabled: bool = False
+
+    # Key for signing session and resume tokens; defaults to the Supabase key
+    session_token_secret: Optional[str] = None
+
+    # Seconds a dropped or idle WebSocket game waits to be resumed before it is discarded; 0 discards it on disconnect
+    websocket_resume_grace_seconds: int = 60
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -0,0 +1,67 @@
+# standard library
+import asyncio
+
+from collections import deque
+
+# app core
+from app.core.config import settings
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed-interval sleep.
+
+    Any lag is time that every WebSocket and async request on this worker
+    spent waiting for something blocking to return control to the loop.
+    """
+
+    def __init__(self, interval_seconds: float, window_size: int):
+        self.interval_seconds = interval_seconds
+
+        # Most recent lag samples, in seconds
+        self._samples: deque[float] = deque(maxlen=window_size)
+
+        # Counters
+        self.last_lag_seconds = 0.0
+        self.maximum_lag_seconds = 0.0
+
+    async def run(self):
+        """
+        Sample the lag until cancelled.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            started_at = loop.time()
+
+            await asyncio.sleep(self.interval_seconds)
+
+            lag = max(0.0, loop.time() - started_at - self.interval_seconds)
+
+            self._samples.append(lag)
+
+            self.last_lag_seconds = lag
+
+            self.maximum_lag_seconds = max(self.maximum_lag_seconds, lag)
+
+    def get_metrics(self) -> dict[str, float]:
+        """
+        Get a snapshot of the lag over the sample window.
+        """
+
+        samples = sorted(self._samples)
+
+        # Nearest-rank percentile over the window
+        p99 = samples[int(0.99 * (len(samples) - 1))] if samples else 0.0
+
+        return {
+            "lastLagSeconds": self.last_lag_seconds,
+            "p99LagSeconds": p99,
+            "maximumLagSeconds": self.maximum_lag_seconds,
+        }
+
+
+event_loop_monitor = EventLoopLagMonitor(
+    settings.event_loop_lag_interval_seconds, settings.event_loop_lag_window_size
+)
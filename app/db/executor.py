@@ -0,0 +1,131 @@
+# standard library
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Any, Callable, Optional, TypeVar
+
+# SQLAlchemy
+from sqlalchemy import Engine, create_engine
+
+from sqlalchemy.orm import Session, sessionmaker
+
+# app core
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class DatabaseExecutor:
+    """
+    Bounded thread pool for database work started from async code.
+
+    It has its own engine with one connection per worker, so when many games
+    finish at once the queries queue here instead of stalling the event loop
+    or taking connections from the request handlers.
+    """
+
+    def __init__(self, database_url: str, max_workers: int):
+        self.database_url = database_url
+
+        self.max_workers = max_workers
+
+        self.session_factory: Optional[sessionmaker[Session]] = None
+
+        self._engine: Optional[Engine] = None
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Counters
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        """
+        Create the connection pool and worker threads.
+        """
+
+        # Never open more connections than there are workers to use them
+        self._engine = create_engine(
+            self.database_url,
+            pool_pre_ping=True,
+            pool_size=self.max_workers,
+            max_overflow=0,
+        )
+
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=self._engine
+        )
+
+        self._executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="database-executor"
+        )
+
+    def stop(self):
+        """
+        Stop the worker threads and close the pooled connections.
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+        if self._engine is not None:
+            self._engine.dispose()
+
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Call function(db, *args) on a worker thread with a database session of its own.
+
+        Returns:
+            The function's return value, once a worker has run it.
+        """
+
+        assert self._executor is not None, "The database executor is not started."
+
+        loop = asyncio.get_running_loop()
+
+        # Only touched from the event loop, so no lock is needed
+        self.pending += 1
+
+        try:
+            result = await loop.run_in_executor(
+                self._executor, self._call, function, args
+            )
+
+        except Exception:
+            self.failed += 1
+
+            raise
+
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+
+        return result
+
+    def get_metrics(self) -> dict[str, int]:
+        """
+        Get a snapshot of the executor counters.
+        """
+
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def _call(self, function: Callable[..., T], args: tuple[Any, ...]) -> T:
+        assert self.session_factory is not None
+
+        with self.session_factory() as db:
+            return function(db, *args)
+
+
+assert settings.database_url is not None, "Missing database URL in .env."
+
+database_executor = DatabaseExecutor(
+    settings.database_url, settings.database_executor_workers
+)
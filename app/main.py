@@ -1,3 +1,9 @@
+# standard library
+import asyncio
+
+from contextlib import asynccontextmanager
+
+# FastAPI
 from fastapi import FastAPI
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,7 +12,68 @@ from app.api.v1.api import api_router
 
 from app.core.config import settings
 
-app = FastAPI(title="HeAAArdle")
+from app.core.event_loop_monitor import event_loop_monitor
+
+from app.db.executor import database_executor
+
+from app.services.catalog.catalog import warm_catalog_caches
+
+from app.services.game.game import lyrics_puzzle_pool
+
+from app.services.game.game_result_queue import game_result_queue
+
+from app.ws.session_manager import run_session_reaper
+
+from app.ws.session_store import restore_sessions, sessions, snapshot_sessions
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the in-memory catalog caches before serving requests
+    warm_catalog_caches()
+
+    # Start pre-generating lyrics puzzles in the background
+    if settings.lyrics_puzzle_pool_enabled:
+        lyrics_puzzle_pool.start()
+
+    # Apply queued statistics and leaderboard updates, including any left by a crash
+    if settings.game_result_queue_enabled:
+        game_result_queue.start()
+
+    # Dedicated threads and connections for database work started from async code
+    database_executor.start()
+
+    # Measure how long the event loop is blocked
+    lag_monitor = asyncio.create_task(event_loop_monitor.run())
+
+    # Reload the games that were in progress when the previous process shut down
+    if settings.session_snapshot_path:
+        restore_sessions(sessions, settings.session_snapshot_path)
+
+    # Evict expired and abandoned game sessions, recording played games that ran out of time as lost
+    reaper = asyncio.create_task(
+        run_session_reaper(sessions, settings.session_reap_interval_seconds)
+    )
+
+    yield
+
+    reaper.cancel()
+
+    # Connections were already closed with 1012 (service restart), parking their games,
+    # so clients reconnect with their resume token once the new process is up
+    if settings.session_snapshot_path:
+        snapshot_sessions(sessions, settings.session_snapshot_path)
+
+    lag_monitor.cancel()
+
+    database_executor.stop()
+
+    game_result_queue.stop()
+
+    lyrics_puzzle_pool.stop()
+
+
+app = FastAPI(title="HeAAArdle", lifespan=lifespan)
 
 assert settings.frontend_url is not None, "Missing frontend URL in .env."
 
@@ -2,6 +2,7 @@ from .artist import Artist
 from .daily_game import DailyGame
 from .game_session import GameSession
 from .leaderboard import Leaderboard
+from .queued_game_result import QueuedGameResult
 from .song import Song
 from .song__artist import SongArtist
 from .statistics import Statistics
@@ -13,6 +14,7 @@ __all__ = [
     "DailyGame",
     "GameSession",
     "Leaderboard",
+    "QueuedGameResult",
     "Song",
     "SongArtist",
     "Statistics",
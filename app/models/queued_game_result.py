@@ -0,0 +1,43 @@
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, ForeignKey, func
+
+from sqlalchemy.dialects.postgresql import UUID
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+import uuid
+
+from datetime import datetime
+
+from app.db.base import Base
+
+from app.models.enums import modes
+
+
+class QueuedGameResult(Base):
+    """
+    Statistics and leaderboard updates of a recorded game, waiting to be applied in a batch.
+
+    Inserted in the same transaction as the game session, and deleted in
+    the same transaction that applies it.
+    """
+
+    __tablename__ = "queued_game_results"
+
+    # Increasing, so results are applied in the order they were recorded
+    queuedGameResultID: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True
+    )
+
+    mode: Mapped[str] = mapped_column(modes, nullable=False)
+    won: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    guesses: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    enqueuedAt: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    # Foreign Keys
+
+    userID: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.userID", ondelete="CASCADE"), nullable=False
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import Integer, ForeignKey
+from sqlalchemy import CheckConstraint, Integer, ForeignKey, text
 
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,41 +15,26 @@ if TYPE_CHECKING:
 
 from app.models.enums import modes
 
+# One counter per allowed number of guesses
+GUESS_DISTRIBUTION_LENGTH = 6
+
 
 class Statistics(Base):
     __tablename__ = "statistics"
 
     mode: Mapped[str] = mapped_column(modes, primary_key=True)
 
-    gamesPlayed: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    winCount: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    currentStreak: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    maximumStreak: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    guesses1: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    guesses2: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    guesses3: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    guesses4: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    guesses5: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
-    )
-    guesses6: Mapped[int] = mapped_column(
-        Integer, nullable=False, index=True, default=0
+    gamesPlayed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    winCount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    currentStreak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    maximumStreak: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Games by number of guesses taken; element n (1-based) counts games that took n guesses
+    guessDistribution: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer),
+        nullable=False,
+        default=lambda: [0] * GUESS_DISTRIBUTION_LENGTH,
+        server_default=text("'{0,0,0,0,0,0}'"),
     )
 
     # Foreign Keys
@@ -58,6 +43,8 @@ class Statistics(Base):
         UUID(as_uuid=True),
         ForeignKey("users.userID", ondelete="CASCADE"),
         primary_key=True,
+        # Statistics are looked up by user, which is not the leading primary key column
+        index=True,
     )
 
     # Relationships
@@ -66,3 +53,10 @@ class Statistics(Base):
     user: Mapped["User"] = relationship(
         "User", back_populates="statistics"
     )
+
+    __table_args__ = (
+        CheckConstraint(
+            f'array_length("guessDistribution", 1) = {GUESS_DISTRIBUTION_LENGTH}',
+            name="ck_statistics_guessDistribution_length",
+        ),
+    )
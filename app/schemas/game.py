@@ -24,6 +24,7 @@ class StartGameRequest(BaseModel):
 class BaseStartGameResponse(BaseModel):
     wsGameSessionID: str
     wsURL: AnyWebsocketUrl
+    resumeToken: str
     expiresInMinutes: Annotated[int, Field(ge=0)]
     date: Optional[DateType]
 
@@ -54,6 +55,13 @@ class ClientGuess(BaseModel):
     guess: str
 
 
+class ClientPong(BaseModel):
+    type: Literal["pong"]
+
+
+ClientMessage = Annotated[Union[ClientGuess, ClientPong], Field(discriminator="type")]
+
+
 class ServerCheck(BaseModel):
     type: Literal["result"]
     guess: str
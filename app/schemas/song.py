@@ -11,6 +11,11 @@ class GetAllSongResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SongSearchResult(BaseModel):
+    title: str
+    artists: List[str]
+
+
 class SongMetadata(BaseModel):
     type: Literal["song metadata"]
     title: str
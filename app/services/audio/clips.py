@@ -0,0 +1,244 @@
+# standard library
+import hashlib
+
+import os
+
+import subprocess
+
+import tempfile
+
+import threading
+
+from collections import OrderedDict
+
+from pathlib import Path, PurePosixPath
+
+# app core
+from app.core.config import settings
+
+# services
+from app.services.audio.storage import AudioStorage, LocalAudioStorage, audio_storage
+
+# exceptions
+from app.services.exceptions import AudioClipExtractionFailed
+
+
+class AudioClipCache:
+    """
+    Content-addressed on-disk cache of audio clips cut from full songs.
+
+    A clip is identified by (audio link, start, length), so every game that plays
+    the same segment, such as today's daily song, shares a single file. The least
+    recently used clips are deleted once the cache exceeds maximum_bytes.
+    """
+
+    def __init__(
+        self,
+        source: AudioStorage,
+        clips: LocalAudioStorage,
+        maximum_bytes: int,
+        ffmpeg_path: str,
+    ):
+        self.source = source
+
+        # Serves and signs the cached clip files
+        self.clips = clips
+
+        self.maximum_bytes = maximum_bytes
+
+        self.ffmpeg_path = ffmpeg_path
+
+        # { key: clip file name, value: size in bytes }, least recently used first
+        self._files: OrderedDict[str, int] = OrderedDict()
+
+        self._total_bytes = 0
+
+        self._lock = threading.Lock()
+
+        # One lock per clip being generated, so concurrent requests cut it only once
+        self._pending: dict[str, threading.Lock] = {}
+
+        self._load_existing_files()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, audio_link: str, start_at: int, length: int) -> str:
+        """
+        Get the file name of a cached clip, cutting it from the full song on a miss.
+
+        Raises:
+            AudioClipExtractionFailed: If the source cannot be read or cut.
+        """
+
+        name = self._get_clip_name(audio_link, start_at, length)
+
+        if self._hit(name):
+            return name
+
+        with self._lock:
+            pending = self._pending.setdefault(name, threading.Lock())
+
+        with pending:
+            # Another request may have cut the clip while this one waited
+            if self._hit(name):
+                return name
+
+            with self._lock:
+                self.misses += 1
+
+            try:
+                size = self._extract(audio_link, start_at, length, name)
+
+            except BaseException:
+                with self._lock:
+                    self._pending.pop(name, None)
+
+                raise
+
+            with self._lock:
+                # Record the clip before dropping the pending entry, so no request sees neither
+                if name not in self._files:
+                    self._files[name] = size
+                    self._total_bytes += size
+
+                    self._evict()
+
+                self._pending.pop(name, None)
+
+        return name
+
+    def create_signed_url(self, name: str, expires_in_seconds: int) -> str:
+        """
+        Create a signed URL for a cached clip.
+        """
+
+        return self.clips.create_signed_url(name, expires_in_seconds)
+
+    def get_metrics(self) -> dict[str, int]:
+        """
+        Get a snapshot of the cache counters.
+        """
+
+        return {
+            "files": len(self._files),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _get_clip_name(self, audio_link: str, start_at: int, length: int) -> str:
+        digest = hashlib.sha256(f"{audio_link}\0{start_at}\0{length}".encode())
+
+        # Keep the source extension so the clip can be stream-copied into the same container
+        suffix = PurePosixPath(audio_link).suffix
+
+        return digest.hexdigest() + suffix
+
+    def _hit(self, name: str) -> bool:
+        # Mark a clip as recently used and count the hit, if it is cached
+        with self._lock:
+            if name not in self._files:
+                return False
+
+            self._files.move_to_end(name)
+
+            self.hits += 1
+
+            return True
+
+    def _extract(self, audio_link: str, start_at: int, length: int, name: str) -> int:
+        # Cut the clip into a temporary file and move it into place once complete
+        target = self.clips.directory / name
+
+        try:
+            data = self.source.download(audio_link)
+
+        except Exception as error:
+            raise AudioClipExtractionFailed() from error
+
+        with tempfile.TemporaryDirectory(dir=self.clips.directory) as workspace:
+            source_path = Path(workspace) / f"source{target.suffix}"
+            clip_path = Path(workspace) / name
+
+            source_path.write_bytes(data)
+
+            command = [
+                self.ffmpeg_path,
+                "-v",
+                "error",
+                "-ss",
+                str(start_at),
+                "-t",
+                str(length),
+                "-i",
+                str(source_path),
+                "-vn",
+                "-c",
+                "copy",
+                str(clip_path),
+            ]
+
+            try:
+                subprocess.run(command, check=True, capture_output=True, timeout=30)
+
+            except (OSError, subprocess.SubprocessError) as error:
+                raise AudioClipExtractionFailed() from error
+
+            os.replace(clip_path, target)
+
+        return target.stat().st_size
+
+    def _evict(self):
+        # Delete least recently used clips until the cache fits its budget
+        while self._total_bytes > self.maximum_bytes and len(self._files) > 1:
+            name, size = self._files.popitem(last=False)
+
+            self._total_bytes -= size
+
+            (self.clips.directory / name).unlink(missing_ok=True)
+
+    def _load_existing_files(self):
+        # Pick up clips cut before a restart, oldest first
+        self.clips.directory.mkdir(parents=True, exist_ok=True)
+
+        files = [path for path in self.clips.directory.iterdir() if path.is_file()]
+
+        for path in sorted(files, key=lambda path: path.stat().st_mtime):
+            size = path.stat().st_size
+
+            self._files[path.name] = size
+            self._total_bytes += size
+
+        self._evict()
+
+
+def create_audio_clip_cache() -> AudioClipCache:
+    """
+    Create the audio clip cache from the settings.
+    """
+
+    signing_key = settings.audio_signing_key or settings.supabase_key
+
+    assert signing_key is not None, "Missing audio signing key in .env."
+
+    scheme = "https" if settings.env == "production" else "http"
+
+    Path(settings.audio_clip_directory).mkdir(parents=True, exist_ok=True)
+
+    clips = LocalAudioStorage(
+        settings.audio_clip_directory,
+        signing_key,
+        f"{scheme}://{settings.host}/api/v1/audio/clips",
+    )
+
+    return AudioClipCache(
+        audio_storage,
+        clips,
+        settings.audio_clip_cache_max_bytes,
+        settings.ffmpeg_path,
+    )
+
+
+audio_clip_cache = create_audio_clip_cache() if settings.audio_clips_enabled else None
@@ -0,0 +1,103 @@
+# standard library
+import threading
+
+import time
+
+from dataclasses import dataclass
+
+from typing import Callable
+
+# cachetools
+from cachetools import TTLCache
+
+# Signs a storage path for the given number of seconds and returns the URL
+Signer = Callable[[str, int], str]
+
+
+@dataclass
+class SignedUrl:
+    url: str
+
+    # Wall-clock time (epoch seconds) at which the URL stops working
+    expires_at: float
+
+
+class SignedUrlCache:
+    """
+    Cache of signed audio URLs keyed by (audio link, expiry bucket).
+
+    Time is split into buckets of bucket_seconds. The first request in a bucket
+    signs a URL valid for its own window plus one bucket, so every later request
+    in the same bucket can reuse it. A new bucket signs a fresh URL well before
+    the previous one expires.
+    """
+
+    def __init__(
+        self,
+        sign: Signer,
+        bucket_seconds: int,
+        maximum_entries: int,
+        timer: Callable[[], float] = time.time,
+    ):
+        self.sign = sign
+
+        self.bucket_seconds = bucket_seconds
+
+        # Wall clock shared by the buckets and the entry expiry
+        self.timer = timer
+
+        # Entries are useless once their bucket has passed
+        self._urls: TTLCache[tuple[str, int], SignedUrl] = TTLCache(
+            maxsize=maximum_entries, ttl=bucket_seconds, timer=timer
+        )
+
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, audio_link: str, expires_in_seconds: int) -> str:
+        """
+        Get a signed URL for an audio file that stays valid for at least expires_in_seconds.
+        """
+
+        now = self.timer()
+
+        key = (audio_link, int(now // self.bucket_seconds))
+
+        with self._lock:
+            entry = self._urls.get(key)
+
+        # Only hand out a cached URL that outlives the requested window
+        if entry is not None and entry.expires_at - now >= expires_in_seconds:
+            self.hits += 1
+
+            return entry.url
+
+        self.misses += 1
+
+        # Sign for the requested window plus one bucket so the URL can be reused within the bucket
+        lifetime = expires_in_seconds + self.bucket_seconds
+
+        url = self.sign(audio_link, lifetime)
+
+        with self._lock:
+            self._urls[key] = SignedUrl(url=url, expires_at=now + lifetime)
+
+        return url
+
+    def clear(self):
+        """
+        Drop every cached URL.
+        """
+
+        with self._lock:
+            self._urls.clear()
+
+    def get_metrics(self) -> dict[str, int]:
+        """
+        Get a snapshot of the cache counters.
+        """
+
+        return {"size": len(self._urls), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,158 @@
+# standard library
+import base64
+
+import hashlib
+
+import hmac
+
+import time
+
+from pathlib import Path
+
+from typing import Optional
+
+from urllib.parse import quote, urlencode
+
+# app core
+from app.core.config import settings
+
+
+class AudioStorage:
+    """
+    Storage backend that hands out time-limited URLs for song audio files.
+    """
+
+    def create_signed_url(self, audio_link: str, expires_in_seconds: int) -> str:
+        # Create a URL that gives access to the audio file for the given duration
+        raise NotImplementedError
+
+    def download(self, audio_link: str) -> bytes:
+        # Read the full contents of the audio file
+        raise NotImplementedError
+
+
+class SupabaseAudioStorage(AudioStorage):
+    """
+    Audio files stored in a Supabase Storage bucket.
+    """
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    def create_signed_url(self, audio_link: str, expires_in_seconds: int) -> str:
+        # Import lazily so the Supabase client is only created when this backend is in use
+        from app.db.supabase import supabase
+
+        # Create a signed URL for the audio file in the bucket
+        link = supabase.storage.from_(self.bucket).create_signed_url(
+            audio_link,
+            expires_in_seconds,
+        )
+
+        return link["signedUrl"]
+
+    def download(self, audio_link: str) -> bytes:
+        from app.db.supabase import supabase
+
+        return supabase.storage.from_(self.bucket).download(audio_link)
+
+
+class LocalAudioStorage(AudioStorage):
+    """
+    Audio files served from a local directory through HMAC-signed, expiring URLs.
+
+    Signing is a local computation; URLs are verified by the audio endpoint.
+    """
+
+    def __init__(self, directory: str, signing_key: str, base_url: str):
+        self.directory = Path(directory).resolve()
+
+        self.signing_key = signing_key.encode()
+
+        self.base_url = base_url.rstrip("/")
+
+    def create_signed_url(self, audio_link: str, expires_in_seconds: int) -> str:
+        expires = int(time.time()) + expires_in_seconds
+
+        signature = self.sign(audio_link, expires)
+
+        query = urlencode({"expires": expires, "signature": signature})
+
+        return f"{self.base_url}/{quote(audio_link)}?{query}"
+
+    def download(self, audio_link: str) -> bytes:
+        path = self.resolve_path(audio_link)
+
+        if path is None:
+            raise FileNotFoundError(audio_link)
+
+        return path.read_bytes()
+
+    def sign(self, audio_link: str, expires: int) -> str:
+        """
+        Compute the URL-safe signature of an audio link and expiry time.
+        """
+
+        message = f"{audio_link}:{expires}".encode()
+
+        digest = hmac.new(self.signing_key, message, hashlib.sha256).digest()
+
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def verify(self, audio_link: str, expires: int, signature: str) -> bool:
+        """
+        Check that a signature matches the audio link and has not expired.
+        """
+
+        if expires < time.time():
+            return False
+
+        return hmac.compare_digest(self.sign(audio_link, expires), signature)
+
+    def resolve_path(self, audio_link: str) -> Optional[Path]:
+        """
+        Resolve an audio link to a file inside the audio directory.
+
+        Returns:
+            The file path, or None if it does not exist or lies outside the directory.
+        """
+
+        path = (self.directory / audio_link).resolve()
+
+        # Reject links that escape the audio directory
+        if not path.is_relative_to(self.directory) or not path.is_file():
+            return None
+
+        return path
+
+
+def create_audio_storage() -> AudioStorage:
+    """
+    Create the audio storage backend selected in the settings.
+    """
+
+    if settings.audio_storage_backend == "local":
+        assert (
+            settings.local_audio_directory is not None
+        ), "Missing local audio directory in .env."
+
+        signing_key = settings.audio_signing_key or settings.supabase_key
+
+        assert signing_key is not None, "Missing audio signing key in .env."
+
+        scheme = "https" if settings.env == "production" else "http"
+
+        return LocalAudioStorage(
+            settings.local_audio_directory,
+            signing_key,
+            f"{scheme}://{settings.host}/api/v1/audio",
+        )
+
+    assert (
+        settings.audio_storage_backend == "supabase"
+    ), "Unknown audio storage backend in .env."
+
+    return SupabaseAudioStorage("songs")
+
+
+audio_storage = create_audio_storage()
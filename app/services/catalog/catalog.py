@@ -0,0 +1,32 @@
+# SQLAlchemy
+from sqlalchemy.exc import SQLAlchemyError
+
+# app core
+from app.db.get_db import db_session
+
+# services
+from app.services.catalog.song_index import song_index
+
+from app.services.catalog.title_search import title_search_index
+
+from app.services.catalog.title_snapshot import song_titles_snapshot
+
+
+def warm_catalog_caches():
+    """
+    Build the in-memory catalog caches before the first request needs them.
+
+    Caches that cannot be built here are built lazily on first use instead.
+    """
+
+    try:
+        with db_session() as db:
+            song_index.refresh(db)
+
+            title_search_index.refresh(db)
+
+            song_titles_snapshot.refresh(db)
+
+    except SQLAlchemyError:
+        # The database may not be reachable yet; the caches will be built on demand
+        pass
@@ -0,0 +1,74 @@
+# standard library
+from typing import Callable
+
+# SQLAlchemy
+from sqlalchemy import event
+
+from sqlalchemy.orm import Session, object_session
+
+# models
+from app.models import *
+
+CatalogListener = Callable[[], None]
+
+_listeners: list[CatalogListener] = []
+
+# Models whose rows make up the song catalog
+CATALOG_MODELS = (Song, Artist, SongArtist)
+
+CATALOG_EVENTS = ("after_insert", "after_update", "after_delete")
+
+# Key of Session.info holding the catalog models flushed in the current transaction
+CHANGED_CATALOG_MODELS_KEY = "changed_catalog_models"
+
+
+def on_catalog_change(listener: CatalogListener) -> CatalogListener:
+    """
+    Register a callback that runs whenever the song catalog changes in this process.
+
+    Returns:
+        The registered callback, so this can be used as a decorator.
+    """
+
+    _listeners.append(listener)
+
+    return listener
+
+
+def notify_catalog_change():
+    """
+    Notify every registered catalog cache that its contents may be stale.
+    """
+
+    for listener in _listeners:
+        listener()
+
+
+def _handle_catalog_change(mapper, connection, target):
+    # Flushed rows are not visible to other sessions yet, so only remember the change
+    session = object_session(target)
+
+    if session is not None:
+        session.info.setdefault(CHANGED_CATALOG_MODELS_KEY, set()).add(mapper.class_)
+
+
+def _handle_commit(session: Session):
+    # Caches rebuilt from now on read the committed rows
+    if session.info.pop(CHANGED_CATALOG_MODELS_KEY, None):
+        notify_catalog_change()
+
+
+def _handle_rollback(session: Session):
+    # Rolled back changes never reached the catalog
+    session.info.pop(CHANGED_CATALOG_MODELS_KEY, None)
+
+
+# Track catalog writes made through the ORM
+for model in CATALOG_MODELS:
+    for event_name in CATALOG_EVENTS:
+        event.listen(model, event_name, _handle_catalog_change)
+
+# Caches are only invalidated once those writes are committed
+event.listen(Session, "after_commit", _handle_commit)
+
+event.listen(Session, "after_rollback", _handle_rollback)
@@ -0,0 +1,140 @@
+# standard library
+import re
+
+import threading
+
+import uuid
+
+from dataclasses import dataclass
+
+# cachetools
+from cachetools import LRUCache
+
+# app core
+from app.core.config import settings
+
+# models
+from app.models import *
+
+# services
+from app.services.catalog.catalog_events import on_catalog_change
+
+# Characters removed from a line before it is split into answer words
+NON_WORD_CHARACTERS = re.compile(r"[^a-zA-Z' ]")
+
+# Words as they appear in the displayed line, used for masking
+WORD_SPAN = re.compile(r"[A-Za-z'-]+")
+
+
+@dataclass
+class LyricsTokens:
+    # Semicolon-delimited lyrics split into stripped, non-empty lines
+    lines: list[str]
+
+    # Per line, the (start, end) character span of each word in the line
+    word_spans: list[list[tuple[int, int]]]
+
+    # Every answer word in the song as (line_index, word_index, word), in order
+    words: list[tuple[int, int, str]]
+
+    # Index into words of the first word of each line, plus a final end offset
+    line_word_offsets: list[int]
+
+
+def tokenize_lyrics(raw: str) -> LyricsTokens:
+    """
+    Split raw lyrics into lines, word spans, and a flattened word list.
+    """
+
+    # Split the raw lyrics string by semicolon, strip " " from each line, and discard empty lines
+    lines = [line.strip() for line in raw.split(";") if line.strip()]
+
+    word_spans: list[list[tuple[int, int]]] = []
+
+    words: list[tuple[int, int, str]] = []
+
+    line_word_offsets: list[int] = []
+
+    for line_index, line in enumerate(lines):
+        # Identify all word spans (letters, apostrophes and hyphens) in the line
+        word_spans.append([(m.start(), m.end()) for m in WORD_SPAN.finditer(line)])
+
+        line_word_offsets.append(len(words))
+
+        # Remove all non-letter characters from the line before splitting it into words
+        stripped_line = NON_WORD_CHARACTERS.sub("", line)
+
+        for word_index, word in enumerate(stripped_line.split()):
+            words.append((line_index, word_index, word))
+
+    line_word_offsets.append(len(words))
+
+    return LyricsTokens(
+        lines=lines,
+        word_spans=word_spans,
+        words=words,
+        line_word_offsets=line_word_offsets,
+    )
+
+
+class LyricsCache:
+    """
+    Bounded cache of tokenized lyrics keyed by song ID.
+    """
+
+    def __init__(self, maximum_songs: int):
+        self._tokens: LRUCache[uuid.UUID, LyricsTokens] = LRUCache(
+            maxsize=maximum_songs
+        )
+
+        self._lock = threading.Lock()
+
+        # Bumped whenever entries are dropped, so a miss computed from older lyrics is not stored
+        self._generation = 0
+
+    def get(self, song: Song) -> LyricsTokens:
+        """
+        Get the tokenized lyrics of a song, tokenizing them on a miss.
+
+        Only a miss reads the song's lyrics column.
+        """
+
+        with self._lock:
+            tokens = self._tokens.get(song.songID)
+
+            generation = self._generation
+
+        if tokens is None:
+            tokens = tokenize_lyrics(song.lyrics)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._tokens[song.songID] = tokens
+
+        return tokens
+
+    def invalidate(self, song_id: uuid.UUID):
+        """
+        Drop the cached lyrics of a single song.
+        """
+
+        with self._lock:
+            self._tokens.pop(song_id, None)
+
+            self._generation += 1
+
+    def clear(self):
+        """
+        Drop every cached entry.
+        """
+
+        with self._lock:
+            self._tokens.clear()
+
+            self._generation += 1
+
+
+lyrics_cache = LyricsCache(settings.lyrics_cache_size)
+
+# Lyrics may have been edited; tokenize them again on next use
+on_catalog_change(lyrics_cache.clear)
@@ -0,0 +1,106 @@
+# standard library
+import threading
+
+import uuid
+
+from collections import deque
+
+from typing import Optional
+
+# cachetools
+from cachetools import LRUCache
+
+# pyroaring
+from pyroaring import BitMap, FrozenBitMap
+
+# app core
+from app.core.config import settings
+
+
+class RecentSongs:
+    """
+    The songs most recently served to a single user, as song index positions.
+    """
+
+    __slots__ = ("positions", "order")
+
+    def __init__(self, history_size: int):
+        # Compressed set used for exclusion when picking a song
+        self.positions = BitMap()
+
+        # Serving order used to forget the oldest song once the history is full
+        self.order: deque[int] = deque(maxlen=history_size)
+
+    def add(self, position: int):
+        if position in self.positions:
+            return
+
+        # The deque drops its oldest entry when full; drop it from the set as well
+        if len(self.order) == self.order.maxlen:
+            self.positions.discard(self.order[0])
+
+        self.order.append(position)
+
+        self.positions.add(position)
+
+
+class SongHistory:
+    """
+    Per-user history of recently served songs, used to avoid repeats in free-play modes.
+
+    Each user keeps at most history_size songs, and at most maximum_users users
+    are tracked, evicting the least recently active ones.
+    """
+
+    def __init__(self, history_size: int, maximum_users: int):
+        self.history_size = history_size
+
+        self._users: LRUCache[uuid.UUID, RecentSongs] = LRUCache(maxsize=maximum_users)
+
+        self._lock = threading.Lock()
+
+    def get_recently_served(self, user_id: uuid.UUID) -> Optional[FrozenBitMap]:
+        """
+        Get the positions of the songs recently served to a user.
+
+        Returns:
+            An immutable copy of the user's history, or None if there is none.
+        """
+
+        with self._lock:
+            recent = self._users.get(user_id)
+
+            if recent is None:
+                return None
+
+            return FrozenBitMap(recent.positions)
+
+    def contains(self, user_id: uuid.UUID, position: int) -> bool:
+        """
+        Check whether a song was recently served to a user.
+        """
+
+        with self._lock:
+            recent = self._users.get(user_id)
+
+            return recent is not None and position in recent.positions
+
+    def record(self, user_id: uuid.UUID, position: int):
+        """
+        Record that a song was served to a user.
+        """
+
+        with self._lock:
+            recent = self._users.get(user_id)
+
+            if recent is None:
+                recent = RecentSongs(self.history_size)
+
+                self._users[user_id] = recent
+
+            recent.add(position)
+
+
+song_history = SongHistory(
+    settings.recent_songs_history_size, settings.recent_songs_maximum_users
+)
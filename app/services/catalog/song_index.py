@@ -0,0 +1,189 @@
+# standard library
+import random
+
+import threading
+
+import time
+
+import uuid
+
+from typing import Optional
+
+# pyroaring
+from pyroaring import BitMap, FrozenBitMap
+
+# SQLAlchemy
+from sqlalchemy import select
+
+from sqlalchemy.orm import Session
+
+# app core
+from app.core.config import settings
+
+# models
+from app.models import *
+
+# services
+from app.services.catalog.catalog_events import on_catalog_change
+
+# exceptions
+from app.services.exceptions import NoSongAvailable
+
+# Number of bytes used by a packed song ID
+SONG_ID_SIZE = 16
+
+
+class SongIndex:
+    """
+    In-memory index of every song ID in the catalog.
+
+    IDs are packed back to back in a single bytes object so that picking a song
+    at random is a constant-time slice instead of a sort over the songs table.
+
+    Each song keeps the same dense position for the life of the process, so
+    positions can be stored in compressed bitmaps (see song_history).
+    """
+
+    def __init__(self, refresh_interval_seconds: int):
+        self.refresh_interval_seconds = refresh_interval_seconds
+
+        # Packed 16-byte song IDs; a song's position never changes once assigned
+        self._song_ids = b""
+
+        # { key: songID, value: position in _song_ids }
+        self._positions: dict[uuid.UUID, int] = {}
+
+        # Positions of the songs currently in the catalog
+        self._available = FrozenBitMap()
+
+        # Bumped on every catalog change; compared against the version the index was built from
+        self._version = 0
+        self._built_version: Optional[int] = None
+
+        self._loaded_at = 0.0
+
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._available)
+
+    def invalidate(self):
+        """
+        Mark the index as stale so it is rebuilt on next use.
+        """
+
+        self._version += 1
+
+    def is_stale(self) -> bool:
+        """
+        Check whether the index must be rebuilt before it can be used.
+        """
+
+        if self._built_version != self._version:
+            return True
+
+        # Catalog changes made outside this process are only picked up periodically
+        return time.monotonic() - self._loaded_at > self.refresh_interval_seconds
+
+    def refresh(self, db: Session):
+        """
+        Rebuild the index from the songs table, unless it is already fresh.
+        """
+
+        with self._refresh_lock:
+            # Concurrent stale callers queue on the lock; only the first one rebuilds
+            if not self.is_stale():
+                return
+
+            # Remember the version this build starts from, so concurrent invalidations are not lost
+            version = self._version
+
+            # Query only the primary keys
+            query = select(Song.songID).order_by(Song.songID)
+
+            song_ids = db.scalars(query).all()
+
+            positions = dict(self._positions)
+
+            new_song_ids: list[bytes] = []
+
+            # Append songs that have not been seen before, keeping existing positions
+            for song_id in song_ids:
+                if song_id not in positions:
+                    positions[song_id] = len(positions)
+
+                    new_song_ids.append(song_id.bytes)
+
+            # Songs removed from the catalog keep their position but are no longer available
+            available = FrozenBitMap(positions[song_id] for song_id in song_ids)
+
+            # Swap in the new state; readers keep working on whatever they already hold
+            self._song_ids = self._song_ids + b"".join(new_song_ids)
+            self._positions = positions
+            self._available = available
+
+            self._loaded_at = time.monotonic()
+            self._built_version = version
+
+    def ensure_fresh(self, db: Session):
+        """
+        Rebuild the index if it is stale.
+        """
+
+        if self.is_stale():
+            self.refresh(db)
+
+    def get_position(self, song_id: uuid.UUID) -> Optional[int]:
+        """
+        Get the dense position of a song, if it has been indexed.
+        """
+
+        return self._positions.get(song_id)
+
+    def get_song_id(self, position: int) -> uuid.UUID:
+        """
+        Get the song ID stored at a dense position.
+        """
+
+        offset = position * SONG_ID_SIZE
+
+        return uuid.UUID(bytes=self._song_ids[offset : offset + SONG_ID_SIZE])
+
+    def pick_random_song_id(
+        self, db: Session, excluded: Optional[BitMap | FrozenBitMap] = None
+    ) -> uuid.UUID:
+        """
+        Pick a song ID uniformly at random, skipping excluded positions when possible.
+
+        If every available song is excluded, the exclusion is ignored.
+
+        Raises:
+            NoSongAvailable: If the catalog contains no songs.
+        """
+
+        self.ensure_fresh(db)
+
+        # Work on a snapshot so a concurrent refresh cannot change the bounds
+        available = self._available
+
+        if not available:
+            raise NoSongAvailable()
+
+        candidates = available
+
+        if excluded:
+            # Sample from the complement of the excluded set
+            candidates = available - excluded
+
+            if not candidates:
+                candidates = available
+
+        position = candidates[random.randrange(len(candidates))]
+
+        return self.get_song_id(position)
+
+
+song_index = SongIndex(settings.catalog_refresh_interval_seconds)
+
+# Rebuild the index whenever the catalog is changed through this process
+on_catalog_change(song_index.invalidate)
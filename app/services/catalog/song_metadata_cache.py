@@ -0,0 +1,109 @@
+# standard library
+import threading
+
+import uuid
+
+from typing import Optional
+
+# cachetools
+from cachetools import TTLCache
+
+# SQLAlchemy
+from sqlalchemy.orm import Session
+
+# app core
+from app.core.config import settings
+
+# schemas
+from app.schemas.song import SongMetadata
+
+# services
+from app.services.catalog.catalog_events import on_catalog_change
+
+from app.services.song import get_song_metadata_by_songID
+
+
+class SongMetadataCache:
+    """
+    Bounded, expiring cache of song metadata keyed by song ID.
+
+    Entries are warmed when a game session is created, so the end-of-game
+    message can be sent without querying the database.
+    """
+
+    def __init__(self, maximum_songs: int, ttl_seconds: int):
+        self._metadata: TTLCache[uuid.UUID, SongMetadata] = TTLCache(
+            maxsize=maximum_songs, ttl=ttl_seconds
+        )
+
+        self._lock = threading.Lock()
+
+        # Bumped whenever entries are dropped, so a miss loaded before then is not stored
+        self._generation = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, song_id: uuid.UUID) -> Optional[SongMetadata]:
+        """
+        Get cached song metadata without touching the database.
+        """
+
+        with self._lock:
+            song_metadata = self._metadata.get(song_id)
+
+        if song_metadata is None:
+            self.misses += 1
+
+        else:
+            self.hits += 1
+
+        return song_metadata
+
+    def warm(self, db: Session, song_id: uuid.UUID) -> SongMetadata:
+        """
+        Get song metadata, loading it from the database on a miss.
+
+        Raises:
+            SongNotFound: If the given song is not in the database.
+        """
+
+        with self._lock:
+            song_metadata = self._metadata.get(song_id)
+
+            generation = self._generation
+
+        if song_metadata is None:
+            song_metadata = get_song_metadata_by_songID(db, song_id)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._metadata[song_id] = song_metadata
+
+        return song_metadata
+
+    def clear(self):
+        """
+        Drop every cached entry.
+        """
+
+        with self._lock:
+            self._metadata.clear()
+
+            self._generation += 1
+
+    def get_metrics(self) -> dict[str, int]:
+        """
+        Get a snapshot of the cache counters.
+        """
+
+        return {"size": len(self._metadata), "hits": self.hits, "misses": self.misses}
+
+
+song_metadata_cache = SongMetadataCache(
+    settings.song_metadata_cache_size, settings.song_metadata_cache_ttl_seconds
+)
+
+# Titles, albums or artists may have changed
+on_catalog_change(song_metadata_cache.clear)
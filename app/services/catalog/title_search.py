@@ -0,0 +1,276 @@
+# standard library
+import heapq
+
+import re
+
+import threading
+
+import time
+
+import uuid
+
+from bisect import bisect_left
+
+from collections import Counter
+
+from dataclasses import dataclass, field
+
+from typing import Optional
+
+# SQLAlchemy
+from sqlalchemy import select
+
+from sqlalchemy.orm import Session
+
+# app core
+from app.core.config import settings
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.song import SongSearchResult
+
+# services
+from app.services.catalog.catalog_events import on_catalog_change
+
+# Prefix match kinds, best first
+FULL_TITLE, TITLE_WORD, FULL_ARTIST, ARTIST_WORD = range(4)
+
+# Minimum trigram similarity for a fuzzy match
+MINIMUM_SIMILARITY = 0.2
+
+# Upper bound on prefix candidates ranked per query, so very short prefixes stay cheap
+MAXIMUM_PREFIX_CANDIDATES = 500
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase text and strip punctuation so that searches ignore case and symbols.
+    """
+
+    return " ".join(re.sub(r"[^\w\s]", "", text.casefold()).split())
+
+
+def get_trigrams(text: str) -> set[str]:
+    """
+    Split normalized text into its padded character trigrams.
+    """
+
+    padded = f"  {text} "
+
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class TitleSearchSnapshot:
+    # Search results, indexed by entry position
+    entries: list[SongSearchResult] = field(default_factory=list)
+
+    # Sorted prefix terms and the (entry, match kind) each term belongs to
+    terms: list[str] = field(default_factory=list)
+    term_entries: list[tuple[int, int]] = field(default_factory=list)
+
+    # { key: trigram, value: entries containing it }
+    trigrams: dict[str, list[int]] = field(default_factory=dict)
+
+    # Number of distinct trigrams of each entry
+    trigram_counts: list[int] = field(default_factory=list)
+
+
+class TitleSearchIndex:
+    """
+    In-memory prefix and fuzzy search over song titles and artist names.
+
+    Prefix matches come from a sorted term list, searched with binary search.
+    Fuzzy matches come from a trigram index ranked by similarity.
+    """
+
+    def __init__(self, refresh_interval_seconds: int):
+        self.refresh_interval_seconds = refresh_interval_seconds
+
+        self._snapshot = TitleSearchSnapshot()
+
+        # Bumped on every catalog change; compared against the version the index was built from
+        self._version = 0
+        self._built_version: Optional[int] = None
+
+        self._loaded_at = 0.0
+
+        self._refresh_lock = threading.Lock()
+
+    def invalidate(self):
+        """
+        Mark the index as stale so it is rebuilt on next use.
+        """
+
+        self._version += 1
+
+    def is_stale(self) -> bool:
+        """
+        Check whether the index must be rebuilt before it can be used.
+        """
+
+        if self._built_version != self._version:
+            return True
+
+        return time.monotonic() - self._loaded_at > self.refresh_interval_seconds
+
+    def refresh(self, db: Session):
+        """
+        Rebuild the index from the songs and artists tables, unless it is already fresh.
+        """
+
+        with self._refresh_lock:
+            # Concurrent stale callers queue on the lock; only the first one rebuilds
+            if not self.is_stale():
+                return
+
+            version = self._version
+
+            songs = db.execute(select(Song.songID, Song.title).order_by(Song.title)).all()
+
+            query = select(SongArtist.songID, Artist.name).join(
+                Artist, Artist.artistID == SongArtist.artistID
+            )
+
+            artists: dict[uuid.UUID, list[str]] = {}
+
+            for song_id, name in db.execute(query).all():
+                artists.setdefault(song_id, []).append(name)
+
+            self._snapshot = self._build(
+                [
+                    SongSearchResult(title=title, artists=artists.get(song_id, []))
+                    for song_id, title in songs
+                ]
+            )
+
+            self._loaded_at = time.monotonic()
+            self._built_version = version
+
+    def ensure_fresh(self, db: Session):
+        """
+        Rebuild the index if it is stale.
+        """
+
+        if self.is_stale():
+            self.refresh(db)
+
+    def search(self, db: Session, query: str, limit: int) -> list[SongSearchResult]:
+        """
+        Find the songs best matching a query.
+
+        Prefix matches on titles and artist names come first, followed by fuzzy matches.
+        """
+
+        self.ensure_fresh(db)
+
+        snapshot = self._snapshot
+
+        normalized = normalize(query)
+
+        if not normalized:
+            return []
+
+        matches = self._search_prefix(snapshot, normalized, limit)
+
+        if len(matches) < limit:
+            # Fill the remaining slots with fuzzy matches
+            for entry in self._search_fuzzy(snapshot, normalized, limit):
+                if entry not in matches:
+                    matches.append(entry)
+
+                if len(matches) == limit:
+                    break
+
+        return [snapshot.entries[entry] for entry in matches]
+
+    def _build(self, entries: list[SongSearchResult]) -> TitleSearchSnapshot:
+        terms: list[tuple[str, int, int]] = []
+
+        trigrams: dict[str, list[int]] = {}
+
+        trigram_counts: list[int] = []
+
+        for entry, result in enumerate(entries):
+            title = normalize(result.title)
+
+            terms.append((title, entry, FULL_TITLE))
+
+            terms.extend((word, entry, TITLE_WORD) for word in title.split()[1:])
+
+            for name in result.artists:
+                artist = normalize(name)
+
+                terms.append((artist, entry, FULL_ARTIST))
+
+                terms.extend((word, entry, ARTIST_WORD) for word in artist.split()[1:])
+
+            # Fuzzy matching runs over the title and artists together
+            entry_trigrams = get_trigrams(
+                " ".join([title, *(normalize(name) for name in result.artists)])
+            )
+
+            for trigram in entry_trigrams:
+                trigrams.setdefault(trigram, []).append(entry)
+
+            trigram_counts.append(len(entry_trigrams))
+
+        terms.sort()
+
+        return TitleSearchSnapshot(
+            entries=entries,
+            terms=[term for term, _, _ in terms],
+            term_entries=[(entry, kind) for _, entry, kind in terms],
+            trigrams=trigrams,
+            trigram_counts=trigram_counts,
+        )
+
+    def _search_prefix(
+        self, snapshot: TitleSearchSnapshot, query: str, limit: int
+    ) -> list[int]:
+        # Best match kind found for each entry
+        best: dict[int, int] = {}
+
+        position = bisect_left(snapshot.terms, query)
+
+        end = min(len(snapshot.terms), position + MAXIMUM_PREFIX_CANDIDATES)
+
+        # Terms sharing the prefix are contiguous in the sorted list
+        while position < end and snapshot.terms[position].startswith(query):
+            entry, kind = snapshot.term_entries[position]
+
+            if kind < best.get(entry, ARTIST_WORD + 1):
+                best[entry] = kind
+
+            position += 1
+
+        # Entries are ordered by title, so ties are broken alphabetically
+        return sorted(best, key=lambda entry: (best[entry], entry))[:limit]
+
+    def _search_fuzzy(
+        self, snapshot: TitleSearchSnapshot, query: str, limit: int
+    ) -> list[int]:
+        query_trigrams = get_trigrams(query)
+
+        # Count the trigrams each entry shares with the query
+        shared: Counter[int] = Counter()
+
+        for trigram in query_trigrams:
+            shared.update(snapshot.trigrams.get(trigram, ()))
+
+        scored = (
+            (count / (len(query_trigrams) + snapshot.trigram_counts[entry] - count), entry)
+            for entry, count in shared.items()
+        )
+
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+
+        return [entry for similarity, entry in best if similarity >= MINIMUM_SIMILARITY]
+
+
+title_search_index = TitleSearchIndex(settings.catalog_refresh_interval_seconds)
+
+# Rebuild the index whenever the catalog is changed through this process
+on_catalog_change(title_search_index.invalidate)
@@ -0,0 +1,123 @@
+# standard library
+import gzip
+
+import hashlib
+
+import json
+
+import threading
+
+import time
+
+from dataclasses import dataclass
+
+from typing import Optional
+
+# SQLAlchemy
+from sqlalchemy.orm import Session
+
+# app core
+from app.core.config import settings
+
+# services
+from app.services.catalog.catalog_events import on_catalog_change
+
+from app.services.song import get_all_song_titles
+
+
+@dataclass
+class SongTitlesSnapshot:
+    # Serialized list of {"title": ...} objects
+    body: bytes
+
+    gzip_body: bytes
+
+    # Quoted content hash of body
+    etag: str
+
+
+class SongTitlesSnapshotCache:
+    """
+    Pre-serialized, pre-compressed list of every song title.
+
+    The response of the song titles endpoint only changes with the catalog, so it
+    is built once and served as bytes until the catalog changes.
+    """
+
+    def __init__(self, refresh_interval_seconds: int):
+        self.refresh_interval_seconds = refresh_interval_seconds
+
+        self._snapshot: Optional[SongTitlesSnapshot] = None
+
+        # Bumped on every catalog change; compared against the version the snapshot was built from
+        self._version = 0
+        self._built_version: Optional[int] = None
+
+        self._loaded_at = 0.0
+
+        self._refresh_lock = threading.Lock()
+
+    def invalidate(self):
+        """
+        Mark the snapshot as stale so it is rebuilt on next use.
+        """
+
+        self._version += 1
+
+    def is_stale(self) -> bool:
+        """
+        Check whether the snapshot must be rebuilt before it can be served.
+        """
+
+        if self._snapshot is None or self._built_version != self._version:
+            return True
+
+        return time.monotonic() - self._loaded_at > self.refresh_interval_seconds
+
+    def refresh(self, db: Session):
+        """
+        Rebuild the snapshot from the songs table, unless it is already fresh.
+        """
+
+        with self._refresh_lock:
+            # Concurrent stale callers queue on the lock; only the first one rebuilds
+            if not self.is_stale():
+                return
+
+            version = self._version
+
+            titles = get_all_song_titles(db)
+
+            body = json.dumps(
+                [{"title": title} for title in titles],
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode()
+
+            self._snapshot = SongTitlesSnapshot(
+                body=body,
+                # A fixed mtime keeps the compressed bytes identical for identical titles
+                gzip_body=gzip.compress(body, mtime=0),
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            )
+
+            self._loaded_at = time.monotonic()
+            self._built_version = version
+
+    def get(self, db: Session) -> SongTitlesSnapshot:
+        """
+        Get the current snapshot, rebuilding it if it is stale.
+        """
+
+        if self.is_stale():
+            self.refresh(db)
+
+        assert self._snapshot is not None
+
+        return self._snapshot
+
+
+song_titles_snapshot = SongTitlesSnapshotCache(settings.catalog_refresh_interval_seconds)
+
+# Rebuild the snapshot whenever the catalog is changed through this process
+on_catalog_change(song_titles_snapshot.invalidate)
@@ -45,10 +45,25 @@ class DuplicateSession(Exception):
     pass
 
 
+class InvalidSession(Exception):
+    pass
+
+
+class GameResultNotRecorded(Exception):
+    pass
+
+
 class DatabasePersistenceFailed(Exception):
     pass
 
 
+# Audio
+
+
+class AudioClipExtractionFailed(Exception):
+    pass
+
+
 # Archive
 
 
@@ -65,3 +80,10 @@ class LimitIsBelow1(Exception):
 
 class UserNotOnLeaderboard(Exception):
     pass
+
+
+# Sessions
+
+
+class InvalidSessionSnapshot(Exception):
+    pass
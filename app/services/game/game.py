@@ -1,6 +1,4 @@
 # standard library
-import re
-
 import random
 
 import uuid
@@ -14,7 +12,13 @@ from typing import Optional
 # SQLAlchemy
 from sqlalchemy.orm import Session
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+# psycopg2
+from psycopg2 import errorcodes
+
+# app core
+from app.core.config import settings
 
 # models
 from app.models import *
@@ -35,14 +39,27 @@ from app.services.game.game_provider import get_daily_game
 
 from app.services.game.game_validator import (
     assert_date_is_not_today_or_in_the_future,
-    assert_game_session_is_unique,
     assert_date_is_valid_for_non_archive_mode,
+    assert_game_result_can_be_recorded,
+    assert_game_result_was_recorded,
     assert_number_of_attempts_do_not_exceed_the_mode_maximum,
-    assert_song_exists,
     assert_user_has_not_played_the_daily_game,
+    get_ws_game_session_uuid,
 )
 
-from app.services.song import get_random_song
+from app.services.catalog.catalog_events import on_catalog_change
+
+from app.services.catalog.lyrics_cache import LyricsTokens, lyrics_cache
+
+from app.services.game.lyrics_puzzle_pool import LyricsPuzzlePool
+
+from app.services.game.game_result_queue import game_result_queue
+
+from app.services.song import (
+    get_random_song,
+    record_song_as_served,
+    was_song_recently_served,
+)
 
 from app.services.statistics.statistics_update import update_statistics_after_game
 
@@ -53,12 +70,16 @@ from app.services.exceptions import (
     AnswerPositionsLengthMismatch,
     ArchiveDateNotProvided,
     DatabasePersistenceFailed,
+    DuplicateSession,
     EmptyLyricsWords,
 )
 
 # utils
 from app.api.v1.endpoints.enums import Result
 
+# Unique index on game_sessions.wsGameSessionID, created by the initial migration
+WS_GAME_SESSION_ID_INDEX = "ix_game_sessions_wsGameSessionID"
+
 
 @dataclass
 class StartGameDTO:
@@ -96,7 +117,7 @@ class FreePlayAudioGameMode(GameMode):
         assert_date_is_valid_for_non_archive_mode(payload.date)
 
         # Retrieve a random song from the database
-        song = get_random_song(db)
+        song = get_random_song(db, user_id)
 
         # Compute a valid audio clip starting position for the mode
         audio_start_at = get_audio_start_at_by_game_mode(self.mode, song.duration)
@@ -174,23 +195,51 @@ class LyricsGameMode(GameMode):
         # Disallow date input for non-archive modes
         assert_date_is_valid_for_non_archive_mode(payload.date)
 
-        song = get_random_song(db)
+        # Take a pre-generated puzzle if one is ready
+        puzzle = lyrics_puzzle_pool.pop()
+
+        if puzzle is not None and user_id is not None:
+            # Pooled puzzles are shared; skip ones whose song the user has just been given
+            if was_song_recently_served(user_id, puzzle.song.songID):
+                lyrics_puzzle_pool.put_back(puzzle)
+
+                puzzle = None
+
+            else:
+                record_song_as_served(user_id, puzzle.song.songID)
 
-        # Split semicolon-delimited raw lyrics
-        lines = self._split_lyrics(song.lyrics)
+        if puzzle is not None:
+            return puzzle
+
+        # Generate the puzzle inline when the pool is empty
+        return self.generate_puzzle(db, user_id)
+
+    def generate_puzzle(
+        self, db: Session, user_id: Optional[uuid.UUID] = None
+    ) -> StartGameDTO:
+        """
+        Pick a random song and build a masked lyrics puzzle from it.
+        """
+
+        song = get_random_song(db, user_id)
+
+        # Get the pre-tokenized lyrics of the song
+        tokens = lyrics_cache.get(song)
 
         # Determine the starting line at random
-        lyrics_start_at = self._get_lyrics_start_at(lines)
+        lyrics_start_at = self._get_lyrics_start_at(tokens.lines)
 
-        # Derive the lines displayed to the user
-        displayed_lines = lines[lyrics_start_at : lyrics_start_at + self.LINES_TO_SHOW]
+        # Derive the range of lines displayed to the user
+        lyrics_end_at = min(lyrics_start_at + self.LINES_TO_SHOW, len(tokens.lines))
 
         # Pick the answer
-        lyrics_answer, answer_positions = self._get_lyrics_answer(displayed_lines)
+        lyrics_answer, answer_positions = self._get_lyrics_answer(
+            tokens, lyrics_start_at, lyrics_end_at
+        )
 
         # Mask the lyrics
         lyrics_given = self._get_lyrics_given(
-            displayed_lines, lyrics_answer, answer_positions
+            tokens, lyrics_start_at, lyrics_end_at, lyrics_answer, answer_positions
         )
 
         # Resolve lyrics-mode gameplay constraints
@@ -208,10 +257,6 @@ class LyricsGameMode(GameMode):
             date=None,
         )
 
-    def _split_lyrics(self, raw: str) -> list[str]:
-        # Split the raw lyrics string by semicolon, strip " " from each line, and discard empty lines
-        return [line.strip() for line in raw.split(";") if line.strip()]
-
     def _get_lyrics_start_at(self, lines: list[str]) -> int:
         # Compute the maximum valid starting index so that LINES_TO_SHOW lines can still be displayed
         max_start_at = max(0, len(lines) - self.LINES_TO_SHOW)
@@ -219,7 +264,9 @@ class LyricsGameMode(GameMode):
         # Randomly choose a starting line index within bounds
         return random.randint(0, max_start_at)
 
-    def _get_lyrics_answer(self, lines: list[str]) -> tuple[str, list[tuple[int, int]]]:
+    def _get_lyrics_answer(
+        self, tokens: LyricsTokens, lyrics_start_at: int, lyrics_end_at: int
+    ) -> tuple[str, list[tuple[int, int]]]:
         """
         Pick 1-2 contiguous words from the displayed lines.
 
@@ -227,53 +274,48 @@ class LyricsGameMode(GameMode):
 
         Returns:
             - answer text
-            - list of (line_index, word_index) positions in flattened order
+            - list of (line_index, word_index) positions in flattened order,
+              with line indices relative to the first displayed line
         """
 
-        # Flatten all words across all lines while preserving their positions
-        # Each entry stores: (line_index, word_index, word)
-        words: list[tuple[int, int, str]] = []
+        # The words of the displayed lines form a contiguous slice of the song's flattened words
+        first_word = tokens.line_word_offsets[lyrics_start_at]
+        last_word = tokens.line_word_offsets[lyrics_end_at]
 
-        # Iterate through each line and split it into words
-        for line_index, line in enumerate(lines):
-            # Remove all non-letter characters from the line
-            stripped_line = re.sub(r"[^a-zA-Z' ]", "", line)
-
-            for word_index, word in enumerate(stripped_line.split()):
-                words.append((line_index, word_index, word))
+        word_count = last_word - first_word
 
         # Guard against empty input
-        if not words:
+        if word_count == 0:
             raise EmptyLyricsWords()
 
         # Randomly choose whether the answer is one or two words long
         answer_length = random.choice([1, 2])
 
         # If only one word exists overall, force a single-word answer
-        if answer_length == 2 and len(words) < 2:
+        if answer_length == 2 and word_count < 2:
             answer_length = 1
 
-        # Compute the highest valid start index for the chosen answer length
-        maximum_start_index = len(words) - answer_length
-
         # Randomly select a starting index within the valid range
-        start = random.randint(0, maximum_start_index)
+        start = first_word + random.randint(0, word_count - answer_length)
 
         # Select the contiguous word slice (may span multiple lines)
-        selected = words[start : start + answer_length]
+        selected = tokens.words[start : start + answer_length]
 
         answer_text = " ".join(word for _, _, word in selected)
 
         # Also return their corresponding positions
         answer_positions = [
-            (line_index, word_index) for line_index, word_index, _ in selected
+            (line_index - lyrics_start_at, word_index)
+            for line_index, word_index, _ in selected
         ]
 
         return answer_text, answer_positions
 
     def _get_lyrics_given(
         self,
-        lines: list[str],
+        tokens: LyricsTokens,
+        lyrics_start_at: int,
+        lyrics_end_at: int,
         lyrics_answer: str,
         answer_positions: list[tuple[int, int]],
     ) -> str:
@@ -293,7 +335,7 @@ class LyricsGameMode(GameMode):
         if len(answer_positions) != answer_length:
             raise AnswerPositionsLengthMismatch()
 
-        masked_lines = lines.copy()
+        masked_lines = tokens.lines[lyrics_start_at:lyrics_end_at]
 
         # Map from line index to a list of tuples containing (word index in line, position index in answer_positions)
         line_to_positions: dict[int, list[tuple[int, int]]] = {}
@@ -306,11 +348,8 @@ class LyricsGameMode(GameMode):
         for line_index, positions in line_to_positions.items():
             line = masked_lines[line_index]
 
-            # Identify all word spans (letters and apostrophes) in the current line
-            word_spans = [
-                (m.start(), m.end(), m.group())
-                for m in re.finditer(r"[A-Za-z'-]+", line)
-            ]
+            # Pre-computed word spans (letters and apostrophes) of the current line
+            word_spans = tokens.word_spans[lyrics_start_at + line_index]
 
             # Mask words starting from the end of the line to prevent shifting indices
             for word_index, answer_index in sorted(
@@ -319,10 +358,10 @@ class LyricsGameMode(GameMode):
                 if word_index >= len(word_spans):
                     raise IndexError("Word index out of bounds.")
 
-                start, end, word = word_spans[word_index]
+                start, end = word_spans[word_index]
 
                 # Replace each letter with an underscore and add spacing for readability
-                mask = " ".join("_" for _ in word)
+                mask = " ".join("_" for _ in line[start:end])
 
                 # Add extra spacing if the next answer word is on the same line
                 if answer_index < answer_length - 1:
@@ -375,14 +414,26 @@ class ArchiveGameMode(GameMode):
         )
 
 
+# Kept with its concrete type, since the puzzle pool needs generate_puzzle
+lyrics_game_mode = LyricsGameMode()
+
 MODE_HANDLERS: dict[GameModeEnum, GameMode] = {
     GameModeEnum.ORIGINAL: OriginalGameMode(),
     GameModeEnum.RAPID: RapidGameMode(),
     GameModeEnum.DAILY: DailyGameMode(),
-    GameModeEnum.LYRICS: LyricsGameMode(),
+    GameModeEnum.LYRICS: lyrics_game_mode,
     GameModeEnum.ARCHIVE: ArchiveGameMode(),
 }
 
+lyrics_puzzle_pool = LyricsPuzzlePool(
+    generate=lyrics_game_mode.generate_puzzle,
+    low_watermark=settings.lyrics_puzzle_pool_low_watermark,
+    high_watermark=settings.lyrics_puzzle_pool_high_watermark,
+)
+
+# Pooled puzzles may reference songs or lyrics that changed
+on_catalog_change(lyrics_puzzle_pool.clear)
+
 
 def start_game_service(
     payload: StartGameRequest, db: Session, user_id: Optional[uuid.UUID]
@@ -398,37 +449,52 @@ def start_game_service(
 
 def submit_game_service(payload: SubmitGameRequest, db: Session, user_id: uuid.UUID):
     """
-    Validate a completed game session and return the result.
-    Persist the session and update user-related data only if the user is authenticated.
-    """
-
-    # Decompose payload
-    ws_game_session_id = payload.wsGameSessionID
+    Acknowledge a submission of a game played over the WebSocket.
 
-    songID = payload.songID
+    Results are recorded by the server when the game ends, expires or is
+    abandoned, so submitted outcomes are never persisted. Clients that still
+    submit after the game get a success once the server recorded the result.
 
-    mode = GameModeEnum(payload.mode)
+    Raises:
+        InvalidSession: If the session ID is neither a UUID nor a session token.
+        GameResultNotRecorded: If the server recorded no result of this user for the session.
+    """
 
-    won = payload.won
+    # Resolve the ID the server persisted the session under
+    ws_game_session_id = get_ws_game_session_uuid(payload.wsGameSessionID)
 
-    attempts = payload.attempts
+    # Only sessions already recorded by the server are acknowledged
+    assert_game_result_was_recorded(db, ws_game_session_id, user_id)
 
-    ##
+    return None
 
-    # Validation
 
-    # Validate attempt count
-    assert_number_of_attempts_do_not_exceed_the_mode_maximum(mode, attempts)
+def record_game_result(
+    db: Session,
+    ws_game_session_id: uuid.UUID,
+    user_id: uuid.UUID,
+    mode: GameModeEnum,
+    song_id: uuid.UUID,
+    won: bool,
+    attempts: int,
+    date: Optional[DateType],
+):
+    """
+    Persist a completed game session and update the user's statistics and leaderboards.
 
-    # Validate that the referenced song exists in the database
-    assert_song_exists(db, songID)
+    Called by the WebSocket game loop and the session reaper, which record
+    results from the server's own session state. With the game result queue
+    enabled, the game session is committed together with its queued result;
+    statistics and leaderboards are updated in the background shortly after.
 
-    # Prevent duplicate submissions
-    assert_game_session_is_unique(db, ws_game_session_id)
+    Raises:
+        UserAlreadyPlayedTheDailyGame: If the user already played today's daily game.
+        DuplicateSession: If a result was already recorded for the WebSocket session.
+        DatabasePersistenceFailed: If persisting the result fails.
+    """
 
     # Enforce one daily play per user for daily mode
-    if mode == GameModeEnum.DAILY:
-        assert_user_has_not_played_the_daily_game(db, user_id)
+    assert_game_result_can_be_recorded(db, user_id, mode)
 
     ##
 
@@ -437,8 +503,9 @@ def submit_game_service(payload: SubmitGameRequest, db: Session, user_id: uuid.U
     # Determine the game outcome
     result = Result.win if won else Result.lose
 
-    # Assign date for daily games
-    date = DateType.today() if mode == GameModeEnum.DAILY else None
+    # Queued updates can no longer be rejected once applied, so the attempts are checked up front
+    if settings.game_result_queue_enabled:
+        assert_number_of_attempts_do_not_exceed_the_mode_maximum(mode, attempts)
 
     ##
 
@@ -451,7 +518,7 @@ def submit_game_service(payload: SubmitGameRequest, db: Session, user_id: uuid.U
             userID=user_id,
             mode=mode,
             result=result,
-            songID=songID,
+            songID=song_id,
             date=date,
         )
 
@@ -461,18 +528,47 @@ def submit_game_service(payload: SubmitGameRequest, db: Session, user_id: uuid.U
 
         # Side Effects
 
+        if settings.game_result_queue_enabled:
+            # Queue statistics and leaderboards in the same transaction; they are applied in batches
+            game_result_queue.append(db, user_id, mode, won, attempts)
+
+            db.commit()
+
+            return
+
         # Update user statistics and leaderboard standings
         update_statistics_after_game(db, user_id, mode, won, attempts)
 
-        update_leaderboards_after_game(db, user_id, mode)
+        # Leaderboards count wins only
+        if won:
+            update_leaderboards_after_game(db, user_id, mode)
 
         # Commit all database changes
         db.commit()
 
+    except IntegrityError as error:
+        db.rollback()
+
+        # The unique WebSocket session ID means the result was already recorded
+        if _is_ws_game_session_id_violation(error):
+            raise DuplicateSession()
+
+        raise DatabasePersistenceFailed()
+
     except SQLAlchemyError:
         # Roll back all changes if any persistence step fails
         db.rollback()
 
         raise DatabasePersistenceFailed()
 
-    return None
+
+def _is_ws_game_session_id_violation(error: IntegrityError) -> bool:
+    # Whether the insert broke the unique index on the WebSocket session ID
+    pgcode = getattr(error.orig, "pgcode", None)
+
+    constraint_name = getattr(getattr(error.orig, "diag", None), "constraint_name", None)
+
+    return (
+        pgcode == errorcodes.UNIQUE_VIOLATION
+        and constraint_name == WS_GAME_SESSION_ID_INDEX
+    )
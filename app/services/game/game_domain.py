@@ -1,6 +1,9 @@
 # standard library
 import random
 
+# app core
+from app.core.config import settings
+
 # schemas
 from app.schemas.enums import GameMode
 
@@ -30,6 +33,10 @@ def get_audio_start_at_by_game_mode(mode: GameMode, song_duration: int) -> int:
     # Maximum valid starting point so the clip does not exceed the song duration
     maximum_start_at = max(0, song_duration - clip_length)
 
+    if settings.audio_clips_enabled:
+        # Align starts to the clip length so cut clips can be shared between games
+        return random.randint(0, maximum_start_at // clip_length) * clip_length
+
     return random.randint(0, maximum_start_at)
 
 
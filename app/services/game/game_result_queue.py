@@ -0,0 +1,261 @@
+# standard library
+import threading
+
+import time
+
+import uuid
+
+from collections import Counter
+
+from typing import Optional
+
+# SQLAlchemy
+from sqlalchemy import delete, func, select
+
+from sqlalchemy.orm import Session
+
+from sqlalchemy.exc import SQLAlchemyError
+
+# app core
+from app.core.config import settings
+
+from app.db.get_db import db_session
+
+# models
+from app.models import QueuedGameResult
+
+# schemas
+from app.schemas.enums import GameMode
+
+# services
+from app.services.leaderboards.leaderboards_domain import (
+    get_leaderboard_periods,
+    increment_leaderboards,
+)
+
+from app.services.statistics.statistics_update import (
+    StatisticsDelta,
+    apply_statistics_deltas,
+)
+
+# Advisory lock held by the worker applying a batch, so workers apply batches one at a time, in order
+FLUSH_LOCK_ID = 0x48454152
+
+
+class GameResultQueue:
+    """
+    Durable queue of game results whose statistics and leaderboard updates
+    are applied by a background thread.
+
+    A submit inserts its result into the queued_game_results table in the
+    same transaction as its game session, so the hot leaderboard rows are
+    no longer locked by every submit, and a recorded game is never missing
+    from the queue. The worker claims the oldest batch by deleting it,
+    folds the results of each user and mode into one statistics update and
+    sums the leaderboard increments into one upsert, all in one transaction.
+    A batch is therefore applied exactly once: a failure or a crash rolls
+    the claim back with the updates, and results left queued are applied
+    on restart. Workers of every process share the table; an advisory lock
+    lets one of them apply a batch at a time, keeping streaks in order.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_seconds: float):
+        self.batch_size = batch_size
+
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._condition = threading.Condition()
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Counters
+        self.flushed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_flush_seconds = 0.0
+        self.last_flush_lag_seconds = 0.0
+
+    def start(self):
+        """
+        Start the background flusher.
+
+        Results left queued by a previous process are flushed first.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._running = True
+
+        self._thread = threading.Thread(
+            target=self._run, name="game-result-queue", daemon=True
+        )
+
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background flusher and flush one last batch.
+        """
+
+        with self._condition:
+            self._running = False
+
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+
+            self._thread = None
+
+            self.flush()
+
+    def append(
+        self, db: Session, user_id: uuid.UUID, mode: GameMode, won: bool, guesses: int
+    ):
+        """
+        Queue the statistics and leaderboard updates of a game in the caller's transaction.
+
+        Nothing is queued unless the caller commits, together with its game session.
+        """
+
+        db.add(
+            QueuedGameResult(
+                userID=user_id, mode=GameMode(mode).value, won=won, guesses=guesses
+            )
+        )
+
+    def flush(self) -> int:
+        """
+        Apply the oldest batch of queued results and remove it from the queue.
+
+        Returns:
+            The number of results applied; 0 if the queue is empty, another
+            worker is applying a batch, or the batch failed.
+        """
+
+        with db_session() as db:
+            try:
+                # Another worker is applying a batch; its results are taken in turn
+                if not db.scalar(select(func.pg_try_advisory_xact_lock(FLUSH_LOCK_ID))):
+                    db.rollback()
+
+                    return 0
+
+                oldest = (
+                    select(QueuedGameResult.queuedGameResultID)
+                    .order_by(QueuedGameResult.queuedGameResultID)
+                    .limit(self.batch_size)
+                )
+
+                # Claim the batch; the delete is undone if applying it fails
+                claimed = db.execute(
+                    delete(QueuedGameResult)
+                    .where(QueuedGameResult.queuedGameResultID.in_(oldest))
+                    .returning(
+                        QueuedGameResult.queuedGameResultID,
+                        QueuedGameResult.userID,
+                        QueuedGameResult.mode,
+                        QueuedGameResult.won,
+                        QueuedGameResult.guesses,
+                        QueuedGameResult.enqueuedAt,
+                    )
+                ).all()
+
+                if not claimed:
+                    db.rollback()
+
+                    return 0
+
+                started_at = time.perf_counter()
+
+                # RETURNING does not keep the order of the subquery, and streaks depend on it
+                rows = sorted(claimed, key=lambda row: row.queuedGameResultID)
+
+                # { key: (userID, mode), value: the user's games in this batch, in order }
+                deltas: dict[tuple[uuid.UUID, GameMode], StatisticsDelta] = {}
+
+                wins: Counter[tuple] = Counter()
+
+                for _, user_id, mode_value, won, guesses, _ in rows:
+                    mode = GameMode(mode_value)
+
+                    delta = deltas.get((user_id, mode))
+
+                    if delta is None:
+                        delta = deltas[(user_id, mode)] = StatisticsDelta()
+
+                    delta.add(won, guesses)
+
+                    # Leaderboards count wins only
+                    if won:
+                        for period in get_leaderboard_periods(mode):
+                            wins[(user_id, mode, period)] += 1
+
+                apply_statistics_deltas(db, deltas)
+
+                increment_leaderboards(db, dict(wins))
+
+                db.commit()
+
+            except SQLAlchemyError:
+                db.rollback()
+
+                # The batch stays queued and is retried on the next flush
+                self.failed_batches += 1
+
+                return 0
+
+        self.flushed += len(rows)
+        self.batches += 1
+        self.last_flush_seconds = time.perf_counter() - started_at
+        self.last_flush_lag_seconds = time.time() - rows[0].enqueuedAt.timestamp()
+
+        return len(rows)
+
+    def get_metrics(self) -> dict[str, int | float]:
+        """
+        Get a snapshot of the queue counters.
+        """
+
+        depth, oldest_result_seconds = self._get_depth()
+
+        return {
+            "depth": depth,
+            "oldestResultSeconds": oldest_result_seconds,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failedBatches": self.failed_batches,
+            "lastFlushSeconds": self.last_flush_seconds,
+            "lastFlushLagSeconds": self.last_flush_lag_seconds,
+        }
+
+    def _get_depth(self) -> tuple[int, float]:
+        # How many results are queued, and how long the oldest has waited to be applied
+        if self._thread is None:
+            return 0, 0.0
+
+        with db_session() as db:
+            depth, oldest = db.execute(
+                select(func.count(), func.min(QueuedGameResult.enqueuedAt))
+            ).one()
+
+        return depth, (time.time() - oldest.timestamp() if oldest else 0.0)
+
+    def _run(self):
+        while self._running:
+            # Drain full batches back to back; a partial one means the queue is caught up
+            while self._running and self.flush() == self.batch_size:
+                pass
+
+            with self._condition:
+                # Sleep for the flush interval, or until woken by stop
+                if self._running:
+                    self._condition.wait(timeout=self.flush_interval_seconds)
+
+
+game_result_queue = GameResultQueue(
+    settings.game_result_queue_batch_size,
+    settings.game_result_queue_flush_interval_seconds,
+)
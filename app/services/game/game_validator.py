@@ -4,7 +4,7 @@ import uuid
 from datetime import date as DateType
 
 # SQLAlchemy
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, exists, select
 
 from sqlalchemy.orm import Session
 
@@ -18,15 +18,17 @@ from app.schemas.enums import GameMode
 from app.services.exceptions import (
     DateProvided,
     DateIsTodayOrInTheFuture,
-    DuplicateSession,
+    GameResultNotRecorded,
     InvalidNumberOfAttempts,
+    InvalidSession,
     UserAlreadyPlayedTheDailyGame,
 )
 
 # services
 from app.services.game.game_domain import get_maximum_attempts_by_game_mode
 
-from app.services.song import get_song_by_songID
+# websocket
+from app.ws.session_tokens import get_token_nonce
 
 
 def assert_date_is_not_today_or_in_the_future(date: DateType):
@@ -66,19 +68,57 @@ def assert_user_has_not_played_the_daily_game(db: Session, user_id: uuid.UUID):
         UserAlreadyPlayedTheDailyGame: If the user has already played today.
     """
 
-    # Get today's date
-    today = DateType.today()
-
     # Check if a daily game session exists for this user today
-    query = select(GameSession).where(
+    if db.scalar(select(_daily_game_played(user_id))):
+        raise UserAlreadyPlayedTheDailyGame()
+
+
+def assert_game_result_can_be_recorded(db: Session, user_id: uuid.UUID, mode: GameMode):
+    """
+    Ensure a game result can be recorded: the user has not played today's
+    daily game, for daily games.
+
+    Answered by an EXISTS check, without loading rows.
+
+    Raises:
+        UserAlreadyPlayedTheDailyGame: If the user has already played today.
+    """
+
+    # Only daily games are limited, so other modes need no round trip
+    if mode == GameMode.DAILY:
+        assert_user_has_not_played_the_daily_game(db, user_id)
+
+
+def assert_game_result_was_recorded(
+    db: Session, ws_game_session_id: uuid.UUID, user_id: uuid.UUID
+):
+    """
+    Ensure the server recorded a result for the user's WebSocket game session.
+
+    Raises:
+        GameResultNotRecorded: If no result of this user was recorded for the session.
+    """
+
+    # Check if the server persisted a game session of this user under the ID
+    query = select(
+        exists().where(
+            GameSession.wsGameSessionID == ws_game_session_id,
+            GameSession.userID == user_id,
+        )
+    )
+
+    if not db.scalar(query):
+        raise GameResultNotRecorded()
+
+
+def _daily_game_played(user_id: uuid.UUID) -> ColumnElement[bool]:
+    # Whether a daily game session exists for this user today
+    return exists().where(
         GameSession.userID == user_id,
         GameSession.mode == GameMode.DAILY,
-        GameSession.date == today,
+        GameSession.date == DateType.today(),
     )
 
-    if db.scalars(query).first():
-        raise UserAlreadyPlayedTheDailyGame()
-
 
 def assert_number_of_attempts_do_not_exceed_the_mode_maximum(
     mode: GameMode, attempts: int
@@ -97,27 +137,25 @@ def assert_number_of_attempts_do_not_exceed_the_mode_maximum(
         raise InvalidNumberOfAttempts()
 
 
-def assert_song_exists(db: Session, song_id: uuid.UUID):
+def get_ws_game_session_uuid(ws_game_session_id: str) -> uuid.UUID:
     """
-    Ensure the song the frontend passes exists in the database.
+    Resolve a WebSocket game session ID to the UUID it is persisted under.
+
+    Signed session tokens are persisted under their nonce.
 
     Raises:
-        SongNotFound: If the given song is not in the database.
+        InvalidSession: If the ID is neither a UUID nor a session token.
     """
 
-    get_song_by_songID(db, song_id)
+    try:
+        return uuid.UUID(ws_game_session_id)
 
+    except ValueError:
+        pass
 
-def assert_game_session_is_unique(db: Session, ws_game_session_id: str):
-    """
-    Ensure the WebSocket game session ID is not already in the database.
-
-    Raises:
-        DuplicateSession: If a session with the given ID already exists.
-    """
+    nonce = get_token_nonce(ws_game_session_id)
 
-    # Check for an existing game session with the same WebSocket ID
-    query = select(GameSession).where(GameSession.wsGameSessionID == ws_game_session_id)
+    if nonce is None:
+        raise InvalidSession()
 
-    if db.scalars(query).first():
-        raise DuplicateSession()
+    return nonce
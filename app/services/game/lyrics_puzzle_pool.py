@@ -0,0 +1,226 @@
+# standard library
+import threading
+
+import time
+
+from collections import deque
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+# SQLAlchemy
+from sqlalchemy.exc import SQLAlchemyError
+
+from sqlalchemy.orm import Session
+
+# app core
+from app.db.get_db import db_session
+
+# exceptions
+from app.services.exceptions import (
+    AnswerPositionsLengthMismatch,
+    EmptyLyricsWords,
+    NoSongAvailable,
+)
+
+if TYPE_CHECKING:
+    from app.services.game.game import StartGameDTO
+
+# Seconds to wait before refilling again after the database could not provide puzzles
+REFILL_RETRY_SECONDS = 5.0
+
+
+class LyricsPuzzlePool:
+    """
+    Bounded pool of ready-made lyrics puzzles, refilled by a background thread.
+
+    Once the pool drops to the low watermark, the worker generates puzzles until
+    it reaches the high watermark again.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[Session], "StartGameDTO"],
+        low_watermark: int,
+        high_watermark: int,
+    ):
+        self.generate = generate
+
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+
+        self._puzzles: deque["StartGameDTO"] = deque(maxlen=high_watermark)
+
+        self._condition = threading.Condition()
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Bumped on every clear, so a puzzle generated from older lyrics is not pooled
+        self._generation = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.last_refill_seconds = 0.0
+        self.total_refill_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._puzzles)
+
+    def start(self):
+        """
+        Start the background refill worker.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._running = True
+
+        self._thread = threading.Thread(
+            target=self._run, name="lyrics-puzzle-pool", daemon=True
+        )
+
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background refill worker and wait for it to exit.
+        """
+
+        with self._condition:
+            self._running = False
+
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout=REFILL_RETRY_SECONDS)
+
+            self._thread = None
+
+    def pop(self) -> Optional["StartGameDTO"]:
+        """
+        Take a ready-made puzzle from the pool.
+
+        Returns:
+            A puzzle, or None if the pool is empty.
+        """
+
+        with self._condition:
+            if not self._puzzles:
+                self.misses += 1
+
+                # Wake the worker in case it is waiting to retry
+                self._condition.notify_all()
+
+                return None
+
+            self.hits += 1
+
+            puzzle = self._puzzles.popleft()
+
+            if len(self._puzzles) <= self.low_watermark:
+                self._condition.notify_all()
+
+            return puzzle
+
+    def put_back(self, puzzle: "StartGameDTO"):
+        """
+        Return an unused puzzle to the back of the pool.
+        """
+
+        with self._condition:
+            if len(self._puzzles) < self.high_watermark:
+                self._puzzles.append(puzzle)
+
+    def clear(self):
+        """
+        Drop every pooled puzzle and trigger a refill.
+        """
+
+        with self._condition:
+            self._puzzles.clear()
+
+            self._generation += 1
+
+            self._condition.notify_all()
+
+    def get_metrics(self) -> dict[str, int | float]:
+        """
+        Get a snapshot of the pool counters.
+        """
+
+        average_refill_seconds = (
+            self.total_refill_seconds / self.refills if self.refills else 0.0
+        )
+
+        return {
+            "size": len(self._puzzles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refills": self.refills,
+            "lastRefillSeconds": self.last_refill_seconds,
+            "averageRefillSeconds": average_refill_seconds,
+        }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Sleep until the pool needs refilling or the worker is stopped
+                self._condition.wait_for(
+                    lambda: not self._running
+                    or len(self._puzzles) <= self.low_watermark
+                )
+
+                if not self._running:
+                    return
+
+            if not self._refill():
+                # The database could not provide puzzles; back off before trying again
+                with self._condition:
+                    self._condition.wait(timeout=REFILL_RETRY_SECONDS)
+
+    def _refill(self) -> bool:
+        """
+        Generate puzzles until the pool reaches the high watermark.
+
+        Returns:
+            False if the refill stopped because no puzzle could be generated.
+        """
+
+        started_at = time.perf_counter()
+
+        # Songs with unusable lyrics are skipped, but only a bounded number of times per refill
+        attempts_left = 2 * self.high_watermark
+
+        try:
+            with db_session() as db:
+                while self._running and len(self._puzzles) < self.high_watermark:
+                    if attempts_left == 0:
+                        return False
+
+                    attempts_left -= 1
+
+                    generation = self._generation
+
+                    try:
+                        puzzle = self.generate(db)
+
+                    except (EmptyLyricsWords, AnswerPositionsLengthMismatch, IndexError):
+                        continue
+
+                    with self._condition:
+                        if generation == self._generation:
+                            self._puzzles.append(puzzle)
+
+        except (NoSongAvailable, SQLAlchemyError):
+            return False
+
+        elapsed = time.perf_counter() - started_at
+
+        self.refills += 1
+        self.last_refill_seconds = elapsed
+        self.total_refill_seconds += elapsed
+
+        return True
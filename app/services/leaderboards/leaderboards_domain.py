@@ -4,6 +4,8 @@ import uuid
 from typing import Optional
 
 # SQLAlchemy
+from sqlalchemy.dialects.postgresql import insert
+
 from sqlalchemy.orm import Session
 
 # models
@@ -82,34 +84,53 @@ def update_leaderboards_after_game(db: Session, user_id: uuid.UUID, mode: GameMo
     Update the leaderboards for a user after a game has been won.
     """
 
+    increment_leaderboards(
+        db, {(user_id, mode, period): 1 for period in get_leaderboard_periods(mode)}
+    )
+
+
+def get_leaderboard_periods(mode: GameMode) -> list[Period]:
+    """
+    Get the leaderboard periods a game of the given mode counts towards.
+    """
+
     if mode == GameMode.ORIGINAL:
-        periods = [Period.DAILY, Period.WEEKLY, Period.MONTHLY, Period.ALL_TIME]
-    else:
-        periods = [Period.WEEKLY, Period.MONTHLY, Period.ALL_TIME]
+        return [Period.DAILY, Period.WEEKLY, Period.MONTHLY, Period.ALL_TIME]
 
-    for period in periods:
-        increment_leaderboard(db, user_id, mode, period)
+    return [Period.WEEKLY, Period.MONTHLY, Period.ALL_TIME]
 
 
-def increment_leaderboard(db: Session, user_id: uuid.UUID, mode: GameMode, period: str):
+def increment_leaderboards(
+    db: Session, wins: dict[tuple[uuid.UUID, GameMode, Period], int]
+):
     """
-    Increment the number of wins for a user in the leaderboard of a specific mode.
+    Add wins to leaderboard rows, keyed by user, mode and period.
+
+    Every row is incremented by a single upsert, so concurrent submits can
+    neither lose an increment nor collide on the first insert.
     """
 
-    row = (
-        db.query(UserLeaderboard)
-        .filter(
-            UserLeaderboard.userID == user_id,
-            UserLeaderboard.mode == mode,
-            UserLeaderboard.period == period,
-        )
-        .first()
-    )
+    if not wins:
+        return
 
-    if not row:
-        row = UserLeaderboard(userID=user_id, mode=mode, period=period, numberOfWins=1)
+    statement = insert(UserLeaderboard).values(
+        [
+            {"userID": user_id, "mode": mode, "period": period, "numberOfWins": count}
+            for (user_id, mode, period), count in wins.items()
+        ]
+    )
 
-        db.add(row)
+    # Rows that already exist are incremented in place by the database
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            UserLeaderboard.userID,
+            UserLeaderboard.mode,
+            UserLeaderboard.period,
+        ],
+        set_={
+            "numberOfWins": UserLeaderboard.numberOfWins
+            + statement.excluded.numberOfWins
+        },
+    )
 
-    else:
-        row.numberOfWins += 1
+    db.execute(statement)
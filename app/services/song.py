@@ -1,13 +1,15 @@
 # standard library
 import uuid
 
+from typing import Optional
+
 # SQLAlchemy
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 # app core
-from app.db.supabase import supabase
+from app.core.config import settings
 
 # models
 from app.models import *
@@ -18,12 +20,28 @@ from app.schemas.enums import GameMode
 from app.schemas.song import SongMetadata
 
 # services
+from app.services.audio.clips import audio_clip_cache
+
+from app.services.audio.signed_url_cache import SignedUrlCache
+
+from app.services.audio.storage import audio_storage
+
+from app.services.catalog.song_history import song_history
+
+from app.services.catalog.song_index import song_index
+
 from app.services.game.game_domain import get_expires_in_minutes_by_game_mode
 
 # exceptions
-from app.services.exceptions import NoSongAvailable, SongNotFound
+from app.services.exceptions import (
+    AudioClipExtractionFailed,
+    NoSongAvailable,
+    SongNotFound,
+)
 
 # utils
+from app.utils.constants import MODE_AUDIO_CLIP_LENGTH
+
 from app.utils.helpers import calculate_minutes_to_seconds
 
 
@@ -44,10 +62,13 @@ def get_all_song_titles(db: Session) -> list[str]:
     return [title for title in song_titles]
 
 
-def get_random_song(db: Session) -> Song:
+def get_random_song(db: Session, user_id: Optional[uuid.UUID] = None) -> Song:
     """
     Retrieve a single song selected at random from the database.
 
+    The song is picked from the in-memory song index and loaded by primary key,
+    without its lyrics until they are accessed. For authenticated users, recently served songs are skipped when possible.
+
     Returns:
         A randomly selected Song.
 
@@ -55,17 +76,53 @@ def get_random_song(db: Session) -> Song:
         NoSongAvailable: If the database contains no songs.
     """
 
-    # Randomize song order and select the first result
-    query = select(Song).order_by(func.random())
+    # Songs the user has recently been given
+    excluded = song_history.get_recently_served(user_id) if user_id else None
 
-    song = db.scalars(query).first()
+    # Pick a song ID at random from the catalog index
+    song_id = song_index.pick_random_song_id(db, excluded)
+
+    song = db.get(Song, song_id, options=[defer(Song.lyrics)])
+
+    if not song:
+        # The song was removed since the index was built; rebuild and try again
+        song_index.invalidate()
+
+        song_id = song_index.pick_random_song_id(db, excluded)
+
+        song = db.get(Song, song_id, options=[defer(Song.lyrics)])
 
     if not song:
         raise NoSongAvailable()
 
+    # Remember the song so the user is not given it again soon
+    if user_id:
+        record_song_as_served(user_id, song_id)
+
     return song
 
 
+def record_song_as_served(user_id: uuid.UUID, song_id: uuid.UUID):
+    """
+    Add a song to the user's recently served songs.
+    """
+
+    position = song_index.get_position(song_id)
+
+    if position is not None:
+        song_history.record(user_id, position)
+
+
+def was_song_recently_served(user_id: uuid.UUID, song_id: uuid.UUID) -> bool:
+    """
+    Check whether a song is among the user's recently served songs.
+    """
+
+    position = song_index.get_position(song_id)
+
+    return position is not None and song_history.contains(user_id, position)
+
+
 def get_song_by_songID(db: Session, song_id: uuid.UUID) -> Song:
     """
     Retrieve a song by ID or raise if it does not exist.
@@ -130,7 +187,8 @@ def get_signed_audio_link(mode: GameMode, audio_link: str) -> str:
     """
     Generate a time-limited signed URL for a song’s audio file based on the selected game mode.
 
-    The URL expires according to the mode-specific session duration.
+    The URL stays valid for at least the mode-specific session duration. URLs are
+    cached and shared between requests while enough of their validity remains.
 
     Returns:
         A signed URL that allows temporary access to the audio file.
@@ -142,10 +200,40 @@ def get_signed_audio_link(mode: GameMode, audio_link: str) -> str:
     # Convert expiration duration to seconds
     expires_in_seconds = calculate_minutes_to_seconds(expires_in_minutes)
 
-    # Create a signed URL for the audio file in the buckets
-    link = supabase.storage.from_("songs").create_signed_url(
-        audio_link,
-        expires_in_seconds,
+    return signed_url_cache.get(audio_link, expires_in_seconds)
+
+
+def get_signed_audio_clip_link(mode: GameMode, audio_link: str, start_at: int) -> str:
+    """
+    Generate a time-limited signed URL for the mode-length clip of a song starting at start_at.
+
+    Clips are cut once and cached on disk.
+
+    Returns:
+        A signed URL that allows temporary access to the audio clip.
+
+    Raises:
+        AudioClipExtractionFailed: If clips are disabled or the clip could not be cut.
+    """
+
+    if audio_clip_cache is None:
+        raise AudioClipExtractionFailed()
+
+    # Cut or reuse the clip for the mode's clip length
+    clip_name = audio_clip_cache.get_or_create(
+        audio_link, start_at, MODE_AUDIO_CLIP_LENGTH[mode]
     )
 
-    return link["signedUrl"]
+    # Determine the expiration duration based on game mode
+    expires_in_minutes = get_expires_in_minutes_by_game_mode(mode)
+
+    expires_in_seconds = calculate_minutes_to_seconds(expires_in_minutes)
+
+    return audio_clip_cache.create_signed_url(clip_name, expires_in_seconds)
+
+
+signed_url_cache = SignedUrlCache(
+    audio_storage.create_signed_url,
+    settings.signed_url_bucket_seconds,
+    settings.signed_url_cache_size,
+)
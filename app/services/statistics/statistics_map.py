@@ -14,14 +14,10 @@ def stat_mapper(stats: StatisticsModel) -> StatisticsSchema:
 
     win_percentage = (stats.winCount * 100 // gamesPlayed) if gamesPlayed > 0 else 0
 
-    guess_distribution = (
-        stats.guesses1,
-        stats.guesses2,
-        stats.guesses3,
-        stats.guesses4,
-        stats.guesses5,
-        stats.guesses6,
-    )
+    # The column is a list; the schema takes exactly one counter per number of guesses
+    guesses1, guesses2, guesses3, guesses4, guesses5, guesses6 = stats.guessDistribution
+
+    guess_distribution = (guesses1, guesses2, guesses3, guesses4, guesses5, guesses6)
 
     return StatisticsSchema(
         gamesPlayed=stats.gamesPlayed,
@@ -1,11 +1,19 @@
 # standard library
 import uuid
 
+from dataclasses import dataclass, field
+
+from typing import Any
+
 # SQLAlchemy
+from sqlalchemy import Boolean, Integer, Row, bindparam, case, update
+
+from sqlalchemy.dialects.postgresql import array
+
 from sqlalchemy.orm import Session
 
 # models
-from app.models.statistics import Statistics
+from app.models.statistics import GUESS_DISTRIBUTION_LENGTH, Statistics
 
 # schemas
 from app.schemas.enums import GameMode
@@ -18,75 +26,231 @@ from app.services.game.game_validator import (
 
 def update_statistics_after_game(
     db: Session, user_id: uuid.UUID, mode: GameMode, won: bool, guesses: int
-):
+) -> Row[Any]:
     """
     Update a user's statistics after completing a game.
 
-    Handles games played, win/loss counts, streaks, and guess distribution.
+    Handles games played, win/loss counts, streaks, and guess distribution
+    in a single UPDATE computed by the database from the current row, so
+    the row is never read first and is locked only by the update itself.
+
+    Returns:
+        The updated games played, win count, current streak and maximum streak.
+
+    Raises:
+        InvalidNumberOfAttempts: If the guesses exceed the mode maximum.
+        NoResultFound: If the user has no statistics for the mode.
     """
 
-    # Lock the user's statistics row for update to prevent race conditions
-    stats = (
-        db.query(Statistics)
-        .filter(Statistics.userID == user_id, Statistics.mode == mode)
-        .with_for_update()
-        .one()
-    )
+    # Reject impossible guess counts before touching the row
+    assert_number_of_attempts_do_not_exceed_the_mode_maximum(GameMode(mode), guesses)
 
-    # Increment total games played
-    _increment_games_played(stats)
+    values = {
+        # Increment total games played
+        **_increment_games_played(),
+        # Update wins and streaks depending on the outcome of the game
+        **_update_win_and_streaks(won),
+        # Update the guess distribution based on the number of guesses
+        **_update_guess_distribution(won, guesses),
+    }
 
-    # Update wins and streaks depending on the outcome of the game
-    _update_win_and_streaks(stats, won)
+    statement = (
+        update(Statistics)
+        .where(Statistics.userID == user_id, Statistics.mode == mode)
+        .values(values)
+        .returning(
+            Statistics.gamesPlayed,
+            Statistics.winCount,
+            Statistics.currentStreak,
+            Statistics.maximumStreak,
+        )
+        # No Statistics objects are loaded in this session, so there is nothing to synchronize
+        .execution_options(synchronize_session=False)
+    )
 
-    # Update the guess distribution based on the number of guesses
-    _update_guess_distribution(stats, guesses)
+    return db.execute(statement).one()
 
 
-def _increment_games_played(stats: Statistics):
+def _increment_games_played() -> dict[Any, Any]:
     """
     Increment the total number of games played by the user.
     """
-    stats.gamesPlayed += 1
 
+    return {Statistics.gamesPlayed: Statistics.gamesPlayed + 1}
 
-def _update_win_and_streaks(stats: Statistics, won: bool):
+
+def _update_win_and_streaks(won: bool) -> dict[Any, Any]:
     """
     Update the user's win count and streaks after a game.
     """
 
+    # If the user lost, reset the current streak to zero
+    if not won:
+        return {Statistics.currentStreak: 0}
+
     # If the user won, increase the win count and current streak
-    if won:
-        stats.winCount += 1
-        stats.currentStreak += 1
+    return {
+        Statistics.winCount: Statistics.winCount + 1,
+        Statistics.currentStreak: Statistics.currentStreak + 1,
+        # SET expressions see the row before the update, so compare against the new streak
+        Statistics.maximumStreak: case(
+            (
+                Statistics.currentStreak + 1 > Statistics.maximumStreak,
+                Statistics.currentStreak + 1,
+            ),
+            else_=Statistics.maximumStreak,
+        ),
+    }
 
-        # Update maximum streak if exceeded
-        if stats.currentStreak > stats.maximumStreak:
-            stats.maximumStreak = stats.currentStreak
 
-    # If the user lost, reset the current streak to zero
-    else:
-        stats.currentStreak = 0
+def _update_guess_distribution(won: bool, guesses: int) -> dict[Any, Any]:
+    """
+    Increment the counter for the number of guesses taken to win.
+    """
+
+    # Lost games took no number of guesses to win
+    if not won or not 1 <= guesses <= GUESS_DISTRIBUTION_LENGTH:
+        return {}
+
+    # Only the one array element is assigned; PostgreSQL arrays are 1-based
+    counter = Statistics.__table__.c.guessDistribution[guesses]
 
+    return {counter: counter + 1}
 
-def _update_guess_distribution(stats: Statistics, guesses: int):
+
+@dataclass
+class StatisticsDelta:
     """
-    Increment the counter for the number of guesses taken to win.
+    Several games of one user and mode, folded into what they change in the statistics row.
+
+    Streaks depend on the order of the games, so besides the totals the delta
+    keeps the wins before the first loss, which extend the current streak,
+    the longest run of wins after it, and the wins after the last loss,
+    which become the new current streak.
     """
 
-    assert_number_of_attempts_do_not_exceed_the_mode_maximum(
-        GameMode(stats.mode), guesses
+    games: int = 0
+
+    wins: int = 0
+
+    guesses: list[int] = field(
+        default_factory=lambda: [0] * GUESS_DISTRIBUTION_LENGTH
     )
 
-    if guesses == 1:
-        stats.guesses1 += 1
-    elif guesses == 2:
-        stats.guesses2 += 1
-    elif guesses == 3:
-        stats.guesses3 += 1
-    elif guesses == 4:
-        stats.guesses4 += 1
-    elif guesses == 5:
-        stats.guesses5 += 1
-    elif guesses == 6:
-        stats.guesses6 += 1
+    had_loss: bool = False
+
+    leading_wins: int = 0
+
+    longest_run: int = 0
+
+    trailing_wins: int = 0
+
+    def add(self, won: bool, guesses: int):
+        """
+        Fold in the next game, in the order the games were played.
+        """
+
+        self.games += 1
+
+        # Only wins count towards the guess distribution
+        if won and 1 <= guesses <= GUESS_DISTRIBUTION_LENGTH:
+            self.guesses[guesses - 1] += 1
+
+        if not won:
+            self.had_loss = True
+
+            self.trailing_wins = 0
+
+            return
+
+        self.wins += 1
+
+        if not self.had_loss:
+            self.leading_wins += 1
+
+            return
+
+        self.trailing_wins += 1
+
+        self.longest_run = max(self.longest_run, self.trailing_wins)
+
+
+def apply_statistics_deltas(
+    db: Session, deltas: dict[tuple[uuid.UUID, GameMode], StatisticsDelta]
+):
+    """
+    Apply folded games to the statistics rows of their users, keyed by user and mode.
+
+    All rows are updated by one executemany of a single UPDATE statement.
+    """
+
+    if not deltas:
+        return
+
+    statistics = Statistics.__table__.c
+
+    # Parameters that no column comparison gives a type to
+    had_loss = bindparam("b_had_loss", type_=Boolean)
+
+    trailing_wins = bindparam("b_trailing_wins", type_=Integer)
+
+    longest_run = bindparam("b_longest_run", type_=Integer)
+
+    # The streak if no game was lost, which is also the first run of wins otherwise
+    extended_streak = statistics.currentStreak + bindparam("b_leading_wins")
+
+    maximum_streak = case(
+        (extended_streak > statistics.maximumStreak, extended_streak),
+        else_=statistics.maximumStreak,
+    )
+
+    statement = (
+        update(Statistics.__table__)
+        .where(
+            statistics.userID == bindparam("b_user_id"),
+            statistics.mode == bindparam("b_mode"),
+        )
+        .values(
+            {
+                statistics.gamesPlayed: statistics.gamesPlayed + bindparam("b_games"),
+                statistics.winCount: statistics.winCount + bindparam("b_wins"),
+                statistics.currentStreak: case(
+                    (had_loss, trailing_wins),
+                    else_=extended_streak,
+                ),
+                statistics.maximumStreak: case(
+                    (longest_run > maximum_streak, longest_run),
+                    else_=maximum_streak,
+                ),
+                # The whole distribution is rebuilt with every counter incremented
+                statistics.guessDistribution: array(
+                    [
+                        statistics.guessDistribution[guesses]
+                        + bindparam(f"b_guesses{guesses}", type_=Integer)
+                        for guesses in range(1, GUESS_DISTRIBUTION_LENGTH + 1)
+                    ]
+                ),
+            }
+        )
+    )
+
+    db.execute(
+        statement,
+        [
+            {
+                "b_user_id": user_id,
+                "b_mode": mode,
+                "b_games": delta.games,
+                "b_wins": delta.wins,
+                "b_had_loss": delta.had_loss,
+                "b_leading_wins": delta.leading_wins,
+                "b_longest_run": delta.longest_run,
+                "b_trailing_wins": delta.trailing_wins,
+                **{
+                    f"b_guesses{guesses}": count
+                    for guesses, count in enumerate(delta.guesses, start=1)
+                },
+            }
+            for (user_id, mode), delta in deltas.items()
+        ],
+    )
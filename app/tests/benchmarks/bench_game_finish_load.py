@@ -0,0 +1,248 @@
+"""
+Load test many games finishing at once, with and without the database executor.
+
+A uvicorn server runs in a child process with in-memory sessions. Clients
+in this process keep guessing every --guess-interval-ms while --finishers
+games are won at the same moment. Each finished game loads its song
+metadata. The cache is bypassed and the load is a --query-ms sleep
+standing in for the query:
+
+- blocking: the load runs on the event loop, as before the executor
+- executor: the load runs on the database executor
+
+No database is needed; guest games are not recorded.
+
+    python -m app.tests.benchmarks.bench_game_finish_load --guessers 200 --finishers 500
+"""
+
+# standard library
+import argparse
+
+import asyncio
+
+import json
+
+import multiprocessing
+
+import socket
+
+import statistics
+
+import time
+
+import uuid
+
+# websockets
+from websockets.asyncio.client import connect
+
+# Session IDs are fixed, so the clients know them without asking the server
+FINISHER_IDS_START = 1_000_000
+
+
+def session_id(number: int) -> str:
+    return str(uuid.UUID(int=number))
+
+
+def run_server(mode: str, port: int, sessions_count: int, query_seconds: float):
+    # Runs in the child process
+    import uvicorn
+
+    from app.main import app
+
+    from app.schemas.enums import GameMode
+
+    from app.schemas.song import SongMetadata
+
+    from app.services.catalog.song_metadata_cache import song_metadata_cache
+
+    from app.db.executor import database_executor
+
+    from app.ws.session import GameSession
+
+    from app.ws.session_store import sessions
+
+    import app.api.v1.websockets.game as game_websocket
+
+    def load_metadata(db, song_id: uuid.UUID) -> SongMetadata:
+        time.sleep(query_seconds)
+
+        return SongMetadata(
+            type="song metadata",
+            title="Title",
+            releaseYear=2000,
+            album="Album",
+            shareLink="share",
+            artists=["Artist"],
+            songID=song_id,
+        )
+
+    # Every finished game misses the cache and loads its metadata
+    song_metadata_cache.get = lambda song_id: None
+
+    song_metadata_cache.warm = load_metadata
+
+    if mode == "blocking":
+
+        class BlockingExecutor:
+            async def run(self, function, *args):
+                return function(None, *args)
+
+        game_websocket.database_executor = BlockingExecutor()
+
+    else:
+        database_executor.start()
+
+    finisher_ids = range(FINISHER_IDS_START, FINISHER_IDS_START + sessions_count)
+
+    for number in [*range(sessions_count), *finisher_ids]:
+        session = GameSession.create(
+            answer="answer",
+            answer_song_id=uuid.uuid4(),
+            user_id=None,
+            mode=GameMode.ORIGINAL,
+            date=None,
+            maximum_attempts=10_000,
+            expires_in_minutes=10,
+        )
+
+        sessions.add(session_id(number), session)
+
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning", backlog=4096)
+
+
+def wait_for_port(port: int):
+    deadline = time.monotonic() + 60
+
+    while time.monotonic() < deadline:
+        with socket.socket() as probe:
+            if probe.connect_ex(("127.0.0.1", port)) == 0:
+                return
+
+        time.sleep(0.1)
+
+    raise TimeoutError("The server did not start.")
+
+
+async def guess_until(url: str, interval: float, stop: asyncio.Event, latencies: list[float]):
+    # Guess wrong every interval, timing each round trip
+    async with connect(url) as websocket:
+        while not stop.is_set():
+            started_at = time.perf_counter()
+
+            await websocket.send(json.dumps({"type": "guess", "guess": "wrong"}))
+
+            await websocket.recv()
+
+            latencies.append(time.perf_counter() - started_at)
+
+            await asyncio.sleep(interval)
+
+
+async def finish(url: str, go: asyncio.Event) -> float:
+    # Win as soon as every finisher is connected, then wait for the metadata
+    async with connect(url) as websocket:
+        await go.wait()
+
+        await websocket.send(json.dumps({"type": "guess", "guess": "answer"}))
+
+        while json.loads(await websocket.recv()).get("type") != "song metadata":
+            pass
+
+    return time.monotonic()
+
+
+async def load(
+    port: int, guessers: int, finishers: int, interval: float
+) -> tuple[list[float], float]:
+    base = f"ws://127.0.0.1:{port}/api/v1/ws/game/"
+
+    stop = asyncio.Event()
+
+    go = asyncio.Event()
+
+    latencies: list[float] = []
+
+    guessing = [
+        asyncio.create_task(guess_until(base + session_id(i), interval, stop, latencies))
+        for i in range(guessers)
+    ]
+
+    finishing = [
+        asyncio.create_task(finish(base + session_id(FINISHER_IDS_START + i), go))
+        for i in range(finishers)
+    ]
+
+    # Let the connections settle and the guessers reach a steady pace
+    await asyncio.sleep(2)
+
+    latencies.clear()
+
+    started_at = time.monotonic()
+
+    go.set()
+
+    finished_at = max(await asyncio.gather(*finishing))
+
+    # Keep guessing a little past the finish, so the recovery is measured too
+    await asyncio.sleep(0.5)
+
+    stop.set()
+
+    await asyncio.gather(*guessing)
+
+    return latencies, finished_at - started_at
+
+
+def describe(latencies: list[float]) -> str:
+    latencies = sorted(latencies)
+
+    p50 = statistics.median(latencies) * 1e3
+
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+
+    return f"guess p50 {p50:>7.1f}ms  p99 {p99:>8.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--guessers", type=int, default=200)
+    parser.add_argument("--finishers", type=int, default=500)
+    parser.add_argument("--guess-interval-ms", type=float, default=50)
+    parser.add_argument("--query-ms", type=float, default=20)
+
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    for mode in ("blocking", "executor"):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+
+            port = probe.getsockname()[1]
+
+        server = context.Process(
+            target=run_server,
+            args=(mode, port, max(args.guessers, args.finishers), args.query_ms / 1e3),
+            daemon=True,
+        )
+
+        server.start()
+
+        try:
+            wait_for_port(port)
+
+            latencies, finish_seconds = asyncio.run(
+                load(port, args.guessers, args.finishers, args.guess_interval_ms / 1e3)
+            )
+
+        finally:
+            server.terminate()
+
+            server.join()
+
+        print(f"{mode:<9} {describe(latencies)}  finish took {finish_seconds:>5.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Benchmark leaderboard increments against the read-then-write they replaced.
+
+Threads submit Original wins for one user, each on its own session, and
+every submit is committed on its own:
+
+- previous: a SELECT per period, then an ORM increment or INSERT
+- upsert: increment_leaderboards, a single INSERT ... ON CONFLICT DO UPDATE
+
+Lost increments are the wins the leaderboard rows are missing at the end.
+Run against a migrated scratch PostgreSQL database; the benchmark user is
+deleted afterwards:
+
+    python -m app.tests.benchmarks.bench_leaderboards --database-url postgresql://.../scratch
+"""
+
+# standard library
+import argparse
+
+import statistics
+
+import threading
+
+import time
+
+import uuid
+
+from typing import Callable
+
+# SQLAlchemy
+from sqlalchemy import create_engine, delete, select
+
+from sqlalchemy.dialects.postgresql import insert
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from sqlalchemy.orm import Session
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.enums import GameMode, Period
+
+# services
+from app.services.leaderboards.leaderboards_domain import (
+    get_leaderboard_periods,
+    update_leaderboards_after_game,
+)
+
+PERIODS = get_leaderboard_periods(GameMode.ORIGINAL)
+
+
+def increment_previously(db: Session, user_id: uuid.UUID, mode: GameMode):
+    # The read-then-write each submit made before increment_leaderboards
+    for period in PERIODS:
+        row = db.scalars(
+            select(UserLeaderboard).where(
+                UserLeaderboard.userID == user_id,
+                UserLeaderboard.mode == mode,
+                UserLeaderboard.period == period,
+            )
+        ).first()
+
+        if not row:
+            db.add(UserLeaderboard(userID=user_id, mode=mode, period=period, numberOfWins=1))
+
+        else:
+            row.numberOfWins += 1
+
+
+def run(
+    engine, user_id: uuid.UUID, increment: Callable, threads: int, submits: int
+) -> tuple[list[float], float, int]:
+    # Split the submits over the threads; failed commits are counted, not retried
+    timings: list[float] = []
+
+    failures = 0
+
+    lock = threading.Lock()
+
+    barrier = threading.Barrier(threads + 1)
+
+    def submit(count: int):
+        nonlocal failures
+
+        local_timings = []
+
+        local_failures = 0
+
+        with Session(engine) as db:
+            barrier.wait()
+
+            for _ in range(count):
+                started_at = time.perf_counter()
+
+                try:
+                    increment(db, user_id, GameMode.ORIGINAL)
+
+                    db.commit()
+
+                except SQLAlchemyError:
+                    db.rollback()
+
+                    local_failures += 1
+
+                local_timings.append(time.perf_counter() - started_at)
+
+        with lock:
+            timings.extend(local_timings)
+
+            failures += local_failures
+
+    workers = [
+        threading.Thread(target=submit, args=(submits // threads,)) for _ in range(threads)
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+
+    started_at = time.perf_counter()
+
+    for worker in workers:
+        worker.join()
+
+    return timings, time.perf_counter() - started_at, failures
+
+
+def count_lost_increments(engine, user_id: uuid.UUID, submits: int) -> int:
+    with Session(engine) as db:
+        wins = db.scalars(
+            select(UserLeaderboard.numberOfWins).where(UserLeaderboard.userID == user_id)
+        ).all()
+
+    return sum(submits - count for count in wins) + submits * (len(PERIODS) - len(wins))
+
+
+def describe(timings: list[float]) -> str:
+    timings = sorted(timings)
+
+    p50 = statistics.median(timings) * 1e3
+
+    p99 = timings[int(len(timings) * 0.99)] * 1e3
+
+    return f"p50 {p50:>6.2f}ms  p99 {p99:>6.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--submits", type=int, default=2_000)
+
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, pool_size=max(args.threads) + 1)
+
+    strategies = {"previous": increment_previously, "upsert": update_leaderboards_after_game}
+
+    with Session(engine) as db:
+        # Leaderboard rows are shared, so existing ones are left as they are
+        db.execute(
+            insert(Leaderboard)
+            .values([{"mode": GameMode.ORIGINAL.value, "period": period.value} for period in Period])
+            .on_conflict_do_nothing()
+        )
+
+        db.commit()
+
+    for threads in args.threads:
+        for name, increment in strategies.items():
+            with Session(engine) as db:
+                user = User(username=f"bench-{uuid.uuid4()}", password="password")
+
+                db.add(user)
+
+                db.commit()
+
+                user_id = user.userID
+
+            submits = args.submits // threads * threads
+
+            try:
+                timings, elapsed, failures = run(engine, user_id, increment, threads, submits)
+
+                lost = count_lost_increments(engine, user_id, submits - failures)
+
+            finally:
+                with Session(engine) as db:
+                    db.execute(delete(User).where(User.userID == user_id))
+
+                    db.commit()
+
+            print(
+                f"{name:<9} threads {threads:>2}  {submits / elapsed:>7.0f} submits/s  "
+                f"{describe(timings)}  failed {failures}  lost increments {lost}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Microbenchmark the per-start cost of building a lyrics puzzle, with and without the lyrics cache.
+
+- before: the previous per-start work, splitting the raw lyrics and running both regexes
+- after: a lyrics cache hit followed by index arithmetic and one string build
+
+Only the puzzle is timed; loading the song row is left out on both sides.
+
+    python -m app.tests.benchmarks.bench_lyrics_puzzle
+"""
+
+# standard library
+import argparse
+
+import random
+
+import re
+
+import statistics
+
+import time
+
+import uuid
+
+# models
+from app.models import *
+
+# services
+from app.services.catalog.lyrics_cache import LyricsCache
+
+from app.services.game.game import LyricsGameMode
+
+
+def make_lyrics(line_count: int) -> str:
+    # Semicolon-delimited lines with punctuation, apostrophes and hyphens, like the stored lyrics
+    line = "I'm never gonna give you up, never gonna let you down; rock-n-roll all night!"
+
+    return "; ".join(f"{line} {i}" for i in range(line_count // 2))
+
+
+def start_before(raw: str, lines_to_show: int) -> str:
+    # The previous implementation of a lyrics start, kept here as the reference
+    lines = [line.strip() for line in raw.split(";") if line.strip()]
+
+    start_at = random.randint(0, max(0, len(lines) - lines_to_show))
+
+    displayed = lines[start_at : start_at + lines_to_show]
+
+    words = [
+        (line_index, word_index, word)
+        for line_index, line in enumerate(displayed)
+        for word_index, word in enumerate(re.sub(r"[^a-zA-Z' ]", "", line).split())
+    ]
+
+    answer_length = 1 if len(words) < 2 else random.choice([1, 2])
+
+    start = random.randint(0, len(words) - answer_length)
+
+    selected = words[start : start + answer_length]
+
+    masked = displayed.copy()
+
+    # Mask from the end of each line so earlier spans stay valid
+    for line_index, word_index, _ in reversed(selected):
+        line = masked[line_index]
+
+        spans = [(m.start(), m.end()) for m in re.finditer(r"[A-Za-z'-]+", line)]
+
+        begin, end = spans[word_index]
+
+        masked[line_index] = line[:begin] + " ".join("_" * (end - begin)) + line[end:]
+
+    return "; ".join(masked)
+
+
+def start_after(mode: LyricsGameMode, cache: LyricsCache, song: Song) -> str:
+    # The current implementation, as LyricsGameMode.generate_puzzle runs it after picking the song
+    tokens = cache.get(song)
+
+    start_at = mode._get_lyrics_start_at(tokens.lines)
+
+    end_at = min(start_at + mode.LINES_TO_SHOW, len(tokens.lines))
+
+    answer, positions = mode._get_lyrics_answer(tokens, start_at, end_at)
+
+    return mode._get_lyrics_given(tokens, start_at, end_at, answer, positions)
+
+
+def measure(start, runs: int) -> list[float]:
+    timings = []
+
+    for _ in range(runs):
+        started_at = time.perf_counter()
+
+        start()
+
+        timings.append(time.perf_counter() - started_at)
+
+    return timings
+
+
+def describe(timings: list[float]) -> str:
+    timings = sorted(timings)
+
+    p50 = statistics.median(timings) * 1e6
+
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+
+    return f"p50 {p50:>8.1f}us  p99 {p99:>8.1f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--line-counts", type=int, nargs="+", default=[40, 200, 1_000])
+    parser.add_argument("--runs", type=int, default=20_000)
+
+    args = parser.parse_args()
+
+    mode = LyricsGameMode()
+
+    for line_count in args.line_counts:
+        raw = make_lyrics(line_count)
+
+        song = Song(songID=uuid.uuid4(), lyrics=raw)
+
+        cache = LyricsCache(maximum_songs=1)
+
+        # Warm the cache, so every timed start is a hit
+        start_after(mode, cache, song)
+
+        before = measure(lambda: start_before(raw, mode.LINES_TO_SHOW), args.runs)
+
+        after = measure(lambda: start_after(mode, cache, song), args.runs)
+
+        print(f"{line_count:>5} lines ({len(raw):>6} chars)  before  {describe(before)}")
+        print(f"{line_count:>5} lines ({len(raw):>6} chars)  after   {describe(after)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark the per-guess WebSocket messages of each protocol.
+
+Each guess is decoded from the frame the client sent and its result is
+encoded into the frame sent back:
+
+- before: receive_json, then ClientGuess.model_validate; send_json of model_dump
+- json: the JSON protocol, one-pass validate_json and model_dump_json
+- binary: the binary subprotocol's fixed frames
+
+The socket is a stand-in that never waits, so only the encoding is timed.
+
+    python -m app.tests.benchmarks.bench_protocol --guess "Bohemian Rhapsody"
+"""
+
+# standard library
+import argparse
+
+import json
+
+import statistics
+
+import time
+
+from typing import Any, Callable, Coroutine
+
+# schemas
+from app.schemas.game import ClientGuess, ServerCheck
+
+# websocket
+from app.ws.protocol import GUESS_FRAME, binary_protocol, json_protocol
+
+from app.ws.session_store import GuessOutcome
+
+
+class StandInWebSocket:
+    """
+    Hands out one received frame and keeps the last frame sent.
+    """
+
+    def __init__(self, message: dict):
+        self.message = message
+
+        self.sent: Any = None
+
+    async def receive(self) -> dict:
+        return self.message
+
+    async def receive_json(self) -> Any:
+        # As starlette decodes a text frame
+        return json.loads(self.message["text"])
+
+    async def send_text(self, data: str):
+        self.sent = data
+
+    async def send_bytes(self, data: bytes):
+        self.sent = data
+
+    async def send_json(self, data: Any):
+        # As starlette encodes it
+        self.sent = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def run_now(coroutine: Coroutine) -> Any:
+    # The stand-in never waits, so the coroutine finishes on its first step
+    try:
+        coroutine.send(None)
+
+    except StopIteration as stop:
+        return stop.value
+
+    raise RuntimeError("The coroutine waited.")
+
+
+async def decode_before(websocket: StandInWebSocket) -> str:
+    data = await websocket.receive_json()
+
+    return ClientGuess.model_validate(data).guess
+
+
+async def encode_before(websocket: StandInWebSocket, guess: str, outcome: GuessOutcome):
+    response = ServerCheck(
+        type="result",
+        guess=guess,
+        is_correct=outcome.is_correct,
+        attempts=outcome.attempts,
+        done=outcome.done,
+    )
+
+    await websocket.send_json(response.model_dump())
+
+
+def measure(call: Callable[[], object], runs: int) -> list[float]:
+    for _ in range(1_000):
+        call()
+
+    timings = []
+
+    for _ in range(runs):
+        started_at = time.perf_counter()
+
+        call()
+
+        timings.append(time.perf_counter() - started_at)
+
+    return timings
+
+
+def describe(timings: list[float]) -> str:
+    timings = sorted(timings)
+
+    p50 = statistics.median(timings) * 1e6
+
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+
+    return f"p50 {p50:>6.2f}us  p99 {p99:>6.2f}us"
+
+
+def size(frame: Any) -> int:
+    return len(frame.encode() if isinstance(frame, str) else frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--guess", default="Bohemian Rhapsody")
+    parser.add_argument("--runs", type=int, default=100_000)
+
+    args = parser.parse_args()
+
+    guess: str = args.guess
+
+    outcome = GuessOutcome(is_correct=False, attempts=3, done=False)
+
+    json_frame = {
+        "type": "websocket.receive",
+        "text": json.dumps({"type": "guess", "guess": guess}),
+    }
+
+    binary_frame = {
+        "type": "websocket.receive",
+        "bytes": bytes([GUESS_FRAME]) + guess.encode(),
+    }
+
+    protocols = {
+        "before": (json_frame, decode_before, encode_before),
+        "json": (json_frame, json_protocol.receive, json_protocol.send_result),
+        "binary": (binary_frame, binary_protocol.receive, binary_protocol.send_result),
+    }
+
+    for name, (frame, decode, encode) in protocols.items():
+        websocket = StandInWebSocket(frame)
+
+        assert run_now(decode(websocket)) == guess
+
+        run_now(encode(websocket, guess, outcome))
+
+        received = size(frame.get("text") or frame.get("bytes"))
+
+        decoding = measure(lambda: run_now(decode(websocket)), args.runs)
+
+        encoding = measure(lambda: run_now(encode(websocket, guess, outcome)), args.runs)
+
+        print(
+            f"{name:<7} decode {describe(decoding)}  encode {describe(encoding)}  "
+            f"bytes in/out {received}/{size(websocket.sent)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark the memory each game session takes in the in-memory store.
+
+Fills an InMemorySessionStore the way the start endpoint does: half the
+sessions are daily games, which share an answer and a date, and half are
+free play games spread over a catalog of songs. tracemalloc counts
+everything the store keeps per session: the record, the dict entry and
+the heap entry, but not the session ID string the client was sent.
+
+    python -m app.tests.benchmarks.bench_session_memory --sizes 100000 1000000
+"""
+
+# standard library
+import argparse
+
+import gc
+
+import tracemalloc
+
+import uuid
+
+from datetime import date as DateType
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_store import InMemorySessionStore
+
+# Number of distinct songs the free play answers are drawn from
+CATALOG_SIZE = 5_000
+
+
+def fill(store: InMemorySessionStore, size: int, catalog: list[tuple[str, uuid.UUID]]):
+    today = DateType.today()
+
+    daily_song_id = uuid.uuid4()
+
+    for i in range(size):
+        if i % 2:
+            answer, song_id, mode, date = "Daily song title", daily_song_id, GameMode.DAILY, today
+
+        else:
+            answer, song_id = catalog[i % CATALOG_SIZE]
+
+            mode, date = GameMode.ORIGINAL, None
+
+        session = GameSession.create(
+            answer=answer,
+            answer_song_id=song_id,
+            user_id=uuid.uuid4() if i % 4 < 2 else None,
+            mode=mode,
+            date=date,
+            maximum_attempts=6,
+            expires_in_minutes=5,
+        )
+
+        store.add(str(uuid.uuid4()), session)
+
+
+def measure(size: int) -> float:
+    # Bytes held per session once the store is filled; the catalog is loaded beforehand
+    catalog = [(f"Song title {i}", uuid.uuid4()) for i in range(CATALOG_SIZE)]
+
+    gc.collect()
+
+    tracemalloc.start()
+
+    store = InMemorySessionStore()
+
+    fill(store, size, catalog)
+
+    gc.collect()
+
+    held, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    assert len(store) == size
+
+    return held / size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(f"{size:>9} sessions  {measure(size):>6.0f} B/session")
+
+
+if __name__ == "__main__":
+    main()
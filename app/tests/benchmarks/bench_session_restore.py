@@ -0,0 +1,97 @@
+"""
+Benchmark saving and restoring the in-memory sessions across a restart.
+
+Fills an InMemorySessionStore with sessions spread over a catalog of
+songs, snapshots it as shutdown does, then restores it into an empty
+store with restore_sessions, as startup does. A tenth of the sessions are
+parked.
+
+    python -m app.tests.benchmarks.bench_session_restore --sessions 1000000 --songs 500
+"""
+
+# standard library
+import argparse
+
+import os
+
+import tempfile
+
+import time
+
+import uuid
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_store import InMemorySessionStore, restore_sessions, snapshot_sessions
+
+
+def fill(store: InMemorySessionStore, size: int, songs: int):
+    catalog = [(f"Song title {i}", uuid.uuid4()) for i in range(songs)]
+
+    parked_until = int(time.time()) + 60
+
+    for i in range(size):
+        answer, song_id = catalog[i % songs]
+
+        session = GameSession.create(
+            answer=answer,
+            answer_song_id=song_id,
+            user_id=uuid.uuid4() if i % 2 else None,
+            mode=GameMode.ORIGINAL,
+            date=None,
+            maximum_attempts=6,
+            expires_in_minutes=30,
+        )
+
+        session.attempts = i % 6
+
+        if i % 10 == 0:
+            session.parked_until = parked_until
+
+        store.add(str(uuid.uuid4()), session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--songs", type=int, default=500)
+
+    args = parser.parse_args()
+
+    store = InMemorySessionStore()
+
+    fill(store, args.sessions, args.songs)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.bin")
+
+        started_at = time.perf_counter()
+
+        saved = snapshot_sessions(store, path)
+
+        snapshot_seconds = time.perf_counter() - started_at
+
+        size = os.path.getsize(path)
+
+        restored_store = InMemorySessionStore()
+
+        started_at = time.perf_counter()
+
+        restored = restore_sessions(restored_store, path)
+
+        restore_seconds = time.perf_counter() - started_at
+
+    assert saved == restored == args.sessions
+
+    print(f"snapshot {saved} sessions  {snapshot_seconds:>5.2f}s  {size / 1e6:>6.1f} MB")
+
+    print(f"restore  {restored} sessions  {restore_seconds:>5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark the guess round trip of each session store backend.
+
+Each game adds a session, then records guesses until it ends. Every guess is
+timed the way the WebSocket handler makes it, through call_session_store's
+rule: in-process stores are called on the event loop, blocking ones in the
+thread pool.
+
+Redis is benchmarked against --redis-url, or against a local fakeredis TCP
+server when no URL is given. Start a real Redis for numbers that reflect
+production; the stand-in is a Python server and is much slower.
+
+    python -m app.tests.benchmarks.bench_session_store --redis-url redis://localhost:6379/15
+"""
+
+# standard library
+import argparse
+
+import asyncio
+
+import statistics
+
+import threading
+
+import time
+
+import uuid
+
+from typing import Optional
+
+# FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+# redis
+import redis
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_store import (
+    InMemorySessionStore,
+    RedisSessionStore,
+    SessionStore,
+    TokenSessionStore,
+)
+
+from app.ws.session_tokens import SessionTokenCodec
+
+MAXIMUM_ATTEMPTS = 6
+
+
+def start_fake_redis() -> str:
+    # Serve the Redis protocol from this process on a free local port
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+
+    # Connection handlers must not keep the process alive once the benchmark is done
+    server.daemon_threads = True
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    host, port = server.server_address
+
+    return f"redis://{host}:{port}/0"
+
+
+async def play(store: SessionStore, games: int) -> list[float]:
+    # Play whole games, timing every guess from the event loop
+    timings = []
+
+    for game in range(games):
+        session = GameSession.create(
+            answer="answer",
+            answer_song_id=uuid.uuid4(),
+            user_id=None,
+            mode=GameMode.ORIGINAL,
+            date=None,
+            maximum_attempts=MAXIMUM_ATTEMPTS,
+            expires_in_minutes=5,
+        )
+
+        if store.issues_ids:
+            game_session_id = store.issue(session)
+
+        else:
+            game_session_id = str(uuid.uuid4())
+
+            store.add(game_session_id, session)
+
+        for attempt in range(1, MAXIMUM_ATTEMPTS + 1):
+            # Every other game is won on its last attempt
+            guess = "answer" if game % 2 and attempt == MAXIMUM_ATTEMPTS else "wrong"
+
+            started_at = time.perf_counter()
+
+            if store.blocking:
+                outcome = await run_in_threadpool(store.record_guess, game_session_id, guess)
+
+            else:
+                outcome = store.record_guess(game_session_id, guess)
+
+            timings.append(time.perf_counter() - started_at)
+
+            assert outcome is not None and outcome.attempts == attempt
+
+        store.remove(game_session_id)
+
+    return timings
+
+
+async def benchmark(store: SessionStore, games: int) -> list[float]:
+    # Warm up connections, scripts and the thread pool before timing
+    await play(store, 20)
+
+    return await play(store, games)
+
+
+def describe(timings: list[float]) -> str:
+    timings = sorted(timings)
+
+    p50 = statistics.median(timings) * 1e6
+
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+
+    return f"p50 {p50:>8.1f}us  p99 {p99:>8.1f}us  ({len(timings)} guesses)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--games", type=int, default=2_000)
+
+    args = parser.parse_args()
+
+    redis_url: Optional[str] = args.redis_url or start_fake_redis()
+
+    client = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    codec = SessionTokenCodec("benchmark-secret")
+
+    stores: dict[str, SessionStore] = {
+        "memory": InMemorySessionStore(),
+        "redis": RedisSessionStore(client),
+        "token+memory": TokenSessionStore(codec, InMemorySessionStore()),
+        "token+redis": TokenSessionStore(codec, RedisSessionStore(client)),
+    }
+
+    print(f"redis: {redis_url if args.redis_url else 'local fakeredis TCP server'}")
+
+    for name, store in stores.items():
+        timings = asyncio.run(benchmark(store, args.games))
+
+        print(f"{name:<13} {describe(timings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark signed session tokens against the session lookup they replace.
+
+Reports the token size, then the cost of each way a connection or a guess
+finds its session:
+
+- lookup: a dict lookup by UUID, as the in-memory store makes
+- decode: verifying a token and unpacking its claims
+- encode: issuing a token, which happens once per game
+
+    python -m app.tests.benchmarks.bench_session_tokens --runs 100000
+"""
+
+# standard library
+import argparse
+
+import statistics
+
+import time
+
+import uuid
+
+from typing import Callable
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_tokens import SessionTokenCodec
+
+
+def make_session() -> GameSession:
+    return GameSession.create(
+        answer="answer",
+        answer_song_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        mode=GameMode.ORIGINAL,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=5,
+    )
+
+
+def measure(call: Callable[[], object], runs: int) -> list[float]:
+    # Time single calls, after a warm-up
+    for _ in range(1_000):
+        call()
+
+    timings = []
+
+    for _ in range(runs):
+        started_at = time.perf_counter()
+
+        call()
+
+        timings.append(time.perf_counter() - started_at)
+
+    return timings
+
+
+def describe(timings: list[float]) -> str:
+    timings = sorted(timings)
+
+    p50 = statistics.median(timings) * 1e6
+
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+
+    return f"p50 {p50:>7.2f}us  p99 {p99:>7.2f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--runs", type=int, default=100_000)
+
+    args = parser.parse_args()
+
+    codec = SessionTokenCodec("benchmark-secret")
+
+    session = make_session()
+
+    token = codec.encode(session)
+
+    session_id = str(uuid.uuid4())
+
+    sessions = {str(uuid.uuid4()): make_session() for _ in range(100_000)}
+
+    sessions[session_id] = session
+
+    print(f"token {len(token)} characters, UUID {len(session_id)} characters")
+
+    calls: dict[str, Callable[[], object]] = {
+        "lookup": lambda: sessions.get(session_id),
+        "decode": lambda: codec.decode(token),
+        "encode": lambda: codec.encode(session),
+    }
+
+    for name, call in calls.items():
+        print(f"{name:<7} {describe(measure(call, args.runs))}")
+
+
+if __name__ == "__main__":
+    main()
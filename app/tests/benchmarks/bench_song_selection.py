@@ -0,0 +1,155 @@
+"""
+Benchmark random song selection against the ORDER BY random() query it replaced.
+
+Each catalog size is loaded into an empty songs table, then both strategies
+pick songs for a user whose recently served songs must be skipped:
+
+- query: the previous SELECT ... ORDER BY random(), excluding the history with NOT IN
+- index: a pick from the song index, excluding the history bitmap, plus a load by primary key
+
+Run against a scratch database, since the songs table is created and emptied:
+
+    python -m app.tests.benchmarks.bench_song_selection --database-url postgresql://.../scratch
+"""
+
+# standard library
+import argparse
+
+import random
+
+import statistics
+
+import time
+
+import uuid
+
+# pyroaring
+from pyroaring import FrozenBitMap
+
+# SQLAlchemy
+from sqlalchemy import create_engine, delete, func, insert, select
+
+from sqlalchemy.orm import Session, defer
+
+# models
+from app.models import *
+
+# services
+from app.services.catalog.song_index import SongIndex
+
+# Stand-in lyrics, so each row is about the size of a real song
+LYRICS = "\n".join(["never gonna give you up never gonna let you down"] * 20)
+
+
+def load_catalog(db: Session, size: int):
+    # Replace the catalog with size songs
+    db.execute(delete(Song))
+
+    db.execute(
+        insert(Song),
+        [
+            {
+                "songID": uuid.uuid4(),
+                "title": f"Song {i}",
+                "releaseYear": 2000,
+                "album": None,
+                "shareLink": f"share-{i}",
+                "audioLink": f"audio-{i}.mp3",
+                "lyrics": LYRICS,
+                "duration": 200,
+            }
+            for i in range(size)
+        ],
+    )
+
+    db.commit()
+
+
+def measure(pick, budget_seconds: float, maximum_runs: int) -> list[float]:
+    # Time single picks until the budget or the run limit is reached
+    timings = []
+
+    deadline = time.perf_counter() + budget_seconds
+
+    while len(timings) < maximum_runs and time.perf_counter() < deadline:
+        started_at = time.perf_counter()
+
+        pick()
+
+        timings.append(time.perf_counter() - started_at)
+
+    return timings
+
+
+def describe(timings: list[float]) -> str:
+    timings = sorted(timings)
+
+    p50 = statistics.median(timings) * 1e6
+
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6
+
+    return f"p50 {p50:>10.1f}us  p99 {p99:>10.1f}us  ({len(timings)} runs)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--history-sizes", type=int, nargs="+", default=[0, 50, 1_000])
+    parser.add_argument("--budget-seconds", type=float, default=2.0)
+    parser.add_argument("--maximum-runs", type=int, default=2_000)
+
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+
+    Song.__table__.create(engine, checkfirst=True)
+
+    with Session(engine) as db:
+        for catalog_size in args.catalog_sizes:
+            load_catalog(db, catalog_size)
+
+            song_index = SongIndex(refresh_interval_seconds=3600)
+
+            song_index.refresh(db)
+
+            song_ids = db.scalars(select(Song.songID)).all()
+
+            for history_size in args.history_sizes:
+                history = random.sample(song_ids, min(history_size, catalog_size))
+
+                # The history as song_history keeps it: a bitmap of index positions
+                excluded = FrozenBitMap(song_index.get_position(song_id) for song_id in history)
+
+                query = select(Song).order_by(func.random())
+
+                if history:
+                    query = query.where(Song.songID.not_in(history))
+
+                def pick_with_query():
+                    db.scalars(query).first()
+
+                def pick_with_index():
+                    song_id = song_index.pick_random_song_id(db, excluded)
+
+                    db.get(Song, song_id, options=[defer(Song.lyrics)])
+
+                    # Loading by primary key would hit the identity map on later runs
+                    db.expunge_all()
+
+                for name, pick in (("query", pick_with_query), ("index", pick_with_index)):
+                    timings = measure(pick, args.budget_seconds, args.maximum_runs)
+
+                    print(
+                        f"catalog {catalog_size:>7}  history {history_size:>5}  "
+                        f"{name:<5}  {describe(timings)}"
+                    )
+
+        db.execute(delete(Song))
+
+        db.commit()
+
+
+if __name__ == "__main__":
+    main()
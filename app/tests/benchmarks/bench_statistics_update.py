@@ -0,0 +1,202 @@
+"""
+Benchmark how long a submit holds the statistics row lock.
+
+Threads replay random games of one user, each on its own session, and
+time the span from the first statistics statement to the end of the
+commit. PostgreSQL holds the row lock for that whole span; with more than
+one thread the span also includes the wait for the lock:
+
+- previous: SELECT ... FOR UPDATE, the update computed in Python, then a flush
+- update: update_statistics_after_game, a single UPDATE ... RETURNING
+
+Both strategies must end with the same statistics. Run against a migrated
+scratch PostgreSQL database; the benchmark user is deleted afterwards:
+
+    python -m app.tests.benchmarks.bench_statistics_update --database-url postgresql://.../scratch
+"""
+
+# standard library
+import argparse
+
+import random
+
+import statistics
+
+import threading
+
+import time
+
+import uuid
+
+from typing import Callable
+
+# SQLAlchemy
+from sqlalchemy import create_engine, delete, select
+
+from sqlalchemy.orm import Session
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.enums import GameMode
+
+# services
+from app.services.statistics.statistics_update import update_statistics_after_game
+
+MODE = GameMode.ORIGINAL
+
+
+def update_previously(
+    db: Session, user_id: uuid.UUID, mode: GameMode, won: bool, guesses: int
+):
+    # The read-modify-write each submit made before the single UPDATE
+    row = db.scalars(
+        select(Statistics)
+        .where(Statistics.userID == user_id, Statistics.mode == mode)
+        .with_for_update()
+    ).one()
+
+    row.gamesPlayed += 1
+
+    if won:
+        row.winCount += 1
+
+        row.currentStreak += 1
+
+        row.maximumStreak = max(row.maximumStreak, row.currentStreak)
+
+        distribution = list(row.guessDistribution)
+
+        distribution[guesses - 1] += 1
+
+        row.guessDistribution = distribution
+
+    else:
+        row.currentStreak = 0
+
+    db.flush()
+
+
+def run(
+    engine, user_id: uuid.UUID, update: Callable, games: list[tuple[bool, int]], threads: int
+) -> tuple[list[float], float]:
+    # Each thread replays its share of the games; returns the lock spans and the wall time
+    spans: list[float] = []
+
+    lock = threading.Lock()
+
+    barrier = threading.Barrier(threads + 1)
+
+    def replay(share: list[tuple[bool, int]]):
+        local_spans = []
+
+        with Session(engine) as db:
+            barrier.wait()
+
+            for won, guesses in share:
+                started_at = time.perf_counter()
+
+                update(db, user_id, MODE, won, guesses)
+
+                db.commit()
+
+                local_spans.append(time.perf_counter() - started_at)
+
+        with lock:
+            spans.extend(local_spans)
+
+    workers = [
+        threading.Thread(target=replay, args=(games[i::threads],)) for i in range(threads)
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+
+    started_at = time.perf_counter()
+
+    for worker in workers:
+        worker.join()
+
+    return spans, time.perf_counter() - started_at
+
+
+def describe(spans: list[float]) -> str:
+    spans = sorted(spans)
+
+    p50 = statistics.median(spans) * 1e3
+
+    p99 = spans[int(len(spans) * 0.99)] * 1e3
+
+    return f"span p50 {p50:>6.2f}ms  p99 {p99:>6.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--games", type=int, default=3_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, pool_size=max(args.threads) + 1)
+
+    randomizer = random.Random(args.seed)
+
+    games = [
+        (won, randomizer.randint(1, 6) if won else 6)
+        for won in (randomizer.random() < 0.6 for _ in range(args.games))
+    ]
+
+    for threads in args.threads:
+        results = []
+
+        strategies = {"previous": update_previously, "update": update_statistics_after_game}
+
+        for name, update in strategies.items():
+            with Session(engine) as db:
+                user = User(username=f"bench-{uuid.uuid4()}", password="password")
+
+                db.add(user)
+
+                db.flush()
+
+                db.add(Statistics(userID=user.userID, mode=MODE.value))
+
+                db.commit()
+
+                user_id = user.userID
+
+            try:
+                spans, elapsed = run(engine, user_id, update, games, threads)
+
+                with Session(engine) as db:
+                    row = db.scalars(
+                        select(Statistics).where(Statistics.userID == user_id)
+                    ).one()
+
+                    totals = (row.gamesPlayed, row.winCount, tuple(row.guessDistribution))
+
+            finally:
+                with Session(engine) as db:
+                    db.execute(delete(User).where(User.userID == user_id))
+
+                    db.commit()
+
+            results.append(totals)
+
+            print(
+                f"{name:<9} threads {threads:>2}  {len(games) / elapsed:>6.0f} submits/s  "
+                f"{describe(spans)}"
+            )
+
+        # Streaks depend on the commit order across threads, so only the totals are compared
+        assert results[0] == results[1], results
+
+
+if __name__ == "__main__":
+    main()
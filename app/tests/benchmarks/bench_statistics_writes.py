@@ -0,0 +1,176 @@
+"""
+Benchmark the write cost of statistics updates.
+
+Replays random games of many users through update_statistics_after_game,
+committing each one, and reports from PostgreSQL's own counters:
+
+- the WAL written per update
+- the share of HOT (heap-only tuple) updates, which touch no index
+- the size of the statistics indexes
+
+With --counter-indexes, the run is first repeated with an index on every
+counter, as the table had before the guess distribution became an array,
+and the indexes are dropped afterwards. Run against a migrated scratch
+PostgreSQL database; the benchmark users are deleted afterwards:
+
+    python -m app.tests.benchmarks.bench_statistics_writes --database-url postgresql://.../scratch
+"""
+
+# standard library
+import argparse
+
+import random
+
+import time
+
+import uuid
+
+# SQLAlchemy
+from sqlalchemy import create_engine, delete, insert, text
+
+from sqlalchemy.orm import Session
+
+# models
+from app.models import *
+
+from app.models.statistics import GUESS_DISTRIBUTION_LENGTH
+
+# schemas
+from app.schemas.enums import GameMode
+
+# services
+from app.services.statistics.statistics_update import update_statistics_after_game
+
+MODE = GameMode.ORIGINAL
+
+# The counter indexes dropped with the guess distribution array, one per counter
+COUNTER_INDEXES = [
+    f'CREATE INDEX bench_statistics_{name} ON statistics ({expression})'
+    for name, expression in [
+        ("games_played", '"gamesPlayed"'),
+        ("win_count", '"winCount"'),
+        ("current_streak", '"currentStreak"'),
+        ("maximum_streak", '"maximumStreak"'),
+        *[
+            (f"guesses{guesses}", f'("guessDistribution"[{guesses}])')
+            for guesses in range(1, GUESS_DISTRIBUTION_LENGTH + 1)
+        ],
+    ]
+]
+
+
+def read_counters(db: Session) -> tuple[int, int, int, int]:
+    # WAL position, updates, HOT updates and index size of the statistics table
+    db.execute(text("SELECT pg_stat_clear_snapshot()"))
+
+    row = db.execute(
+        text(
+            "SELECT pg_current_wal_lsn() - '0/0', n_tup_upd, n_tup_hot_upd, "
+            "pg_indexes_size('statistics') FROM pg_stat_user_tables WHERE relname = 'statistics'"
+        )
+    ).one()
+
+    db.commit()
+
+    return int(row[0]), row[1], row[2], row[3]
+
+
+def flush_statistics(db: Session):
+    # Table counters are reported when a transaction ends, at most once a second unless forced
+    db.execute(text("SELECT pg_stat_force_next_flush()"))
+
+    db.commit()
+
+
+def replay(db: Session, user_ids: list[uuid.UUID], games: int, seed: int) -> str:
+    randomizer = random.Random(seed)
+
+    flush_statistics(db)
+
+    wal_before, updates_before, hot_before, _ = read_counters(db)
+
+    started_at = time.perf_counter()
+
+    for _ in range(games):
+        won = randomizer.random() < 0.6
+
+        guesses = randomizer.randint(1, GUESS_DISTRIBUTION_LENGTH) if won else 6
+
+        update_statistics_after_game(db, randomizer.choice(user_ids), MODE, won, guesses)
+
+        db.commit()
+
+    elapsed = time.perf_counter() - started_at
+
+    flush_statistics(db)
+
+    wal_after, updates_after, hot_after, index_size = read_counters(db)
+
+    updates = updates_after - updates_before
+
+    wal_per_update = (wal_after - wal_before) / games
+
+    return (
+        f"{games / elapsed:>5.0f} updates/s  {wal_per_update:>6.0f} B WAL/update  "
+        f"HOT {100 * (hot_after - hot_before) / max(updates, 1):>5.1f}%  "
+        f"indexes {index_size / 1e6:>5.2f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--games", type=int, default=5_000)
+    parser.add_argument("--counter-indexes", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+
+    user_ids = [uuid.uuid4() for _ in range(args.users)]
+
+    with Session(engine) as db:
+        db.execute(
+            insert(User),
+            [{"userID": i, "username": f"bench-{i}", "password": "password"} for i in user_ids],
+        )
+
+        db.execute(insert(Statistics), [{"userID": i, "mode": MODE.value} for i in user_ids])
+
+        db.commit()
+
+        try:
+            if args.counter_indexes:
+                for statement in COUNTER_INDEXES:
+                    db.execute(text(statement))
+
+                db.commit()
+
+                try:
+                    print(f"counter indexes  {replay(db, user_ids, args.games, args.seed)}")
+
+                finally:
+                    db.rollback()
+
+                    for statement in COUNTER_INDEXES:
+                        name = statement.split()[2]
+
+                        db.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+                    db.commit()
+
+            print(f"current          {replay(db, user_ids, args.games, args.seed)}")
+
+        finally:
+            db.rollback()
+
+            db.execute(delete(User).where(User.userID.in_(user_ids)))
+
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Soak the WebSocket game loop with clients that never send a message.
+
+Serves the app with uvicorn in this process, then opens rounds of silent
+clients. The server must ping every client and close it once the idle
+timeout passes. After each round, open file descriptors, live WebSocket
+objects, manager connections and stored sessions must all return to
+where they started. The lifespan is not run, so no database is needed.
+
+    python -m app.tests.benchmarks.bench_websocket_soak --clients 3000 --rounds 3
+"""
+
+# standard library
+import argparse
+
+import asyncio
+
+import gc
+
+import os
+
+import socket
+
+import threading
+
+import time
+
+import uuid
+
+from collections import Counter
+
+# FastAPI
+from starlette.websockets import WebSocket
+
+# uvicorn
+import uvicorn
+
+# websockets
+from websockets.asyncio.client import connect
+
+from websockets.exceptions import ConnectionClosed
+
+# app
+from app.main import app
+
+from app.core.config import settings
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.connection_manager import manager
+
+from app.ws.session import GameSession
+
+from app.ws.session_store import sessions
+
+
+def serve() -> tuple[uvicorn.Server, int]:
+    # Serve the app from a background thread on a free local port
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+
+        port = probe.getsockname()[1]
+
+    config = uvicorn.Config(
+        app, host="127.0.0.1", port=port, lifespan="off", log_level="warning", backlog=4096
+    )
+
+    server = uvicorn.Server(config)
+
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+    return server, port
+
+
+def start_game() -> str:
+    session = GameSession.create(
+        answer="answer",
+        answer_song_id=uuid.uuid4(),
+        user_id=None,
+        mode=GameMode.ORIGINAL,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=5,
+    )
+
+    if sessions.issues_ids:
+        return sessions.issue(session)
+
+    game_session_id = str(uuid.uuid4())
+
+    sessions.add(game_session_id, session)
+
+    return game_session_id
+
+
+async def stay_silent(port: int, game_session_id: str) -> tuple[list[str], float]:
+    # Read until the server closes the connection, never answering pings
+    received = []
+
+    started_at = time.monotonic()
+
+    async with connect(f"ws://127.0.0.1:{port}/api/v1/ws/game/{game_session_id}") as websocket:
+        try:
+            async for message in websocket:
+                received.append(message)
+
+        except ConnectionClosed:
+            pass
+
+    return received, time.monotonic() - started_at
+
+
+def count_resources() -> dict[str, int]:
+    gc.collect()
+
+    return {
+        "fds": len(os.listdir("/proc/self/fd")),
+        "websockets": sum(isinstance(item, WebSocket) for item in gc.get_objects()),
+        "connections": len(manager.connections),
+        "sessions": len(sessions),
+        "objects": len(gc.get_objects()),
+    }
+
+
+async def run_round(port: int, clients: int) -> tuple[Counter, float]:
+    game_session_ids = [start_game() for _ in range(clients)]
+
+    results = await asyncio.gather(*(stay_silent(port, i) for i in game_session_ids))
+
+    # Every client must have been pinged, then timed out
+    endings: Counter = Counter(tuple(received) for received, _ in results)
+
+    return endings, max(elapsed for _, elapsed in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+
+    parser.add_argument("--clients", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--ping-seconds", type=int, default=1)
+    parser.add_argument("--idle-seconds", type=int, default=3)
+
+    args = parser.parse_args()
+
+    settings.websocket_ping_interval_seconds = args.ping_seconds
+
+    settings.websocket_idle_timeout_seconds = args.idle_seconds
+
+    # Dropped games are discarded on disconnect, so stored sessions return to 0 too
+    settings.websocket_resume_grace_seconds = 0
+
+    server, port = serve()
+
+    baseline = count_resources()
+
+    print(f"before   {baseline}")
+
+    for round_number in range(1, args.rounds + 1):
+        endings, slowest = asyncio.run(run_round(port, args.clients))
+
+        # Connections are closed by the server; give the handlers a moment to clean up
+        time.sleep(1)
+
+        print(f"round {round_number}  {count_resources()}  slowest close {slowest:.1f}s")
+
+        for messages, count in endings.items():
+            print(f"         {count} clients received {list(messages)}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
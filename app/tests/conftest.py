@@ -0,0 +1,95 @@
+# standard library
+import os
+
+import uuid
+
+# pytest
+import pytest
+
+# SQLAlchemy
+from sqlalchemy import create_engine, text
+
+from sqlalchemy.orm import Session
+
+# app core
+from app.db.base import Base
+
+from app.db.session import SessionLocal
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.enums import Period, SubmittableGameMode
+
+# Scratch PostgreSQL database for the tests that need one; its tables are dropped and recreated
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def database_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set.")
+
+    engine = create_engine(TEST_DATABASE_URL)
+
+    Base.metadata.drop_all(engine)
+
+    Base.metadata.create_all(engine)
+
+    yield engine
+
+    Base.metadata.drop_all(engine)
+
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database_engine):
+    """
+    A session on the test database; code that opens its own sessions is bound to it too.
+    """
+
+    bind = SessionLocal.kw["bind"]
+
+    SessionLocal.configure(bind=database_engine)
+
+    with Session(database_engine, autoflush=False) as session:
+        # Every leaderboard a game can count towards
+        session.add_all(
+            Leaderboard(mode=mode.value, period=period.value)
+            for mode in SubmittableGameMode
+            for period in Period
+        )
+
+        session.commit()
+
+        yield session
+
+    SessionLocal.configure(bind=bind)
+
+    with database_engine.begin() as connection:
+        tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+
+        connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture
+def user_id(db: Session) -> uuid.UUID:
+    """
+    A user with empty statistics for every mode whose results are recorded.
+    """
+
+    user = User(username=f"user-{uuid.uuid4()}", password="password")
+
+    db.add(user)
+
+    db.flush()
+
+    db.add_all(
+        Statistics(userID=user.userID, mode=mode.value) for mode in SubmittableGameMode
+    )
+
+    db.commit()
+
+    return user.userID
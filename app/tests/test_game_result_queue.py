@@ -0,0 +1,95 @@
+# standard library
+import uuid
+
+# SQLAlchemy
+from sqlalchemy import func, select
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.enums import GameMode
+
+# services
+from app.services.game.game_result_queue import GameResultQueue
+
+
+def queue_results(db, queue: GameResultQueue, user_id: uuid.UUID, results):
+    # Queue (won, guesses) results the way record_game_result does, then commit them
+    for won, guesses in results:
+        queue.append(db, user_id, GameMode.ORIGINAL, won, guesses)
+
+    db.commit()
+
+
+def get_wins(db, user_id: uuid.UUID) -> dict[str, int]:
+    rows = db.execute(
+        select(UserLeaderboard.period, UserLeaderboard.numberOfWins).where(
+            UserLeaderboard.userID == user_id
+        )
+    ).all()
+
+    return {period: wins for period, wins in rows}
+
+
+def get_statistics(db, user_id: uuid.UUID) -> Statistics:
+    db.expire_all()
+
+    return db.scalars(
+        select(Statistics).where(
+            Statistics.userID == user_id, Statistics.mode == GameMode.ORIGINAL.value
+        )
+    ).one()
+
+
+def test_queued_loss_leaves_leaderboards_unchanged(db, user_id):
+    queue = GameResultQueue(batch_size=100, flush_interval_seconds=1.0)
+
+    queue_results(db, queue, user_id, [(False, 6)])
+
+    assert queue.flush() == 1
+
+    assert get_wins(db, user_id) == {}
+
+    assert get_statistics(db, user_id).gamesPlayed == 1
+
+
+def test_queued_wins_count_towards_leaderboards(db, user_id):
+    queue = GameResultQueue(batch_size=100, flush_interval_seconds=1.0)
+
+    queue_results(db, queue, user_id, [(True, 1), (False, 6), (True, 3)])
+
+    assert queue.flush() == 3
+
+    assert set(get_wins(db, user_id).values()) == {2}
+
+
+def test_batches_are_applied_in_order_and_removed(db, user_id):
+    queue = GameResultQueue(batch_size=2, flush_interval_seconds=1.0)
+
+    # Win, win, loss, win: a current streak of 1 and a maximum streak of 2
+    queue_results(db, queue, user_id, [(True, 1), (True, 2), (False, 6), (True, 4)])
+
+    assert queue.flush() == 2
+
+    assert queue.flush() == 2
+
+    assert queue.flush() == 0
+
+    statistics = get_statistics(db, user_id)
+
+    assert (statistics.gamesPlayed, statistics.winCount) == (4, 3)
+
+    assert (statistics.currentStreak, statistics.maximumStreak) == (1, 2)
+
+    assert db.scalar(select(func.count()).select_from(QueuedGameResult)) == 0
+
+
+def test_only_queued_wins_count_towards_the_guess_distribution(db, user_id):
+    queue = GameResultQueue(batch_size=100, flush_interval_seconds=1.0)
+
+    queue_results(db, queue, user_id, [(True, 3), (False, 6), (False, 2)])
+
+    assert queue.flush() == 3
+
+    assert get_statistics(db, user_id).guessDistribution == [0, 0, 1, 0, 0, 0]
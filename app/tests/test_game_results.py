@@ -0,0 +1,89 @@
+# standard library
+import uuid
+
+# pytest
+import pytest
+
+# SQLAlchemy
+from sqlalchemy import select
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.enums import GameMode
+
+# services
+from app.services.game.game import record_game_result
+
+# exceptions
+from app.services.exceptions import DuplicateSession
+
+
+def get_wins(db, user_id: uuid.UUID) -> dict[str, int]:
+    rows = db.execute(
+        select(UserLeaderboard.period, UserLeaderboard.numberOfWins).where(
+            UserLeaderboard.userID == user_id
+        )
+    ).all()
+
+    return {period: wins for period, wins in rows}
+
+
+def record(db, user_id: uuid.UUID, won: bool, attempts: int, ws_game_session_id=None):
+    record_game_result(
+        db,
+        ws_game_session_id or uuid.uuid4(),
+        user_id,
+        GameMode.ORIGINAL,
+        uuid.uuid4(),
+        won,
+        attempts,
+        None,
+    )
+
+
+def test_win_counts_towards_every_leaderboard_period(db, user_id):
+    record(db, user_id, True, 2)
+
+    assert get_wins(db, user_id) == {
+        "daily": 1,
+        "weekly": 1,
+        "monthly": 1,
+        "all_time": 1,
+    }
+
+
+def test_loss_leaves_leaderboards_unchanged(db, user_id):
+    record(db, user_id, True, 2)
+
+    record(db, user_id, False, 6)
+
+    assert set(get_wins(db, user_id).values()) == {1}
+
+
+def test_second_result_for_a_session_is_a_duplicate(db, user_id):
+    ws_game_session_id = uuid.uuid4()
+
+    record(db, user_id, True, 3, ws_game_session_id)
+
+    with pytest.raises(DuplicateSession):
+        record(db, user_id, True, 3, ws_game_session_id)
+
+
+def test_only_wins_count_towards_the_guess_distribution(db, user_id):
+    record(db, user_id, True, 2)
+
+    record(db, user_id, False, 6)
+
+    db.expire_all()
+
+    statistics = db.scalars(
+        select(Statistics).where(
+            Statistics.userID == user_id, Statistics.mode == GameMode.ORIGINAL.value
+        )
+    ).one()
+
+    assert statistics.gamesPlayed == 2
+
+    assert statistics.guessDistribution == [0, 1, 0, 0, 0, 0]
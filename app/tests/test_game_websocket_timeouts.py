@@ -0,0 +1,106 @@
+# standard library
+import time
+
+import uuid
+
+# pytest
+import pytest
+
+# FastAPI
+from fastapi.testclient import TestClient
+
+# app
+from app.main import app
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+import app.api.v1.websockets.game as game_websocket
+
+import app.ws.session_manager as session_manager
+
+from app.ws.session import GameSession
+
+from app.ws.session_store import InMemorySessionStore
+
+
+@pytest.fixture
+def client(monkeypatch) -> tuple[TestClient, InMemorySessionStore]:
+    # Short timeouts, so silent clients are pinged and dropped within the test
+    store = InMemorySessionStore()
+
+    monkeypatch.setattr(game_websocket, "sessions", store)
+
+    monkeypatch.setattr(session_manager, "sessions", store)
+
+    monkeypatch.setattr(game_websocket.settings, "websocket_ping_interval_seconds", 0.2)
+
+    monkeypatch.setattr(game_websocket.settings, "websocket_idle_timeout_seconds", 0.5)
+
+    return TestClient(app), store
+
+
+def start(store: InMemorySessionStore, expires_in_seconds: int = 300) -> str:
+    game_session_id = str(uuid.uuid4())
+
+    session = GameSession.create(
+        answer="answer",
+        answer_song_id=uuid.uuid4(),
+        user_id=None,
+        mode=GameMode.ORIGINAL,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=5,
+    )
+
+    session.expires_at_epoch = int(time.time()) + expires_in_seconds
+
+    store.add(game_session_id, session)
+
+    return game_session_id
+
+
+def test_silent_client_is_pinged_then_timed_out(client):
+    test_client, store = client
+
+    with test_client.websocket_connect(f"/api/v1/ws/game/{start(store)}") as websocket:
+        started_at = time.monotonic()
+
+        assert websocket.receive_json() == {"type": "ping"}
+
+        assert websocket.receive_json() == {"type": "timeout"}
+
+        assert 0.5 <= time.monotonic() - started_at < 2
+
+
+def test_pong_keeps_client_connected(client):
+    test_client, store = client
+
+    with test_client.websocket_connect(f"/api/v1/ws/game/{start(store)}") as websocket:
+        started_at = time.monotonic()
+
+        # Answered pings keep the connection past the idle timeout
+        for _ in range(4):
+            assert websocket.receive_json() == {"type": "ping"}
+
+            websocket.send_json({"type": "pong"})
+
+        assert time.monotonic() - started_at > 0.5
+
+        websocket.send_json({"type": "guess", "guess": "wrong"})
+
+        assert websocket.receive_json()["attempts"] == 1
+
+
+def test_silent_client_is_told_when_session_expires(client, monkeypatch):
+    test_client, store = client
+
+    monkeypatch.setattr(game_websocket.settings, "websocket_ping_interval_seconds", 30)
+
+    monkeypatch.setattr(game_websocket.settings, "websocket_idle_timeout_seconds", 60)
+
+    game_session_id = start(store, expires_in_seconds=1)
+
+    with test_client.websocket_connect(f"/api/v1/ws/game/{game_session_id}") as websocket:
+        assert websocket.receive_json() == {"type": "expired"}
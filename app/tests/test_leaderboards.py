@@ -0,0 +1,64 @@
+# standard library
+import threading
+
+# SQLAlchemy
+from sqlalchemy import select
+
+from sqlalchemy.orm import Session
+
+# models
+from app.models import *
+
+# schemas
+from app.schemas.enums import GameMode
+
+# services
+from app.services.leaderboards.leaderboards_domain import (
+    get_leaderboard_periods,
+    update_leaderboards_after_game,
+)
+
+THREADS = 8
+
+WINS_PER_THREAD = 25
+
+
+def test_concurrent_wins_are_all_counted(db, database_engine, user_id):
+    # Every thread starts before any leaderboard row exists, so the first inserts collide too
+    barrier = threading.Barrier(THREADS)
+
+    errors: list[BaseException] = []
+
+    def win():
+        try:
+            with Session(database_engine) as session:
+                barrier.wait()
+
+                for _ in range(WINS_PER_THREAD):
+                    update_leaderboards_after_game(session, user_id, GameMode.ORIGINAL)
+
+                    session.commit()
+
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=win) for _ in range(THREADS)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+    rows = db.execute(
+        select(UserLeaderboard.period, UserLeaderboard.numberOfWins).where(
+            UserLeaderboard.userID == user_id
+        )
+    ).all()
+
+    assert dict(rows) == {
+        period.value: THREADS * WINS_PER_THREAD
+        for period in get_leaderboard_periods(GameMode.ORIGINAL)
+    }
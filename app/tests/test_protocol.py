@@ -0,0 +1,224 @@
+# standard library
+import asyncio
+
+import json
+
+import uuid
+
+# pytest
+import pytest
+
+# FastAPI
+from fastapi import WebSocketDisconnect
+
+from fastapi.testclient import TestClient
+
+# app
+from app.main import app
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+import app.api.v1.websockets.game as game_websocket
+
+import app.ws.session_manager as session_manager
+
+from app.ws.protocol import (
+    BINARY_SUBPROTOCOL,
+    DONE_FLAG,
+    GUESS_FRAME,
+    IS_CORRECT_FLAG,
+    PING_FRAME,
+    PONG,
+    PONG_FRAME,
+    RESULT_FRAME,
+    RESULT_HEADER,
+    binary_protocol,
+    json_protocol,
+    negotiate_protocol,
+)
+
+from app.ws.session import GameSession
+
+from app.ws.session_store import GuessOutcome, InMemorySessionStore
+
+
+class FakeWebSocket:
+    """
+    Replays received ASGI messages and collects what is sent.
+    """
+
+    def __init__(self, *received: dict, subprotocols: tuple[str, ...] = ()):
+        self.received = list(received)
+
+        self.sent: list[str | bytes] = []
+
+        self.scope = {"subprotocols": list(subprotocols)}
+
+    async def receive(self) -> dict:
+        return self.received.pop(0)
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+    async def send_bytes(self, data: bytes):
+        self.sent.append(data)
+
+    async def send_json(self, data: dict):
+        self.sent.append(json.dumps(data))
+
+
+def receive(protocol, message: dict):
+    return asyncio.run(protocol.receive(FakeWebSocket(message)))
+
+
+def binary(data: bytes) -> dict:
+    return {"type": "websocket.receive", "bytes": data}
+
+
+def text(data: str) -> dict:
+    return {"type": "websocket.receive", "text": data}
+
+
+def test_binary_frames_are_decoded():
+    assert receive(binary_protocol, binary(bytes([GUESS_FRAME]) + "Café".encode())) == "Café"
+
+    assert receive(binary_protocol, binary(bytes([PONG_FRAME]))) is PONG
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        binary(b""),
+        binary(bytes([GUESS_FRAME]) + b"\xff"),
+        binary(bytes([PONG_FRAME, 0])),
+        binary(bytes([0x7F])),
+        text('{"type": "guess", "guess": "song"}'),
+    ],
+)
+def test_malformed_binary_frames_are_rejected(message):
+    assert receive(binary_protocol, message) is None
+
+
+def test_binary_result_frame():
+    websocket = FakeWebSocket()
+
+    outcome = GuessOutcome(is_correct=True, attempts=3, done=True)
+
+    asyncio.run(binary_protocol.send_result(websocket, "Café", outcome))
+
+    frame = websocket.sent[0]
+
+    assert isinstance(frame, bytes)
+
+    assert RESULT_HEADER.unpack(frame[: RESULT_HEADER.size]) == (
+        RESULT_FRAME,
+        IS_CORRECT_FLAG | DONE_FLAG,
+        3,
+    )
+
+    assert frame[RESULT_HEADER.size :].decode() == "Café"
+
+
+def test_binary_result_frame_caps_attempts():
+    websocket = FakeWebSocket()
+
+    outcome = GuessOutcome(is_correct=False, attempts=1_000, done=False)
+
+    asyncio.run(binary_protocol.send_result(websocket, "", outcome))
+
+    assert websocket.sent == [RESULT_HEADER.pack(RESULT_FRAME, 0, 255)]
+
+
+def test_binary_ping_frame():
+    websocket = FakeWebSocket()
+
+    asyncio.run(binary_protocol.send_ping(websocket))
+
+    assert websocket.sent == [bytes([PING_FRAME])]
+
+
+def test_json_messages_are_decoded():
+    assert receive(json_protocol, text('{"type": "guess", "guess": "song"}')) == "song"
+
+    assert receive(json_protocol, text('{"type": "pong"}')) is PONG
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        text("not json"),
+        text('{"type": "guess"}'),
+        text('{"type": "unknown"}'),
+        binary(bytes([GUESS_FRAME]) + b"song"),
+    ],
+)
+def test_malformed_json_messages_are_rejected(message):
+    assert receive(json_protocol, message) is None
+
+
+def test_json_result_matches_send_json():
+    websocket = FakeWebSocket()
+
+    outcome = GuessOutcome(is_correct=False, attempts=2, done=False)
+
+    asyncio.run(json_protocol.send_result(websocket, "song", outcome))
+
+    assert json.loads(websocket.sent[0]) == {
+        "type": "result",
+        "guess": "song",
+        "is_correct": False,
+        "attempts": 2,
+        "done": False,
+    }
+
+
+def test_disconnect_is_raised():
+    with pytest.raises(WebSocketDisconnect):
+        receive(binary_protocol, {"type": "websocket.disconnect", "code": 1001})
+
+
+def test_protocol_is_negotiated_from_subprotocols():
+    assert negotiate_protocol(FakeWebSocket(subprotocols=[BINARY_SUBPROTOCOL])) is binary_protocol
+
+    assert negotiate_protocol(FakeWebSocket(subprotocols=["other"])) is json_protocol
+
+    assert negotiate_protocol(FakeWebSocket()) is json_protocol
+
+
+def test_binary_game_over_websocket(monkeypatch):
+    store = InMemorySessionStore()
+
+    monkeypatch.setattr(game_websocket, "sessions", store)
+
+    monkeypatch.setattr(session_manager, "sessions", store)
+
+    game_session_id = str(uuid.uuid4())
+
+    store.add(
+        game_session_id,
+        GameSession.create(
+            answer="answer",
+            answer_song_id=uuid.uuid4(),
+            user_id=None,
+            mode=GameMode.ORIGINAL,
+            date=None,
+            maximum_attempts=6,
+            expires_in_minutes=5,
+        ),
+    )
+
+    with TestClient(app).websocket_connect(
+        f"/api/v1/ws/game/{game_session_id}", subprotocols=[BINARY_SUBPROTOCOL]
+    ) as websocket:
+        assert websocket.accepted_subprotocol == BINARY_SUBPROTOCOL
+
+        websocket.send_bytes(bytes([GUESS_FRAME]) + b"wrong")
+
+        assert websocket.receive_bytes() == RESULT_HEADER.pack(RESULT_FRAME, 0, 1) + b"wrong"
+
+        # Malformed frames get a JSON error, like every message other than results and pings
+        websocket.send_bytes(b"")
+
+        assert websocket.receive_json() == {"error": "Invalid client message format."}
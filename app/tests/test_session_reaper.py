@@ -0,0 +1,139 @@
+# standard library
+import uuid
+
+# pytest
+import pytest
+
+# schemas
+from app.schemas.enums import GameMode
+
+# exceptions
+from app.services.exceptions import DatabasePersistenceFailed
+
+# websocket
+import app.ws.session_manager as session_manager
+
+from app.ws.session import GameSession
+
+from app.ws.session_store import InMemorySessionStore
+
+NOW = 1_000_000
+
+LIFETIME_SECONDS = 300
+
+GRACE_SECONDS = 60
+
+
+class FakeDatabaseSession:
+    def rollback(self):
+        pass
+
+
+def make_session(attempts: int = 0, done: bool = False) -> GameSession:
+    return GameSession(
+        answer="answer",
+        answer_song_id_int=1,
+        user_id_int=2,
+        mode=GameMode.DAILY,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=5,
+        expires_at_epoch=NOW + LIFETIME_SECONDS,
+        attempts=attempts,
+        done=done,
+    )
+
+
+@pytest.fixture
+def recorded(monkeypatch) -> list[tuple[str, bool, int]]:
+    # Record saved results instead of writing them to the database
+    saved: list[tuple[str, bool, int]] = []
+
+    def save_game_result(db, game_session_id, session, won, attempts):
+        saved.append((game_session_id, won, attempts))
+
+        return True
+
+    monkeypatch.setattr(session_manager, "save_game_result", save_game_result)
+
+    return saved
+
+
+def reap_and_save(store: InMemorySessionStore, now: int) -> list:
+    return session_manager.save_evicted_game_results(None, store.reap(now), now)
+
+
+def test_played_game_that_expires_is_recorded_as_lost(recorded):
+    store = InMemorySessionStore()
+
+    game_session_id = str(uuid.uuid4())
+
+    store.add(game_session_id, make_session(attempts=2))
+
+    assert reap_and_save(store, NOW + LIFETIME_SECONDS) == []
+
+    assert recorded == [(game_session_id, False, 2)]
+
+
+def test_game_that_never_connected_is_not_recorded(recorded):
+    store = InMemorySessionStore()
+
+    store.add(str(uuid.uuid4()), make_session())
+
+    assert reap_and_save(store, NOW + LIFETIME_SECONDS) == []
+
+    assert recorded == []
+
+
+def test_game_abandoned_past_grace_period_is_not_recorded(recorded):
+    store = InMemorySessionStore()
+
+    game_session_id = str(uuid.uuid4())
+
+    store.add(game_session_id, make_session(attempts=3))
+
+    # Dropped by the idle timeout and never resumed, long before the session expires
+    store.park(game_session_id, NOW + GRACE_SECONDS)
+
+    assert reap_and_save(store, NOW + GRACE_SECONDS) == []
+
+    assert recorded == []
+
+    assert game_session_id not in store
+
+
+def test_finished_game_left_for_retry_is_recorded_as_it_ended(recorded):
+    store = InMemorySessionStore()
+
+    game_session_id = str(uuid.uuid4())
+
+    store.add(game_session_id, make_session())
+
+    for guess in ("wrong", "answer"):
+        store.record_guess(game_session_id, guess)
+
+    # The handler failed to save the result and handed the game to the reaper
+    store.park(game_session_id, NOW)
+
+    assert reap_and_save(store, NOW) == []
+
+    assert recorded == [(game_session_id, True, 2)]
+
+
+def test_result_that_fails_to_persist_is_returned_for_retry(monkeypatch):
+    def save_game_result(db, game_session_id, session, won, attempts):
+        raise DatabasePersistenceFailed()
+
+    monkeypatch.setattr(session_manager, "save_game_result", save_game_result)
+
+    store = InMemorySessionStore()
+
+    game_session_id = str(uuid.uuid4())
+
+    store.add(game_session_id, make_session(attempts=1))
+
+    failed = session_manager.save_evicted_game_results(
+        FakeDatabaseSession(), store.reap(NOW + LIFETIME_SECONDS), NOW + LIFETIME_SECONDS
+    )
+
+    assert [failed_id for failed_id, _ in failed] == [game_session_id]
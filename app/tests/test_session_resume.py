@@ -0,0 +1,207 @@
+# standard library
+import time
+
+import uuid
+
+# pytest
+import pytest
+
+# FastAPI
+from fastapi.testclient import TestClient
+
+# app
+from app.main import app
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+import app.api.v1.websockets.game as game_websocket
+
+import app.ws.session_manager as session_manager
+
+from app.ws.session import GameSession
+
+from app.ws.session_store import (
+    InMemorySessionStore,
+    RedisSessionStore,
+    SessionStore,
+    TokenSessionStore,
+)
+
+from app.ws.session_tokens import SessionTokenCodec, resume_token_signer
+
+GRACE_SECONDS = 60
+
+
+def make_session() -> GameSession:
+    return GameSession.create(
+        answer="answer",
+        answer_song_id=uuid.uuid4(),
+        user_id=None,
+        mode=GameMode.ORIGINAL,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=5,
+    )
+
+
+def start(store: SessionStore) -> str:
+    # Store a new session the way create_ws_game_session does
+    if store.issues_ids:
+        return store.issue(make_session())
+
+    game_session_id = str(uuid.uuid4())
+
+    store.add(game_session_id, make_session())
+
+    return game_session_id
+
+
+def make_redis_store() -> RedisSessionStore:
+    fakeredis = pytest.importorskip("fakeredis")
+
+    return RedisSessionStore(fakeredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture(params=["memory", "redis", "token+memory"])
+def store(request) -> SessionStore:
+    if request.param == "memory":
+        return InMemorySessionStore()
+
+    if request.param == "redis":
+        return make_redis_store()
+
+    return TokenSessionStore(SessionTokenCodec("test-secret"), InMemorySessionStore())
+
+
+def test_parked_game_refuses_guesses_until_resumed(store):
+    game_session_id = start(store)
+
+    store.record_guess(game_session_id, "wrong")
+
+    store.park(game_session_id, int(time.time()) + GRACE_SECONDS)
+
+    assert store.record_guess(game_session_id, "answer") is None
+
+    resumed = store.resume(game_session_id)
+
+    assert resumed is not None and resumed.attempts == 1
+
+    outcome = store.record_guess(game_session_id, "answer")
+
+    assert outcome is not None and outcome.is_correct and outcome.attempts == 2
+
+
+def test_resume_after_grace_period_is_refused(store):
+    game_session_id = start(store)
+
+    store.park(game_session_id, int(time.time()) - 1)
+
+    assert store.resume(game_session_id) is None
+
+
+def test_parking_again_does_not_extend_grace_period(store):
+    game_session_id = start(store)
+
+    now = int(time.time())
+
+    store.park(game_session_id, now + 5)
+
+    store.park(game_session_id, now + GRACE_SECONDS)
+
+    evicted = store.reap(now + 5)
+
+    assert len(evicted) == 1
+
+
+def test_token_session_is_checked_without_store_lookup():
+    class CountingStore(InMemorySessionStore):
+        gets = 0
+
+        def get(self, game_session_id):
+            self.gets += 1
+
+            return super().get(game_session_id)
+
+    counters = CountingStore()
+
+    store = TokenSessionStore(SessionTokenCodec("test-secret"), counters)
+
+    token = store.issue(make_session())
+
+    assert store.get(token) is not None
+
+    assert counters.gets == 0
+
+
+@pytest.fixture
+def client(monkeypatch) -> tuple[TestClient, InMemorySessionStore]:
+    # The lifespan is not run, so no database or background worker is needed
+    store = InMemorySessionStore()
+
+    monkeypatch.setattr(game_websocket, "sessions", store)
+
+    monkeypatch.setattr(session_manager, "sessions", store)
+
+    return TestClient(app), store
+
+
+def wait_until_parked(store: InMemorySessionStore, game_session_id: str):
+    # The handler parks the game once it has seen the disconnect
+    deadline = time.monotonic() + 5
+
+    while not store.get(game_session_id).parked_until:
+        assert time.monotonic() < deadline, "The game was not parked."
+
+        time.sleep(0.01)
+
+
+def test_resume_handshake(client):
+    test_client, store = client
+
+    game_session_id = start(store)
+
+    url = f"/api/v1/ws/game/{game_session_id}"
+
+    with test_client.websocket_connect(url) as websocket:
+        websocket.send_json({"type": "guess", "guess": "wrong"})
+
+        assert websocket.receive_json()["attempts"] == 1
+
+    wait_until_parked(store, game_session_id)
+
+    # Without the resume token, or with a wrong one, the parked game is refused
+    for query in ("", "?resume=forged"):
+        with test_client.websocket_connect(url + query) as websocket:
+            assert websocket.receive_json() == {"error": "Invalid session."}
+
+    resume_token = resume_token_signer.sign(game_session_id)
+
+    with test_client.websocket_connect(f"{url}?resume={resume_token}") as websocket:
+        assert websocket.receive_json() == {"type": "resumed", "attempts": 1}
+
+        websocket.send_json({"type": "guess", "guess": "wrong"})
+
+        assert websocket.receive_json()["attempts"] == 2
+
+
+def test_dropped_game_is_discarded_without_grace_period(client, monkeypatch):
+    test_client, store = client
+
+    monkeypatch.setattr(game_websocket.settings, "websocket_resume_grace_seconds", 0)
+
+    game_session_id = start(store)
+
+    with test_client.websocket_connect(f"/api/v1/ws/game/{game_session_id}") as websocket:
+        websocket.send_json({"type": "guess", "guess": "wrong"})
+
+        assert websocket.receive_json()["attempts"] == 1
+
+    # The handler removes the game once it has seen the disconnect
+    deadline = time.monotonic() + 5
+
+    while store.get(game_session_id) is not None:
+        assert time.monotonic() < deadline, "The game was not discarded."
+
+        time.sleep(0.01)
@@ -0,0 +1,190 @@
+# standard library
+import os
+
+import time
+
+import uuid
+
+from datetime import date as DateType
+
+# pytest
+import pytest
+
+# schemas
+from app.schemas.enums import GameMode
+
+# exceptions
+from app.services.exceptions import InvalidSessionSnapshot
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_snapshot import (
+    SNAPSHOT_HEADER,
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_RECORD,
+    SNAPSHOT_VERSION,
+    read_snapshot,
+    write_snapshot,
+)
+
+from app.ws.session_store import (
+    InMemorySessionStore,
+    restore_sessions,
+    snapshot_sessions,
+)
+
+
+def make_session(answer: str = "answer", **changes) -> GameSession:
+    session = GameSession.create(
+        answer=answer,
+        answer_song_id=uuid.uuid4(),
+        user_id=None,
+        mode=GameMode.ORIGINAL,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=5,
+    )
+
+    for name, value in changes.items():
+        setattr(session, name, value)
+
+    return session
+
+
+def test_sessions_round_trip(tmp_path):
+    path = str(tmp_path / "sessions.bin")
+
+    now = int(time.time())
+
+    sessions = [
+        (uuid.uuid4().int, make_session()),
+        (
+            uuid.uuid4().int,
+            make_session(
+                "daily answer",
+                user_id_int=uuid.uuid4().int,
+                mode=GameMode.DAILY,
+                date=DateType(2024, 5, 1),
+                attempts=3,
+            ),
+        ),
+        (uuid.uuid4().int, make_session(attempts=2, done=True, won=True)),
+        (uuid.uuid4().int, make_session(attempts=6, done=True, parked_until=now + 60)),
+        ((1 << 128) - 1, make_session("Café", mode=GameMode.LYRICS)),
+    ]
+
+    assert write_snapshot(path, sessions) == len(sessions)
+
+    assert list(read_snapshot(path)) == sessions
+
+
+def test_shared_strings_are_written_once(tmp_path):
+    path = str(tmp_path / "sessions.bin")
+
+    sessions = [(i, make_session(f"answer {i % 3}")) for i in range(100)]
+
+    write_snapshot(path, sessions)
+
+    with open(path, "rb") as file:
+        _, _, string_count, count = SNAPSHOT_HEADER.unpack(file.read(SNAPSHOT_HEADER.size))
+
+    # Three answers and one mode
+    assert (string_count, count) == (4, 100)
+
+    restored = [session for _, session in read_snapshot(path)]
+
+    assert restored[0].answer is restored[3].answer
+
+
+def test_more_strings_than_a_16_bit_index_round_trip(tmp_path):
+    path = str(tmp_path / "sessions.bin")
+
+    # Token sessions carry a distinct answer digest each
+    sessions = [(i, make_session(uuid.uuid4().hex)) for i in range(70_000)]
+
+    write_snapshot(path, sessions)
+
+    assert list(read_snapshot(path))[-1] == sessions[-1]
+
+
+def write_header(path: str, magic: bytes, version: int):
+    with open(path, "wb") as file:
+        file.write(SNAPSHOT_HEADER.pack(magic, version, 0, 0))
+
+
+@pytest.mark.parametrize(
+    "magic, version", [(SNAPSHOT_MAGIC, SNAPSHOT_VERSION - 1), (b"NOPE", SNAPSHOT_VERSION)]
+)
+def test_unsupported_snapshot_is_rejected(tmp_path, magic, version):
+    path = str(tmp_path / "sessions.bin")
+
+    write_header(path, magic, version)
+
+    with pytest.raises(InvalidSessionSnapshot):
+        list(read_snapshot(path))
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    path = str(tmp_path / "sessions.bin")
+
+    write_snapshot(path, [(1, make_session()), (2, make_session())])
+
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - SNAPSHOT_RECORD.size // 2)
+
+    with pytest.raises(InvalidSessionSnapshot):
+        list(read_snapshot(path))
+
+
+def test_restore_skips_expired_sessions_and_renews_grace_periods(tmp_path, monkeypatch):
+    path = str(tmp_path / "sessions.bin")
+
+    now = int(time.time())
+
+    game_session_ids = [str(uuid.uuid4()) for _ in range(3)]
+
+    store = InMemorySessionStore()
+
+    store.add(game_session_ids[0], make_session(attempts=1))
+
+    store.add(game_session_ids[1], make_session(attempts=2, parked_until=now + 1))
+
+    store.add(game_session_ids[2], make_session(expires_at_epoch=now - 1))
+
+    assert snapshot_sessions(store, path) == 3
+
+    restored = InMemorySessionStore()
+
+    monkeypatch.setattr(
+        "app.ws.session_store.settings.websocket_resume_grace_seconds", 60
+    )
+
+    assert restore_sessions(restored, path) == 2
+
+    # The snapshot is only ever loaded once
+    assert not os.path.exists(path)
+
+    assert restored.get(game_session_ids[0]).attempts == 1
+
+    assert restored.get(game_session_ids[1]).parked_until >= now + 60
+
+    assert restored.get(game_session_ids[2]) is None
+
+
+def test_invalid_snapshot_is_deleted(tmp_path):
+    path = str(tmp_path / "sessions.bin")
+
+    write_header(path, SNAPSHOT_MAGIC, SNAPSHOT_VERSION - 1)
+
+    assert restore_sessions(InMemorySessionStore(), path) == 0
+
+    assert not os.path.exists(path)
+
+
+def test_unwritable_snapshot_is_given_up(tmp_path):
+    store = InMemorySessionStore()
+
+    store.add(str(uuid.uuid4()), make_session())
+
+    assert snapshot_sessions(store, str(tmp_path / "missing" / "sessions.bin")) == 0
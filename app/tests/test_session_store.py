@@ -0,0 +1,27 @@
+# standard library
+import time
+
+# pytest
+import pytest
+
+# websocket
+from app.ws.session_store import InMemorySessionStore
+
+
+@pytest.mark.parametrize("game_session_id", ["", "not-a-uuid", "1234"])
+def test_ids_that_are_not_uuids_are_unknown(game_session_id):
+    store = InMemorySessionStore()
+
+    assert game_session_id not in store
+
+    assert store.get(game_session_id) is None
+
+    assert store.record_guess(game_session_id, "answer") is None
+
+    store.park(game_session_id, int(time.time()) + 60)
+
+    assert store.resume(game_session_id) is None
+
+    store.remove(game_session_id)
+
+    assert len(store) == 0 and store.parks == 0
@@ -0,0 +1,128 @@
+# standard library
+import gc
+
+import os
+
+import tracemalloc
+
+import uuid
+
+# pytest
+import pytest
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_store import MAXIMUM_STALE_DEADLINES, InMemorySessionStore
+
+# Total starts of the soak; raise it to soak for longer, e.g. SESSION_SOAK_STARTS=5000000
+SOAK_STARTS = int(os.environ.get("SESSION_SOAK_STARTS", 100_000))
+
+# Starts per simulated second
+STARTS_PER_SECOND = 1_000
+
+# Seconds a session lives before it expires
+LIFETIME_SECONDS = 10
+
+# Seconds a connected game lasts before its client finishes it
+GAME_SECONDS = 3
+
+# Seconds a dropped game waits to be resumed
+GRACE_SECONDS = 2
+
+# Simulated seconds before the store reaches its steady size
+WARM_UP_SECONDS = 2 * LIFETIME_SECONDS
+
+# Allowed growth of traced memory between the start and the end of the steady state
+MEMORY_TOLERANCE = 1.1
+
+
+def make_session(now: int) -> GameSession:
+    return GameSession(
+        answer="answer",
+        answer_song_id_int=1,
+        user_id_int=None,
+        mode=GameMode.ORIGINAL,
+        date=None,
+        maximum_attempts=6,
+        expires_in_minutes=1,
+        expires_at_epoch=now + LIFETIME_SECONDS,
+    )
+
+
+@pytest.mark.skipif(
+    SOAK_STARTS < STARTS_PER_SECOND * WARM_UP_SECONDS * 4, reason="Soak too short."
+)
+def test_memory_stays_flat_under_sustained_starts():
+    """
+    Most starts are never connected, some are played and removed, and some are dropped and abandoned.
+    """
+
+    store = InMemorySessionStore()
+
+    now = 1_000_000
+
+    seconds = SOAK_STARTS // STARTS_PER_SECOND
+
+    # { key: simulated second, value: sessions whose client finishes or drops then }
+    finishing: dict[int, list[str]] = {}
+    dropping: dict[int, list[str]] = {}
+
+    # Traced memory at the end of each steady second
+    steady_memory: list[int] = []
+
+    gc.collect()
+
+    tracemalloc.start()
+
+    try:
+        for second in range(seconds):
+            now += 1
+
+            for start in range(STARTS_PER_SECOND):
+                game_session_id = str(uuid.uuid4())
+
+                store.add(game_session_id, make_session(now))
+
+                # One start in ten is played to the end, one in twenty is dropped, the rest never connect
+                if start % 10 == 0:
+                    finishing.setdefault(now + GAME_SECONDS, []).append(game_session_id)
+
+                elif start % 20 == 1:
+                    dropping.setdefault(now + GAME_SECONDS, []).append(game_session_id)
+
+            for game_session_id in finishing.pop(now, []):
+                store.remove(game_session_id)
+
+            for game_session_id in dropping.pop(now, []):
+                store.park(game_session_id, now + GRACE_SECONDS)
+
+            store.reap(now)
+
+            # Live sessions never outnumber the starts of one session lifetime
+            assert len(store) <= STARTS_PER_SECOND * LIFETIME_SECONDS
+
+            # Deadlines of removed and parked sessions are dropped, not accumulated
+            assert (
+                len(store._deadlines)
+                <= 2 * len(store) + STARTS_PER_SECOND + MAXIMUM_STALE_DEADLINES
+            )
+
+            if second >= WARM_UP_SECONDS:
+                steady_memory.append(tracemalloc.get_traced_memory()[0])
+
+    finally:
+        tracemalloc.stop()
+
+    # Every start ended up removed or evicted, apart from those still within their lifetime
+    assert store.evictions >= SOAK_STARTS * 0.8
+
+    assert store.parks > 0
+
+    # Compare the highest memory of the first and last stretches of the steady state
+    window = LIFETIME_SECONDS * 2
+
+    assert max(steady_memory[-window:]) <= max(steady_memory[:window]) * MEMORY_TOLERANCE
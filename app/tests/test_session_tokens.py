@@ -0,0 +1,134 @@
+# standard library
+import uuid
+
+from datetime import date as DateType
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_tokens import (
+    CLAIMS_FORMAT,
+    SIGNATURE_SIZE,
+    ResumeTokenSigner,
+    SessionTokenCodec,
+    get_token_nonce,
+)
+
+codec = SessionTokenCodec("test-secret")
+
+
+def make_session(**changes) -> GameSession:
+    session = GameSession.create(
+        answer="Answer",
+        answer_song_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        mode=GameMode.ARCHIVE,
+        date=DateType(2024, 5, 1),
+        maximum_attempts=6,
+        expires_in_minutes=5,
+    )
+
+    for name, value in changes.items():
+        setattr(session, name, value)
+
+    return session
+
+
+def test_claims_round_trip():
+    session = make_session()
+
+    claims = codec.decode(codec.encode(session))
+
+    assert claims is not None
+
+    assert claims.answer_song_id == session.answer_song_id
+
+    assert claims.user_id == session.user_id
+
+    assert claims.mode == GameMode.ARCHIVE
+
+    assert claims.date == DateType(2024, 5, 1)
+
+    assert claims.maximum_attempts == 6
+
+    assert claims.expires_at == session.expires_at_epoch
+
+    # The answer is only carried as a digest, which a correct guess reproduces
+    assert "answer" not in claims.answer_digest
+
+    assert codec.digest_answer(claims, "answer") == claims.answer_digest
+
+
+def test_guest_session_without_date_round_trips():
+    claims = codec.decode(codec.encode(make_session(user_id_int=None, date=None)))
+
+    assert claims is not None and claims.user_id is None and claims.date is None
+
+
+def test_token_size():
+    token = codec.encode(make_session())
+
+    assert CLAIMS_FORMAT.size + SIGNATURE_SIZE == 93
+
+    assert len(token) == 124
+
+    assert set(token) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def test_every_tampered_character_is_rejected():
+    token = codec.encode(make_session())
+
+    for position in range(len(token)):
+        replacement = "A" if token[position] != "A" else "B"
+
+        tampered = token[:position] + replacement + token[position + 1 :]
+
+        assert codec.decode(tampered) is None, position
+
+
+def test_malformed_tokens_are_rejected():
+    token = codec.encode(make_session())
+
+    for value in ("", "not a token", token[:-4], token + "AAAA", str(uuid.uuid4())):
+        assert codec.decode(value) is None
+
+
+def test_token_of_another_secret_is_rejected():
+    token = SessionTokenCodec("other-secret").encode(make_session())
+
+    assert codec.decode(token) is None
+
+
+def test_expired_token_is_rejected():
+    session = make_session()
+
+    session.expires_at_epoch -= 5 * 60
+
+    assert codec.decode(codec.encode(session)) is None
+
+
+def test_token_nonce_is_read_without_verifying():
+    token = codec.encode(make_session())
+
+    claims = codec.decode(token)
+
+    assert claims is not None and get_token_nonce(token) == claims.nonce
+
+    assert get_token_nonce(str(uuid.uuid4())) is None
+
+
+def test_resume_token_is_bound_to_session_and_secret():
+    signer = ResumeTokenSigner("test-secret")
+
+    resume_token = signer.sign("session")
+
+    assert signer.verify("session", resume_token)
+
+    assert not signer.verify("other-session", resume_token)
+
+    assert not ResumeTokenSigner("other-secret").verify("session", resume_token)
+
+    assert not signer.verify("session", "ä")
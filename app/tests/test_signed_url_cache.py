@@ -0,0 +1,171 @@
+# standard library
+import itertools
+
+# pytest
+import pytest
+
+# services
+from app.services.audio.signed_url_cache import SignedUrlCache
+
+from app.services.audio.storage import AudioStorage
+
+BUCKET_SECONDS = 300
+
+EXPIRES_IN_SECONDS = 600
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeAudioStorage(AudioStorage):
+    """
+    Storage client that signs locally and records every signing request.
+    """
+
+    def __init__(self):
+        self.requests: list[tuple[str, int]] = []
+
+        self.failing = False
+
+        self._counter = itertools.count()
+
+    def create_signed_url(self, audio_link: str, expires_in_seconds: int) -> str:
+        self.requests.append((audio_link, expires_in_seconds))
+
+        if self.failing:
+            raise ConnectionError("Storage is unreachable.")
+
+        return f"https://storage.test/{audio_link}?token={next(self._counter)}"
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    # Start at the beginning of a bucket
+    return FakeClock(10_000 * BUCKET_SECONDS)
+
+
+@pytest.fixture
+def storage() -> FakeAudioStorage:
+    return FakeAudioStorage()
+
+
+@pytest.fixture
+def cache(storage: FakeAudioStorage, clock: FakeClock) -> SignedUrlCache:
+    return SignedUrlCache(
+        storage.create_signed_url, BUCKET_SECONDS, maximum_entries=100, timer=clock
+    )
+
+
+def test_reuses_url_within_bucket(cache, storage, clock):
+    first = cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    clock.now += BUCKET_SECONDS - 1
+
+    second = cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    assert first == second
+
+    # Signed once, for the requested window plus one bucket
+    assert storage.requests == [("song.mp3", EXPIRES_IN_SECONDS + BUCKET_SECONDS)]
+
+    assert cache.get_metrics() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_signs_each_audio_link_separately(cache, storage):
+    first = cache.get("first.mp3", EXPIRES_IN_SECONDS)
+
+    second = cache.get("second.mp3", EXPIRES_IN_SECONDS)
+
+    assert first != second
+
+    assert len(storage.requests) == 2
+
+
+def test_resigns_once_bucket_has_passed(cache, storage, clock):
+    first = cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    clock.now += BUCKET_SECONDS
+
+    second = cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    assert first != second
+
+    assert len(storage.requests) == 2
+
+
+def test_resigns_after_previous_url_has_expired(cache, storage, clock):
+    cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    clock.now += EXPIRES_IN_SECONDS + BUCKET_SECONDS
+
+    cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    assert len(storage.requests) == 2
+
+    # The expired entry was dropped rather than kept alongside the new one
+    assert cache.get_metrics()["size"] == 1
+
+
+def test_handed_out_urls_outlive_requested_window(cache, storage, clock):
+    # { key: URL, value: time at which it stops working }
+    expires_at: dict[str, float] = {}
+
+    for _ in range(BUCKET_SECONDS):
+        signed = len(storage.requests)
+
+        url = cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+        if len(storage.requests) > signed:
+            _, lifetime = storage.requests[-1]
+
+            expires_at[url] = clock.now + lifetime
+
+        # The URL handed out now still works for the whole game
+        assert expires_at[url] - clock.now >= EXPIRES_IN_SECONDS
+
+        clock.now += 7
+
+    # Reused across requests rather than signed every time
+    assert len(storage.requests) < BUCKET_SECONDS / 10
+
+
+def test_resigns_when_cached_url_is_too_short_for_window(cache, storage):
+    cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    # A longer game than the URL was signed for cannot reuse it
+    cache.get("song.mp3", EXPIRES_IN_SECONDS + 2 * BUCKET_SECONDS)
+
+    assert len(storage.requests) == 2
+
+
+def test_signing_error_is_raised_and_not_cached(cache, storage):
+    storage.failing = True
+
+    with pytest.raises(ConnectionError):
+        cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    assert cache.get_metrics() == {"size": 0, "hits": 0, "misses": 1}
+
+    # The next request signs again once storage recovers
+    storage.failing = False
+
+    url = cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    assert url.startswith("https://storage.test/song.mp3")
+
+    assert len(storage.requests) == 2
+
+
+def test_clear_forces_resign(cache, storage):
+    cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    cache.clear()
+
+    cache.get("song.mp3", EXPIRES_IN_SECONDS)
+
+    assert len(storage.requests) == 2
@@ -34,3 +34,45 @@ def calculate_minutes_to_seconds(minutes: int) -> int:
     """
 
     return minutes * 60
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check whether an If-None-Match header value matches an entity tag.
+    """
+
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+
+        # Weak comparison: W/"x" matches "x"
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+
+    return False
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Check whether an Accept-Encoding header value allows a gzip-encoded response.
+    """
+
+    if not accept_encoding:
+        return False
+
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.strip().partition(";")
+
+        if name.strip().lower() == "gzip":
+            quality = parameters.strip().removeprefix("q=")
+
+            # gzip;q=0 explicitly refuses the encoding
+            try:
+                return not quality or float(quality) > 0
+
+            except ValueError:
+                return False
+
+    return False
@@ -1,5 +1,9 @@
+from typing import Any, Optional
+
 from fastapi import WebSocket
 
+from starlette.websockets import WebSocketState
+
 from app.schemas.game import ServerCheck
 
 from app.schemas.song import SongMetadata
@@ -9,21 +13,25 @@ class ConnectionManager:
     def __init__(self):
         self.connections: dict[str, WebSocket] = {}
 
-    async def connect(self, game_session_id: str, websocket: WebSocket):
-        await websocket.accept()
+    async def connect(
+        self,
+        game_session_id: str,
+        websocket: WebSocket,
+        subprotocol: Optional[str] = None,
+    ):
+        await websocket.accept(subprotocol=subprotocol)
 
         self.connections[game_session_id] = websocket
 
     async def disconnect(self, game_session_id: str):
-        ws = self.connections.get(game_session_id)
+        ws = self.connections.pop(game_session_id, None)
 
-        if ws:
+        # Closing a socket the client already closed would raise
+        if ws and ws.client_state != WebSocketState.DISCONNECTED:
             await ws.close()
 
-        self.connections.pop(game_session_id, None)
-
     async def send(
-        self, game_session_id: str, message: ServerCheck | SongMetadata | dict[str, str]
+        self, game_session_id: str, message: ServerCheck | SongMetadata | dict[str, Any]
     ):
         ws = self.connections.get(game_session_id)
 
@@ -0,0 +1,177 @@
+# standard library
+import struct
+
+from typing import Optional, Union
+
+# FastAPI
+from fastapi import WebSocket, WebSocketDisconnect
+
+# schemas
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas.game import ClientMessage, ClientPong, ServerCheck
+
+# websocket
+from app.ws.session_store import GuessOutcome
+
+BINARY_SUBPROTOCOL = "heaaardle.binary.v1"
+
+# Binary frame types
+GUESS_FRAME = 0x01
+PONG_FRAME = 0x02
+RESULT_FRAME = 0x11
+PING_FRAME = 0x12
+
+# Result frame: frame type, flags, attempts, followed by the UTF-8 guess
+RESULT_HEADER = struct.Struct(">BBB")
+
+IS_CORRECT_FLAG = 0b01
+DONE_FLAG = 0b10
+
+# Received pongs, shared since they carry no data
+PONG = ClientPong(type="pong")
+
+
+class GameProtocol:
+    """
+    Wire format of the per-guess messages of a WebSocket game.
+
+    Covers guesses, pongs, results and pings; every other message is a JSON
+    text frame whichever protocol is in use.
+    """
+
+    # Subprotocol accepted during the handshake; None for the default
+    subprotocol: Optional[str] = None
+
+    async def receive(self, websocket: WebSocket) -> Optional[Union[str, ClientPong]]:
+        # Wait for a client message: the guess, a pong, or None if it is malformed
+        raise NotImplementedError
+
+    async def send_result(
+        self, websocket: WebSocket, guess: str, outcome: GuessOutcome
+    ):
+        # Send the outcome of a guess
+        raise NotImplementedError
+
+    async def send_ping(self, websocket: WebSocket):
+        # Ask an idle client to answer with a pong
+        raise NotImplementedError
+
+
+class JsonGameProtocol(GameProtocol):
+    """
+    The default protocol: JSON text frames validated against ClientMessage.
+    """
+
+    def __init__(self):
+        self._client_message_adapter = TypeAdapter(ClientMessage)
+
+    async def receive(self, websocket: WebSocket) -> Optional[Union[str, ClientPong]]:
+        text = await _receive_frame(websocket, "text")
+
+        if text is None:
+            return None
+
+        # Parse and validate in one pass
+        try:
+            message = self._client_message_adapter.validate_json(text)
+
+        except ValidationError:
+            return None
+
+        return PONG if isinstance(message, ClientPong) else message.guess
+
+    async def send_result(
+        self, websocket: WebSocket, guess: str, outcome: GuessOutcome
+    ):
+        result = ServerCheck(
+            type="result",
+            guess=guess,
+            is_correct=outcome.is_correct,
+            attempts=outcome.attempts,
+            done=outcome.done,
+        )
+
+        # Serialized by the compiled schema; same text as send_json would produce
+        await websocket.send_text(result.model_dump_json())
+
+    async def send_ping(self, websocket: WebSocket):
+        await websocket.send_json({"type": "ping"})
+
+
+class BinaryGameProtocol(GameProtocol):
+    """
+    Fixed binary frames for clients that negotiate the binary subprotocol.
+
+    A guess is one type byte followed by the UTF-8 guess; a result is a
+    three-byte header followed by the echoed guess.
+    """
+
+    subprotocol = BINARY_SUBPROTOCOL
+
+    PING = bytes([PING_FRAME])
+
+    async def receive(self, websocket: WebSocket) -> Optional[Union[str, ClientPong]]:
+        frame = await _receive_frame(websocket, "bytes")
+
+        # Text frames and empty frames are not valid binary messages
+        if not isinstance(frame, bytes) or not frame:
+            return None
+
+        # The frame layout already guarantees the message shape, so no model is built
+        if frame[0] == GUESS_FRAME:
+            try:
+                return frame[1:].decode()
+
+            except UnicodeDecodeError:
+                return None
+
+        if frame[0] == PONG_FRAME and len(frame) == 1:
+            return PONG
+
+        return None
+
+    async def send_result(
+        self, websocket: WebSocket, guess: str, outcome: GuessOutcome
+    ):
+        flags = (IS_CORRECT_FLAG if outcome.is_correct else 0) | (
+            DONE_FLAG if outcome.done else 0
+        )
+
+        header = RESULT_HEADER.pack(RESULT_FRAME, flags, min(outcome.attempts, 255))
+
+        await websocket.send_bytes(header + guess.encode())
+
+    async def send_ping(self, websocket: WebSocket):
+        await websocket.send_bytes(self.PING)
+
+
+async def _receive_frame(
+    websocket: WebSocket, kind: str
+) -> Optional[Union[str, bytes]]:
+    # Receive one frame; None if it is not of the expected kind
+    message = await websocket.receive()
+
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    return message.get(kind)
+
+
+json_protocol = JsonGameProtocol()
+
+binary_protocol = BinaryGameProtocol()
+
+
+def negotiate_protocol(websocket: WebSocket) -> GameProtocol:
+    """
+    Pick the protocol for a connection from the subprotocols the client offered.
+
+    Returns:
+        The binary protocol if the client offered it, otherwise JSON.
+    """
+
+    if BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+        return binary_protocol
+
+    return json_protocol
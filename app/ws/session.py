@@ -1,9 +1,15 @@
 # standard library
+import sys
+
+import time
+
 import uuid
 
 from datetime import date as DateType, datetime, timedelta, timezone
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+from functools import lru_cache
 
 from typing import Optional
 
@@ -11,12 +17,21 @@ from typing import Optional
 from app.schemas.enums import GameMode
 
 
-@dataclass
+@dataclass(slots=True)
 class GameSession:
+    """
+    State of a WebSocket game session.
+
+    One is held per concurrent game, so the representation is compact:
+    IDs are 128-bit integers, the deadline is an integer epoch timestamp,
+    and answers and dates are interned so sessions of the same song share them.
+    """
+
     answer: str
-    answer_song_id: uuid.UUID
 
-    user_id: Optional[uuid.UUID]
+    answer_song_id_int: int
+
+    user_id_int: Optional[int]
 
     mode: GameMode
     date: Optional[DateType]
@@ -25,19 +40,79 @@ class GameSession:
 
     expires_in_minutes: int
 
-    attempts: int = field(default=0, init=False)
-    done: bool = field(default=False, init=False)
-
-    created_at: datetime = field(init=False)
-    expires_at: datetime = field(init=False)
-
-    def __post_init__(self):
-        # Normalize answer
-        self.answer = self.answer.lower()
-
-        # Timestamps
-        self.created_at = datetime.now(timezone.utc)
-        self.expires_at = self.created_at + timedelta(minutes=self.expires_in_minutes)
-
-
-sessions: dict[str, GameSession] = {}  # { key: gameSessionID, value: GameSession }
+    expires_at_epoch: int
+
+    attempts: int = 0
+    done: bool = False
+
+    # Whether the game ended on a correct guess; only meaningful once done
+    won: bool = False
+
+    # Epoch seconds until which a disconnected session waits to be resumed; 0 while connected
+    parked_until: int = 0
+
+    @classmethod
+    def create(
+        cls,
+        answer: str,
+        answer_song_id: uuid.UUID,
+        user_id: Optional[uuid.UUID],
+        mode: GameMode,
+        date: Optional[DateType],
+        maximum_attempts: int,
+        expires_in_minutes: int,
+    ) -> "GameSession":
+        """
+        Make a session that starts now.
+        """
+
+        return cls(
+            # Normalize answer
+            answer=sys.intern(answer.lower()),
+            answer_song_id_int=answer_song_id.int,
+            user_id_int=user_id.int if user_id else None,
+            mode=GameMode(mode),
+            date=intern_date(date) if date else None,
+            maximum_attempts=maximum_attempts,
+            expires_in_minutes=expires_in_minutes,
+            expires_at_epoch=int(time.time()) + expires_in_minutes * 60,
+        )
+
+    @property
+    def answer_song_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.answer_song_id_int)
+
+    @property
+    def user_id(self) -> Optional[uuid.UUID]:
+        if self.user_id_int is None:
+            return None
+
+        return uuid.UUID(int=self.user_id_int)
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self.expires_at_epoch, timezone.utc)
+
+    @property
+    def created_at(self) -> datetime:
+        return self.expires_at - timedelta(minutes=self.expires_in_minutes)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+
+        return self.expires_at_epoch <= now
+
+    def is_abandoned(self, now: Optional[float] = None) -> bool:
+        # Parked and not resumed within the grace period
+        now = time.time() if now is None else now
+
+        return 0 < self.parked_until <= now
+
+
+@lru_cache(maxsize=4096)
+def intern_date(date: DateType) -> DateType:
+    """
+    Return a shared instance of a date, so sessions of the same day share one object.
+    """
+
+    return date
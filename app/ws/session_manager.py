@@ -1,19 +1,55 @@
 # standard library
+import asyncio
+
+import time
+
 from datetime import date as DateType
 
 from typing import Optional
 
 import uuid
 
+# FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+# SQLAlchemy
+from sqlalchemy.orm import Session
+
+from sqlalchemy.exc import SQLAlchemyError
+
+# redis
+import redis
+
+# app core
+from app.db.executor import database_executor
+
 # schemas
-from app.schemas.enums import GameMode
-from app.schemas.game import ServerCheck
+from app.schemas.enums import GameMode, SubmittableGameMode
+
+# services
+from app.services.catalog.song_metadata_cache import song_metadata_cache
+
+from app.services.game.game import record_game_result
+
+from app.services.game.game_validator import get_ws_game_session_uuid
+
+# exceptions
+from app.services.exceptions import (
+    DatabasePersistenceFailed,
+    DuplicateSession,
+    UserAlreadyPlayedTheDailyGame,
+)
 
 # websocket
-from app.ws.session import sessions, GameSession
+from app.ws.session import GameSession
+
+from app.ws.session_store import GuessOutcome, SessionStore, sessions
 
+# Modes whose results count towards statistics and leaderboards
+SUBMITTABLE_GAME_MODES = {GameMode(mode.value) for mode in SubmittableGameMode}
 
-def create_ws_game_session_id(sessions: dict[str, GameSession]) -> str:
+
+def create_ws_game_session_id(sessions: SessionStore) -> str:
     """
     Generate a unique WebSocket game session ID.
 
@@ -30,6 +66,7 @@ def create_ws_game_session_id(sessions: dict[str, GameSession]) -> str:
 
 
 def create_ws_game_session(
+    db: Session,
     answer: str,
     answer_song_id: uuid.UUID,
     user_id: Optional[uuid.UUID],
@@ -39,17 +76,18 @@ def create_ws_game_session(
     expires_in_minutes: int,
 ) -> str:
     """
-    Make and store an in-memory WebSocket game session.
+    Make and store a WebSocket game session.
+
+    Also caches the answer's song metadata for the end of the game.
 
     Returns:
         The ID of the created WebSocket game session.
     """
 
-    # Generate a unique identifier for the WebSocket session
-    game_session_id = create_ws_game_session_id(sessions)
+    # Warm the metadata sent when the game ends, so the WebSocket handler never queries it
+    song_metadata_cache.warm(db, answer_song_id)
 
-    # Store the session state for active WebSocket connections
-    sessions[game_session_id] = GameSession(
+    session = GameSession.create(
         answer=answer,
         answer_song_id=answer_song_id,
         user_id=user_id,
@@ -59,52 +97,147 @@ def create_ws_game_session(
         expires_in_minutes=expires_in_minutes,
     )
 
+    # Token stores encode the session into its ID
+    if sessions.issues_ids:
+        return sessions.issue(session)
+
+    # Generate a unique identifier for the WebSocket session
+    game_session_id = create_ws_game_session_id(sessions)
+
+    # Store the session state for active WebSocket connections until it expires
+    sessions.add(game_session_id, session)
+
     return game_session_id
 
 
-def check_guess(game_session_id: str, guess: str) -> ServerCheck:
+def check_guess(game_session_id: str, guess: str) -> Optional[GuessOutcome]:
     """
     Validate a user's guess against the active WebSocket game session.
 
+    The attempt is counted atomically by the session store.
+
     Returns:
-        A result payload indicating whether the guess is
-        correct and whether the game session is complete.
+        The outcome of the guess, indicating whether it is correct
+        and whether the game session is complete, or None if the
+        session has expired and was evicted.
+    """
+
+    # Count the attempt and compare normalized strings of the guess and the answer
+    return sessions.record_guess(game_session_id, guess.lower())
+
+
+def save_game_result(
+    db: Session, game_session_id: str, session: GameSession, won: bool, attempts: int
+) -> bool:
+    """
+    Persist the result of a game from the server's own session state.
+
+    Only games of signed-in users in submittable modes are recorded.
+
+    Returns:
+        Whether the result was recorded.
+
+    Raises:
+        UserAlreadyPlayedTheDailyGame: If the user already played today's daily game.
+        DuplicateSession: If a result was already recorded for the session.
+        DatabasePersistenceFailed: If persisting the result fails.
     """
 
-    # Retrieve the active game session
-    session = sessions[game_session_id]
-
-    # Immediately return if the session has already ended
-    if session.done is True:
-        return ServerCheck(
-            type="result",
-            guess=guess,
-            is_correct=False,
-            attempts=session.attempts,
-            done=True,
-        )
-
-    # Increment the number of attempts for this session
-    session.attempts += 1
-
-    # Check if the guess is correct by comparing normalized strings of the guess and the answer
-    is_correct = guess.lower() == session.answer
-
-    # Determine whether the game should end
-    if is_correct or session.attempts >= session.maximum_attempts:
-        done = True
-
-        # Mark the session as completed
-        session.done = True
-
-    else:
-        done = False
-
-    # Return the result of the guess
-    return ServerCheck(
-        type="result",
-        guess=guess,
-        is_correct=is_correct,
-        attempts=session.attempts,
-        done=done,
+    # Guests and practice modes have nothing to record
+    if session.user_id is None or session.mode not in SUBMITTABLE_GAME_MODES:
+        return False
+
+    record_game_result(
+        db,
+        get_ws_game_session_uuid(game_session_id),
+        session.user_id,
+        session.mode,
+        session.answer_song_id,
+        won,
+        attempts,
+        session.date,
     )
+
+    return True
+
+
+def save_evicted_game_results(
+    db: Session, evicted: list[tuple[str, GameSession]], now: float
+) -> list[tuple[str, GameSession]]:
+    """
+    Record the results of evicted games that the WebSocket handler did not record.
+
+    Finished games are still in the store only when saving their result
+    failed, so they are recorded as they ended. Unfinished games are
+    recorded as lost only if they were played and reached their expiry.
+    Games whose client never made a guess, and games dropped or idle past
+    their grace period before their expiry, are discarded, so a
+    backgrounded tab does not cost a daily game.
+
+    Returns:
+        The games whose results could not be persisted, to be retried.
+    """
+
+    failed = []
+
+    for game_session_id, session in evicted:
+        if session.done:
+            won = session.won
+
+        elif session.attempts and session.is_expired(now):
+            # The attempts made so far count, like a game lost on its last attempt
+            won = False
+
+        else:
+            continue
+
+        try:
+            save_game_result(db, game_session_id, session, won, session.attempts)
+
+        # Already recorded, or the user's daily game was recorded by another session
+        except (DuplicateSession, UserAlreadyPlayedTheDailyGame):
+            continue
+
+        # One failed game must not keep the others from being recorded
+        except (DatabasePersistenceFailed, SQLAlchemyError):
+            db.rollback()
+
+            failed.append((game_session_id, session))
+
+    return failed
+
+
+async def run_session_reaper(store: SessionStore, interval_seconds: float):
+    """
+    Periodically evict expired and abandoned sessions, including those whose
+    client never connected, and record the games the WebSocket handler did not.
+
+    Results that fail to persist are retried on the following sweeps.
+    """
+
+    # Evicted games whose results are still to be persisted
+    pending: list[tuple[str, GameSession]] = []
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+
+        # Sessions are evicted and judged against the same instant
+        now = time.time()
+
+        try:
+            if store.blocking:
+                evicted = await run_in_threadpool(store.reap, now)
+
+            else:
+                evicted = store.reap(now)
+
+        # Redis may be briefly unreachable; due sessions are claimed on the next sweep
+        except redis.RedisError:
+            evicted = []
+
+        pending.extend(evicted)
+
+        if pending:
+            pending = await database_executor.run(
+                save_evicted_game_results, pending, now
+            )
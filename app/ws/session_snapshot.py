@@ -0,0 +1,201 @@
+# standard library
+import os
+
+import struct
+
+import sys
+
+from datetime import date as DateType
+
+from typing import Iterable, Iterator, Optional
+
+# schemas
+from app.schemas.enums import GameMode
+
+# exceptions
+from app.services.exceptions import InvalidSessionSnapshot
+
+# websocket
+from app.ws.session import GameSession, intern_date
+
+# File signature, format version, number of strings, number of sessions
+SNAPSHOT_HEADER = struct.Struct("<4sHII")
+
+SNAPSHOT_MAGIC = b"HGSS"
+
+SNAPSHOT_VERSION = 2
+
+# Length of each string in the string table that follows the header
+STRING_LENGTH = struct.Struct("<H")
+
+# Fixed-size session record, so the whole section is decoded by iter_unpack:
+# gameSessionID, answer song ID and user ID as high and low 64-bit halves,
+# flags, maximum attempts, attempts, string table indexes of the mode and answer,
+# date ordinal, expires in minutes, expires at, parked until.
+# Both indexes are 32-bit: modes share the table with answers, which can hold
+# far more than 65,535 strings when answers are per-session token digests
+SNAPSHOT_RECORD = struct.Struct("<QQQQQQBBBxIIIIqq")
+
+HAS_USER_FLAG = 0b001
+DONE_FLAG = 0b010
+WON_FLAG = 0b100
+
+LOW_64_BITS = (1 << 64) - 1
+
+
+def write_snapshot(path: str, sessions: Iterable[tuple[int, GameSession]]) -> int:
+    """
+    Write sessions keyed by their integer gameSessionID to a snapshot file.
+
+    Answers and modes are shared by many sessions, so each distinct one is
+    written once to a string table that the records refer to by index.
+    The file is written next to its destination and renamed into place,
+    so a crash mid-write never leaves a truncated snapshot behind.
+
+    Returns:
+        The number of sessions written.
+    """
+
+    # { key: string, value: index in the string table }
+    strings: dict[str, int] = {}
+
+    records = []
+
+    for key, session in sessions:
+        mode_index = strings.setdefault(session.mode.value, len(strings))
+
+        answer_index = strings.setdefault(session.answer, len(strings))
+
+        user_id = session.user_id_int or 0
+
+        flags = (
+            (HAS_USER_FLAG if session.user_id_int is not None else 0)
+            | (DONE_FLAG if session.done else 0)
+            | (WON_FLAG if session.won else 0)
+        )
+
+        records.append(
+            SNAPSHOT_RECORD.pack(
+                key >> 64,
+                key & LOW_64_BITS,
+                session.answer_song_id_int >> 64,
+                session.answer_song_id_int & LOW_64_BITS,
+                user_id >> 64,
+                user_id & LOW_64_BITS,
+                flags,
+                session.maximum_attempts,
+                session.attempts,
+                mode_index,
+                answer_index,
+                session.date.toordinal() if session.date is not None else 0,
+                session.expires_in_minutes,
+                session.expires_at_epoch,
+                session.parked_until,
+            )
+        )
+
+    temporary_path = path + ".tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(
+            SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(strings), len(records)
+            )
+        )
+
+        for string in strings:
+            encoded = string.encode()
+
+            file.write(STRING_LENGTH.pack(len(encoded)) + encoded)
+
+        file.write(b"".join(records))
+
+    os.replace(temporary_path, path)
+
+    return len(records)
+
+
+def read_snapshot(path: str) -> Iterator[tuple[int, GameSession]]:
+    """
+    Read the sessions of a snapshot file, keyed by their integer gameSessionID.
+
+    Raises:
+        InvalidSessionSnapshot: The file is not a snapshot of this version, or is truncated.
+    """
+
+    with open(path, "rb") as file:
+        data = memoryview(file.read())
+
+    try:
+        magic, version, string_count, count = SNAPSHOT_HEADER.unpack_from(data)
+
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise InvalidSessionSnapshot("Unsupported session snapshot format.")
+
+        offset = SNAPSHOT_HEADER.size
+
+        strings = []
+
+        for _ in range(string_count):
+            (length,) = STRING_LENGTH.unpack_from(data, offset)
+
+            offset += STRING_LENGTH.size
+
+            # Interned, so restored sessions of the same song share their answer again
+            strings.append(sys.intern(str(data[offset : offset + length], "utf-8")))
+
+            offset += length
+
+        records = data[offset:]
+
+        if len(records) != count * SNAPSHOT_RECORD.size:
+            raise InvalidSessionSnapshot("Truncated session snapshot.")
+
+    except (struct.error, UnicodeDecodeError):
+        raise InvalidSessionSnapshot("Truncated session snapshot.")
+
+    # Modes and dates are resolved once per distinct value rather than once per session
+    modes: dict[int, GameMode] = {}
+
+    dates: dict[int, Optional[DateType]] = {0: None}
+
+    for (
+        key_high,
+        key_low,
+        answer_song_id_high,
+        answer_song_id_low,
+        user_id_high,
+        user_id_low,
+        flags,
+        maximum_attempts,
+        attempts,
+        mode_index,
+        answer_index,
+        date_ordinal,
+        expires_in_minutes,
+        expires_at_epoch,
+        parked_until,
+    ) in SNAPSHOT_RECORD.iter_unpack(records):
+        mode = modes.get(mode_index)
+
+        if mode is None:
+            mode = modes[mode_index] = GameMode(strings[mode_index])
+
+        if date_ordinal not in dates:
+            dates[date_ordinal] = intern_date(DateType.fromordinal(date_ordinal))
+
+        # Positional arguments, in field order, are measurably faster for a million sessions
+        yield key_high << 64 | key_low, GameSession(
+            strings[answer_index],
+            answer_song_id_high << 64 | answer_song_id_low,
+            user_id_high << 64 | user_id_low if flags & HAS_USER_FLAG else None,
+            mode,
+            dates[date_ordinal],
+            maximum_attempts,
+            expires_in_minutes,
+            expires_at_epoch,
+            attempts,
+            bool(flags & DONE_FLAG),
+            bool(flags & WON_FLAG),
+            parked_until,
+        )
@@ -0,0 +1,836 @@
+# standard library
+import gc
+
+import heapq
+
+import os
+
+import struct
+
+import sys
+
+import threading
+
+import time
+
+import uuid
+
+from dataclasses import dataclass
+
+from datetime import date as DateType
+
+from typing import Any, Callable, Optional, TypeVar
+
+# FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+# redis
+import redis
+
+# app core
+from app.core.config import settings
+
+# schemas
+from app.schemas.enums import GameMode
+
+# exceptions
+from app.services.exceptions import InvalidSessionSnapshot
+
+# websocket
+from app.ws.session import GameSession
+
+from app.ws.session_snapshot import read_snapshot, write_snapshot
+
+from app.ws.session_tokens import SessionTokenCodec, get_session_token_secret
+
+# Rebuild the deadline heap once it holds this many more entries than there are sessions
+MAXIMUM_STALE_DEADLINES = 1024
+
+T = TypeVar("T")
+
+
+@dataclass
+class GuessOutcome:
+    is_correct: bool
+    attempts: int
+    done: bool
+
+    # Whether this guess ended the game, rather than arriving after it ended
+    finished: bool = False
+
+
+class SessionStore:
+    """
+    Storage for WebSocket game sessions, keyed by gameSessionID.
+    """
+
+    # Whether calls perform network I/O and must be kept off the event loop
+    blocking: bool = False
+
+    # Whether the store derives session IDs itself instead of accepting generated ones
+    issues_ids: bool = False
+
+    def __contains__(self, game_session_id: str) -> bool:
+        return self.get(game_session_id) is not None
+
+    def add(self, game_session_id: str, session: GameSession):
+        # Store a session until it expires or is removed
+        raise NotImplementedError
+
+    def issue(self, session: GameSession) -> str:
+        # Store a session under an ID derived from it, for stores that issue IDs
+        raise NotImplementedError
+
+    def get(self, game_session_id: str) -> Optional[GameSession]:
+        # Retrieve a live session
+        raise NotImplementedError
+
+    def remove(self, game_session_id: str):
+        # Remove a session before it expires
+        raise NotImplementedError
+
+    def park(self, game_session_id: str, until: int):
+        # Keep a disconnected session until the given epoch second, then evict it;
+        # parking a session that is already parked never extends its grace period
+        raise NotImplementedError
+
+    def resume(self, game_session_id: str) -> Optional[GameSession]:
+        # Reattach a parked session; None if it was not parked or its grace period ended
+        raise NotImplementedError
+
+    def record_guess(
+        self, game_session_id: str, normalized_guess: str
+    ) -> Optional[GuessOutcome]:
+        # Atomically count an attempt and check it against the answer;
+        # None if the session is gone or parked, since parked games must be resumed first
+        raise NotImplementedError
+
+    def reap(self, now: Optional[float] = None) -> list[tuple[str, GameSession]]:
+        # Evict expired and abandoned sessions, returning their IDs and final state
+        return []
+
+    def snapshot(self, path: str) -> int:
+        # Save sessions held in this process to a file; stores outside the process have nothing to save
+        return 0
+
+    def restore(self, path: str, parked_until: int) -> int:
+        # Reload saved sessions, giving parked ones a new grace period; returns how many were loaded
+        return 0
+
+    def get_metrics(self) -> dict[str, Any]:
+        # Get a snapshot of the store counters
+        return {}
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    WebSocket game sessions held in this process, expiring at their expires_at.
+
+    Sessions are keyed by the 128-bit integer of their UUID rather than
+    its string. Deadlines are kept in a min-heap, so evicting expired
+    sessions costs O(log n) per session and never scans the sessions
+    that are still live.
+    """
+
+    def __init__(self):
+        # { key: gameSessionID as an integer, value: GameSession }
+        self._sessions: dict[int, GameSession] = {}
+
+        # Min-heap of (deadline as epoch seconds, gameSessionID as an integer)
+        self._deadlines: list[tuple[int, int]] = []
+
+        self._lock = threading.Lock()
+
+        # Counters
+        self.evictions = 0
+        self.parks = 0
+        self.resumes = 0
+        self.restored = 0
+
+    def __contains__(self, game_session_id: str) -> bool:
+        return _to_key(game_session_id) in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, game_session_id: str, session: GameSession):
+        key = _to_key(game_session_id)
+
+        assert key is not None, "Game session IDs must be UUIDs."
+
+        with self._lock:
+            self._sessions[key] = session
+
+            heapq.heappush(self._deadlines, (session.expires_at_epoch, key))
+
+    def get(self, game_session_id: str) -> Optional[GameSession]:
+        key = _to_key(game_session_id)
+
+        # IDs that are not UUIDs were never issued
+        if key is None:
+            return None
+
+        return self._sessions.get(key)
+
+    def remove(self, game_session_id: str):
+        key = _to_key(game_session_id)
+
+        if key is None:
+            return
+
+        # The session's deadline stays in the heap and is skipped when reached
+        with self._lock:
+            self._sessions.pop(key, None)
+
+            # Drop stale deadlines in bulk once they outnumber live sessions
+            if len(self._deadlines) > len(self._sessions) + MAXIMUM_STALE_DEADLINES:
+                self._rebuild_deadlines()
+
+    def park(self, game_session_id: str, until: int):
+        key = _to_key(game_session_id)
+
+        if key is None:
+            return
+
+        with self._lock:
+            session = self._sessions.get(key)
+
+            if session is None:
+                return
+
+            # A parked session keeps the grace period it was first given
+            if session.parked_until:
+                until = min(until, session.parked_until)
+
+            session.parked_until = until
+
+            # Evicted at the end of the grace period unless resumed before
+            heapq.heappush(self._deadlines, (until, key))
+
+            self.parks += 1
+
+    def resume(self, game_session_id: str) -> Optional[GameSession]:
+        key = _to_key(game_session_id)
+
+        if key is None:
+            return None
+
+        with self._lock:
+            session = self._sessions.get(key)
+
+            if session is None or not session.parked_until or session.is_abandoned():
+                return None
+
+            session.parked_until = 0
+
+            self.resumes += 1
+
+            return session
+
+    def record_guess(
+        self, game_session_id: str, normalized_guess: str
+    ) -> Optional[GuessOutcome]:
+        key = _to_key(game_session_id)
+
+        if key is None:
+            return None
+
+        with self._lock:
+            session = self._sessions.get(key)
+
+            if session is None or session.parked_until:
+                return None
+
+            # Guesses after the game ended are not counted
+            if session.done:
+                return GuessOutcome(
+                    is_correct=False, attempts=session.attempts, done=True
+                )
+
+            session.attempts += 1
+
+            is_correct = normalized_guess == session.answer
+
+            # The game ends on a correct guess or once all attempts are used
+            if is_correct or session.attempts >= session.maximum_attempts:
+                session.done = True
+
+                session.won = is_correct
+
+            return GuessOutcome(
+                is_correct=is_correct,
+                attempts=session.attempts,
+                done=session.done,
+                finished=session.done,
+            )
+
+    def reap(self, now: Optional[float] = None) -> list[tuple[str, GameSession]]:
+        now = time.time() if now is None else now
+
+        evicted = []
+
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, key = heapq.heappop(self._deadlines)
+
+                session = self._sessions.get(key)
+
+                # Skip deadlines of sessions that were already removed or resumed
+                if session is None or not (
+                    session.is_expired(now) or session.is_abandoned(now)
+                ):
+                    continue
+
+                del self._sessions[key]
+
+                evicted.append((str(uuid.UUID(int=key)), session))
+
+            self.evictions += len(evicted)
+
+        return evicted
+
+    def snapshot(self, path: str) -> int:
+        with self._lock:
+            items = list(self._sessions.items())
+
+        return write_snapshot(path, items)
+
+    def restore(self, path: str, parked_until: int) -> int:
+        now = time.time()
+
+        restored = 0
+
+        with self._lock:
+            for key, session in read_snapshot(path):
+                # Sessions that ran out while the process was down are not worth restoring
+                if session.expires_at_epoch <= now:
+                    continue
+
+                # Downtime does not count against the grace period of parked sessions
+                if session.parked_until:
+                    session.parked_until = parked_until
+
+                    self._deadlines.append((parked_until, key))
+
+                self._sessions[key] = session
+
+                self._deadlines.append((session.expires_at_epoch, key))
+
+                restored += 1
+
+            # One heapify instead of a push per session
+            heapq.heapify(self._deadlines)
+
+            self.restored += restored
+
+        return restored
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._sessions),
+            "deadlines": len(self._deadlines),
+            "evictions": self.evictions,
+            "parks": self.parks,
+            "resumes": self.resumes,
+            "restored": self.restored,
+        }
+
+    def _rebuild_deadlines(self):
+        # Parked sessions keep the end of their grace period as their deadline
+        self._deadlines = [
+            (_get_deadline(session), key) for key, session in self._sessions.items()
+        ]
+
+        heapq.heapify(self._deadlines)
+
+
+def _get_deadline(session: GameSession) -> int:
+    # The epoch second at which a session expires, or is abandoned if parked before then
+    if session.parked_until:
+        return min(session.expires_at_epoch, session.parked_until)
+
+    return session.expires_at_epoch
+
+
+def _to_key(game_session_id: str) -> Optional[int]:
+    # Session IDs are UUID strings; None for anything else
+    try:
+        return uuid.UUID(game_session_id).int
+
+    except ValueError:
+        return None
+
+
+# Counts an attempt and compares the guess in a single atomic step
+RECORD_GUESS_SCRIPT = """
+local session = redis.call('HMGET', KEYS[1], 'answer', 'attempts', 'maximum_attempts', 'done', 'expires_at', 'parked_until')
+
+if not session[5] or tonumber(session[5]) <= tonumber(ARGV[2]) then
+    return nil
+end
+
+if tonumber(session[6] or '0') > 0 then
+    return nil
+end
+
+if session[4] == '1' then
+    return {0, tonumber(session[2]), 1, 0}
+end
+
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+
+local is_correct = 0
+
+if ARGV[1] == session[1] then
+    is_correct = 1
+end
+
+local done = 0
+
+if is_correct == 1 or attempts >= tonumber(session[3]) then
+    done = 1
+
+    redis.call('HSET', KEYS[1], 'done', '1', 'won', tostring(is_correct))
+end
+
+return {is_correct, attempts, done, done}
+"""
+
+
+# Marks a session as parked and moves its deadline to the end of the grace period
+PARK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+
+local session = redis.call('HMGET', KEYS[1], 'expires_at', 'parked_until')
+
+local parked = tonumber(ARGV[1])
+
+local parked_until = tonumber(session[2] or '0')
+
+if parked_until > 0 then
+    parked = math.min(parked, parked_until)
+end
+
+local deadline = math.min(tonumber(session[1]), parked)
+
+redis.call('HSET', KEYS[1], 'parked_until', parked)
+
+redis.call('ZADD', KEYS[2], deadline, KEYS[1])
+
+redis.call('PEXPIREAT', KEYS[1], (deadline + tonumber(ARGV[2])) * 1000)
+
+return 1
+"""
+
+# Unparks a session within its grace period and restores its deadline, returning its fields
+RESUME_SCRIPT = """
+local parked_until = tonumber(redis.call('HGET', KEYS[1], 'parked_until') or '0')
+
+if parked_until == 0 or parked_until <= tonumber(ARGV[1]) then
+    return nil
+end
+
+local expires_at = tonumber(redis.call('HGET', KEYS[1], 'expires_at'))
+
+redis.call('HSET', KEYS[1], 'parked_until', '0')
+
+redis.call('ZADD', KEYS[2], expires_at, KEYS[1])
+
+redis.call('PEXPIREAT', KEYS[1], (expires_at + tonumber(ARGV[2])) * 1000)
+
+return redis.call('HGETALL', KEYS[1])
+"""
+
+# Claims a batch of sessions past their deadline, deleting each and returning its key and fields,
+# so every session is evicted by exactly one worker
+REAP_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+
+local evicted = {}
+
+for _, key in ipairs(due) do
+    redis.call('ZREM', KEYS[1], key)
+
+    local fields = redis.call('HGETALL', key)
+
+    if #fields > 0 then
+        redis.call('DEL', key)
+
+        table.insert(evicted, key)
+
+        table.insert(evicted, fields)
+    end
+end
+
+return {#due, evicted}
+"""
+
+# Seconds a session hash outlives its deadline, so the reaper can record it before Redis drops it
+REAP_MARGIN_SECONDS = 3600
+
+# Sessions claimed per reap script call, so one call never blocks Redis for long
+REAP_BATCH_SIZE = 500
+
+
+class RedisSessionStore(SessionStore):
+    """
+    WebSocket game sessions shared between workers through Redis.
+
+    Each session is a hash, and its deadline (expiry, or the end of its
+    grace period while parked) is scored in a sorted set that the reaper
+    claims due sessions from. Redis expires the hash itself well after the
+    deadline, in case no reaper runs. Guesses are recorded by a Lua script
+    to keep the attempt counter consistent across workers.
+    """
+
+    blocking = True
+
+    KEY_PREFIX = "heaaardle:session:"
+
+    DEADLINES_KEY = "heaaardle:session-deadlines"
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+        self._record_guess = client.register_script(RECORD_GUESS_SCRIPT)
+
+        self._park = client.register_script(PARK_SCRIPT)
+
+        self._resume = client.register_script(RESUME_SCRIPT)
+
+        self._reap = client.register_script(REAP_SCRIPT)
+
+        # Counters of this process
+        self.evictions = 0
+
+    def add(self, game_session_id: str, session: GameSession):
+        key = self.KEY_PREFIX + game_session_id
+
+        pipeline = self.client.pipeline(transaction=True)
+
+        pipeline.hset(key, mapping=self._to_hash(session))
+
+        pipeline.zadd(self.DEADLINES_KEY, {key: session.expires_at_epoch})
+
+        pipeline.pexpireat(
+            key, (session.expires_at_epoch + REAP_MARGIN_SECONDS) * 1000
+        )
+
+        pipeline.execute()
+
+    def get(self, game_session_id: str) -> Optional[GameSession]:
+        fields = self.client.hgetall(self.KEY_PREFIX + game_session_id)
+
+        if not fields:
+            return None
+
+        return self._from_hash(fields)
+
+    def remove(self, game_session_id: str):
+        key = self.KEY_PREFIX + game_session_id
+
+        pipeline = self.client.pipeline(transaction=True)
+
+        pipeline.delete(key)
+
+        pipeline.zrem(self.DEADLINES_KEY, key)
+
+        pipeline.execute()
+
+    def park(self, game_session_id: str, until: int):
+        # The reaper evicts the session once the grace period ends
+        self._park(
+            keys=[self.KEY_PREFIX + game_session_id, self.DEADLINES_KEY],
+            args=[until, REAP_MARGIN_SECONDS],
+        )
+
+    def resume(self, game_session_id: str) -> Optional[GameSession]:
+        result = self._resume(
+            keys=[self.KEY_PREFIX + game_session_id, self.DEADLINES_KEY],
+            args=[int(time.time()), REAP_MARGIN_SECONDS],
+        )
+
+        if not result:
+            return None
+
+        # HGETALL replies with alternating fields and values
+        return self._from_hash(dict(zip(result[::2], result[1::2])))
+
+    def record_guess(
+        self, game_session_id: str, normalized_guess: str
+    ) -> Optional[GuessOutcome]:
+        result = self._record_guess(
+            keys=[self.KEY_PREFIX + game_session_id],
+            args=[normalized_guess, int(time.time())],
+        )
+
+        if result is None:
+            return None
+
+        is_correct, attempts, done, finished = result
+
+        return GuessOutcome(
+            is_correct=bool(is_correct),
+            attempts=int(attempts),
+            done=bool(done),
+            finished=bool(finished),
+        )
+
+    def reap(self, now: Optional[float] = None) -> list[tuple[str, GameSession]]:
+        now = time.time() if now is None else now
+
+        evicted = []
+
+        while True:
+            claimed, batch = self._reap(
+                keys=[self.DEADLINES_KEY], args=[now, REAP_BATCH_SIZE]
+            )
+
+            # The script replies with alternating keys and HGETALL replies
+            for key, fields in zip(batch[::2], batch[1::2]):
+                session = self._from_hash(dict(zip(fields[::2], fields[1::2])))
+
+                evicted.append((key[len(self.KEY_PREFIX) :], session))
+
+            if claimed < REAP_BATCH_SIZE:
+                break
+
+        self.evictions += len(evicted)
+
+        return evicted
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {"backend": "redis", "evictions": self.evictions}
+
+    def _to_hash(self, session: GameSession) -> dict[str, str | int]:
+        return {
+            "answer": session.answer,
+            "answer_song_id": str(session.answer_song_id),
+            "user_id": str(session.user_id) if session.user_id else "",
+            "mode": session.mode.value,
+            "date": session.date.isoformat() if session.date else "",
+            "maximum_attempts": session.maximum_attempts,
+            "expires_in_minutes": session.expires_in_minutes,
+            "expires_at": session.expires_at_epoch,
+            "attempts": session.attempts,
+            "done": int(session.done),
+            "won": int(session.won),
+            "parked_until": session.parked_until,
+        }
+
+    def _from_hash(self, fields: dict[str, str]) -> GameSession:
+        return GameSession(
+            answer=sys.intern(fields["answer"]),
+            answer_song_id_int=uuid.UUID(fields["answer_song_id"]).int,
+            user_id_int=uuid.UUID(fields["user_id"]).int if fields["user_id"] else None,
+            mode=GameMode(fields["mode"]),
+            date=DateType.fromisoformat(fields["date"]) if fields["date"] else None,
+            maximum_attempts=int(fields["maximum_attempts"]),
+            expires_in_minutes=int(fields["expires_in_minutes"]),
+            expires_at_epoch=int(fields["expires_at"]),
+            attempts=int(fields["attempts"]),
+            done=fields["done"] == "1",
+            won=fields.get("won") == "1",
+            parked_until=int(fields.get("parked_until", 0)),
+        )
+
+
+class TokenSessionStore(SessionStore):
+    """
+    WebSocket game sessions identified by signed tokens.
+
+    The token is the session: validating a connection only verifies its
+    signature, without a store lookup. The mutable state (attempts,
+    whether the game is done and whether it is parked) lives in a counter
+    record in the wrapped store, keyed by the token's nonce, from the time
+    the token is issued. Guesses go through the counter, so a token whose
+    counter was removed, abandoned or expired cannot be guessed with, and
+    a parked game must be resumed with its resume token first.
+    """
+
+    issues_ids = True
+
+    def __init__(self, codec: SessionTokenCodec, counters: SessionStore):
+        self.codec = codec
+
+        self.counters = counters
+
+        self.blocking = counters.blocking
+
+    def add(self, game_session_id: str, session: GameSession):
+        # Create the attempt counter of an issued token
+        claims = self.codec.decode(game_session_id)
+
+        if claims is not None:
+            self.counters.add(str(claims.nonce), claims.to_session())
+
+    def issue(self, session: GameSession) -> str:
+        token = self.codec.encode(session)
+
+        self.add(token, session)
+
+        return token
+
+    def get(self, game_session_id: str) -> Optional[GameSession]:
+        claims = self.codec.decode(game_session_id)
+
+        return claims.to_session() if claims is not None else None
+
+    def remove(self, game_session_id: str):
+        claims = self.codec.decode(game_session_id)
+
+        if claims is not None:
+            self.counters.remove(str(claims.nonce))
+
+    def park(self, game_session_id: str, until: int):
+        claims = self.codec.decode(game_session_id)
+
+        if claims is not None:
+            self.counters.park(str(claims.nonce), until)
+
+    def resume(self, game_session_id: str) -> Optional[GameSession]:
+        claims = self.codec.decode(game_session_id)
+
+        if claims is None:
+            return None
+
+        return self.counters.resume(str(claims.nonce))
+
+    def record_guess(
+        self, game_session_id: str, normalized_guess: str
+    ) -> Optional[GuessOutcome]:
+        claims = self.codec.decode(game_session_id)
+
+        if claims is None:
+            return None
+
+        # Counters compare digests, so the answer never has to be stored
+        guess_digest = self.codec.digest_answer(claims, normalized_guess)
+
+        outcome = self.counters.record_guess(str(claims.nonce), guess_digest)
+
+        # The token was spent by a game that already finished
+        if outcome is not None and outcome.done and not outcome.finished:
+            return None
+
+        return outcome
+
+    def reap(self, now: Optional[float] = None) -> list[tuple[str, GameSession]]:
+        # Counters are keyed by nonce, which results are persisted under
+        return self.counters.reap(now)
+
+    def snapshot(self, path: str) -> int:
+        return self.counters.snapshot(path)
+
+    def restore(self, path: str, parked_until: int) -> int:
+        return self.counters.restore(path, parked_until)
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {"backend": "token", "counters": self.counters.get_metrics()}
+
+
+def create_session_store() -> SessionStore:
+    """
+    Create the session store selected in the settings.
+    """
+
+    # Signed tokens keep only their attempt counters in the selected backend
+    if settings.session_tokens_enabled:
+        return TokenSessionStore(
+            SessionTokenCodec(get_session_token_secret()),
+            create_session_counter_store(),
+        )
+
+    return create_session_counter_store()
+
+
+def create_session_counter_store() -> SessionStore:
+    """
+    Create the storage backend selected in the settings.
+    """
+
+    if settings.session_store_backend == "redis":
+        assert settings.redis_url is not None, "Missing Redis URL in .env."
+
+        client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+        )
+
+        return RedisSessionStore(client)
+
+    assert (
+        settings.session_store_backend == "memory"
+    ), "Unknown session store backend in .env."
+
+    return InMemorySessionStore()
+
+
+async def call_session_store(function: Callable[..., T], *args: Any) -> T:
+    """
+    Call a session store method from async code without blocking the event loop.
+    """
+
+    if sessions.blocking:
+        return await run_in_threadpool(function, *args)
+
+    return function(*args)
+
+
+def snapshot_sessions(store: SessionStore, path: str) -> int:
+    """
+    Save the sessions held in this process on shutdown.
+
+    A snapshot that cannot be written is given up rather than raised, so
+    the rest of the shutdown still runs.
+
+    Returns:
+        The number of sessions saved.
+    """
+
+    try:
+        return store.snapshot(path)
+
+    except (OSError, struct.error):
+        return 0
+
+
+def restore_sessions(store: SessionStore, path: str) -> int:
+    """
+    Reload the sessions the previous process saved on shutdown, then delete the snapshot.
+
+    The snapshot is deleted even if it cannot be read, so a stale or corrupt
+    file is never loaded twice.
+
+    Returns:
+        The number of sessions restored.
+    """
+
+    if not os.path.exists(path):
+        return 0
+
+    parked_until = int(time.time()) + settings.websocket_resume_grace_seconds
+
+    # Loading a million sessions would otherwise trigger repeated full collections
+    gc_was_enabled = gc.isenabled()
+
+    gc.disable()
+
+    try:
+        return store.restore(path, parked_until)
+
+    except InvalidSessionSnapshot:
+        return 0
+
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+        os.remove(path)
+
+
+sessions = create_session_store()
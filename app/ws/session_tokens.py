@@ -0,0 +1,247 @@
+# standard library
+import base64
+
+import binascii
+
+import hashlib
+
+import hmac
+
+import struct
+
+import time
+
+import uuid
+
+from dataclasses import dataclass
+
+from datetime import date as DateType
+
+from typing import Optional
+
+# app core
+from app.core.config import settings
+
+# schemas
+from app.schemas.enums import GameMode
+
+# websocket
+from app.ws.session import GameSession
+
+TOKEN_VERSION = 1
+
+# version, nonce, answer song ID, user ID, mode, maximum attempts,
+# expires in minutes, expiry as epoch seconds, date as an ordinal, answer digest
+CLAIMS_FORMAT = struct.Struct(">B16s16s16sBBHII16s")
+
+# Truncated HMAC-SHA256 lengths of the answer digest and the token signature
+DIGEST_SIZE = 16
+
+SIGNATURE_SIZE = 16
+
+# Game modes by their position in the token
+MODES = list(GameMode)
+
+NO_USER = bytes(16)
+
+
+@dataclass(frozen=True, slots=True)
+class SessionClaims:
+    nonce: uuid.UUID
+    answer_song_id: uuid.UUID
+    user_id: Optional[uuid.UUID]
+    mode: GameMode
+    maximum_attempts: int
+    expires_in_minutes: int
+    expires_at: int
+    date: Optional[DateType]
+    answer_digest: str
+
+    def to_session(self) -> GameSession:
+        """
+        Build a game session from the claims, with the answer digest standing in for the answer.
+        """
+
+        return GameSession(
+            answer=self.answer_digest,
+            answer_song_id_int=self.answer_song_id.int,
+            user_id_int=self.user_id.int if self.user_id else None,
+            mode=self.mode,
+            date=self.date,
+            maximum_attempts=self.maximum_attempts,
+            expires_in_minutes=self.expires_in_minutes,
+            expires_at_epoch=self.expires_at,
+        )
+
+
+class SessionTokenCodec:
+    """
+    Encodes WebSocket game sessions into compact signed tokens.
+
+    A token carries everything about a session except its attempt counter,
+    so any worker holding the secret can validate it without a lookup.
+    The answer is only present as a keyed digest, so it cannot be
+    recovered by hashing the titles in the catalog.
+    """
+
+    def __init__(self, secret: str):
+        self.secret = secret.encode()
+
+    def encode(self, session: GameSession) -> str:
+        """
+        Issue a signed token for a new game session.
+
+        Returns:
+            The URL-safe token, used as the WebSocket game session ID.
+        """
+
+        nonce = uuid.uuid4().bytes
+
+        # Pack the immutable session state
+        claims = CLAIMS_FORMAT.pack(
+            TOKEN_VERSION,
+            nonce,
+            session.answer_song_id.bytes,
+            session.user_id.bytes if session.user_id else NO_USER,
+            MODES.index(GameMode(session.mode)),
+            session.maximum_attempts,
+            session.expires_in_minutes,
+            session.expires_at_epoch,
+            session.date.toordinal() if session.date else 0,
+            self._digest(nonce, session.answer),
+        )
+
+        return _encode(claims + self._sign(claims))
+
+    def decode(self, token: str) -> Optional[SessionClaims]:
+        """
+        Verify a token and unpack its claims.
+
+        Returns:
+            The session claims, or None if the token is malformed, forged or expired.
+        """
+
+        raw = _decode(token)
+
+        if raw is None or len(raw) != CLAIMS_FORMAT.size + SIGNATURE_SIZE:
+            return None
+
+        claims, signature = raw[: CLAIMS_FORMAT.size], raw[CLAIMS_FORMAT.size :]
+
+        # Reject tokens that were not issued with this secret
+        if not hmac.compare_digest(self._sign(claims), signature):
+            return None
+
+        (
+            version,
+            nonce,
+            answer_song_id,
+            user_id,
+            mode,
+            maximum_attempts,
+            expires_in_minutes,
+            expires_at,
+            date,
+            answer_digest,
+        ) = CLAIMS_FORMAT.unpack(claims)
+
+        if version != TOKEN_VERSION or expires_at <= time.time():
+            return None
+
+        return SessionClaims(
+            nonce=uuid.UUID(bytes=nonce),
+            answer_song_id=uuid.UUID(bytes=answer_song_id),
+            user_id=uuid.UUID(bytes=user_id) if user_id != NO_USER else None,
+            mode=MODES[mode],
+            maximum_attempts=maximum_attempts,
+            expires_in_minutes=expires_in_minutes,
+            expires_at=expires_at,
+            date=DateType.fromordinal(date) if date else None,
+            answer_digest=answer_digest.hex(),
+        )
+
+    def digest_answer(self, claims: SessionClaims, normalized_guess: str) -> str:
+        """
+        Digest a guess the same way the token's answer was digested.
+        """
+
+        return self._digest(claims.nonce.bytes, normalized_guess).hex()
+
+    def _digest(self, nonce: bytes, answer: str) -> bytes:
+        # Bind the digest to the session so equal answers do not produce equal digests
+        message = b"answer:" + nonce + answer.encode()
+
+        return hmac.new(self.secret, message, hashlib.sha256).digest()[:DIGEST_SIZE]
+
+    def _sign(self, claims: bytes) -> bytes:
+        message = b"session:" + claims
+
+        return hmac.new(self.secret, message, hashlib.sha256).digest()[
+            :SIGNATURE_SIZE
+        ]
+
+
+class ResumeTokenSigner:
+    """
+    Signs game session IDs, so only the client a session was issued to can resume it.
+    """
+
+    def __init__(self, secret: str):
+        self.secret = secret.encode()
+
+    def sign(self, game_session_id: str) -> str:
+        message = b"resume:" + game_session_id.encode()
+
+        digest = hmac.new(self.secret, message, hashlib.sha256).digest()
+
+        return _encode(digest[:SIGNATURE_SIZE])
+
+    def verify(self, game_session_id: str, resume_token: str) -> bool:
+        # Compared as bytes, since compare_digest rejects non-ASCII strings
+        return hmac.compare_digest(
+            self.sign(game_session_id).encode(), resume_token.encode()
+        )
+
+
+def get_session_token_secret() -> str:
+    """
+    Get the key that signs session and resume tokens; defaults to the Supabase key.
+    """
+
+    secret = settings.session_token_secret or settings.supabase_key
+
+    assert secret is not None, "Missing session token secret in .env."
+
+    return secret
+
+
+def get_token_nonce(token: str) -> Optional[uuid.UUID]:
+    """
+    Read the nonce of a session token without verifying it.
+
+    Returns:
+        The nonce identifying the session, or None if the value is not a token.
+    """
+
+    raw = _decode(token)
+
+    if raw is None or len(raw) != CLAIMS_FORMAT.size + SIGNATURE_SIZE:
+        return None
+
+    return uuid.UUID(bytes=raw[1:17])
+
+
+def _encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode(token: str) -> Optional[bytes]:
+    # Restore the stripped padding
+    try:
+        return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+
+    except (binascii.Error, ValueError):
+        return None
+
+
+resume_token_signer = ResumeTokenSigner(get_session_token_secret())